@@ -0,0 +1,252 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import numpy as np
+from cpforager import sketch
+
+
+# ================================================================================================ #
+# INIT ACCUMULATOR
+# ================================================================================================ #
+def init_accumulator(relative_accuracy=0.01):
+
+    """
+    Initialize an empty streaming statistics accumulator.
+
+    :param relative_accuracy: relative accuracy of the quantiles estimated from the accumulator (see ``sketch.build_sketch``).
+    :type relative_accuracy: float
+    :return: the accumulator dictionary.
+    :rtype: dict
+
+    An accumulator is fed with chunks of values, *e.g.* the trip statistics of one logger or a block of rows of an acceleration dataframe,
+    and accumulators fed independently, *e.g.* by several workers, are merged into the accumulator of all values.
+    Find below the exhaustive table of the accumulator keys.
+
+    .. csv-table::
+        :header: "name", "description"
+        :widths: auto
+
+        ``n``, "number of values"
+        ``mean``, "mean of values"
+        ``m2``, "sum of squared deviations from the mean"
+        ``min``, "minimum value"
+        ``max``, "maximum value"
+        ``relative_accuracy``, "relative accuracy of the quantile sketch"
+        ``sketch``, "quantile sketch of values"
+    """
+
+    # build accumulator dictionary
+    accumulator = {"n":0, "mean":0.0, "m2":0.0, "min":np.nan, "max":np.nan,
+                   "relative_accuracy":relative_accuracy, "sketch":sketch.build_sketch([], relative_accuracy)}
+
+    return(accumulator)
+
+
+# ================================================================================================ #
+# MERGE ACCUMULATORS
+# ================================================================================================ #
+def merge_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+
+    """
+    Merge the moments of two sets of values.
+
+    :param n_a: number of values of the first set.
+    :type n_a: int
+    :param mean_a: mean of the first set.
+    :type mean_a: float
+    :param m2_a: sum of squared deviations from the mean of the first set.
+    :type m2_a: float
+    :param n_b: number of values of the second set.
+    :type n_b: int
+    :param mean_b: mean of the second set.
+    :type mean_b: float
+    :param m2_b: sum of squared deviations from the mean of the second set.
+    :type m2_b: float
+    :return: the number of values, the mean and the sum of squared deviations from the mean of the union of the sets.
+    :rtype: (int, float, float)
+
+    The pairwise update of Welford's algorithm (Chan *et al.*, 1979) is used, which is numerically stable whatever the order of magnitude of the values.
+    """
+
+    # empty sets
+    if n_a == 0:
+        return(n_b, mean_b, m2_b)
+    if n_b == 0:
+        return(n_a, mean_a, m2_a)
+
+    # pairwise update
+    n = n_a+n_b
+    delta = mean_b-mean_a
+    mean = mean_a+delta*n_b/n
+    m2 = m2_a+m2_b+delta**2*n_a*n_b/n
+
+    return(n, mean, m2)
+
+
+def merge_accumulators(accumulators):
+
+    """
+    Merge a list of accumulators into a single accumulator.
+
+    :param accumulators: list of accumulator dictionaries built with the same relative accuracy.
+    :type accumulators: list[dict]
+    :return: the merged accumulator dictionary.
+    :rtype: dict
+    """
+
+    # check accumulators
+    if len(accumulators) == 0:
+        raise ValueError("At least one accumulator is required to merge accumulators.")
+
+    # merge moments
+    n, mean, m2 = 0, 0.0, 0.0
+    for acc in accumulators:
+        n, mean, m2 = merge_moments(n, mean, m2, acc["n"], acc["mean"], acc["m2"])
+
+    # build merged accumulator dictionary
+    is_filled = any([acc["n"] > 0 for acc in accumulators])
+    accumulator = {"n":n, "mean":mean, "m2":m2,
+                   "min":np.nanmin([acc["min"] for acc in accumulators]) if is_filled else np.nan,
+                   "max":np.nanmax([acc["max"] for acc in accumulators]) if is_filled else np.nan,
+                   "relative_accuracy":accumulators[0]["relative_accuracy"],
+                   "sketch":sketch.merge_sketches([acc["sketch"] for acc in accumulators])}
+
+    return(accumulator)
+
+
+# ================================================================================================ #
+# UPDATE ACCUMULATOR
+# ================================================================================================ #
+def update_accumulator(accumulator, values):
+
+    """
+    Update an accumulator with a chunk of values.
+
+    :param accumulator: the accumulator dictionary.
+    :type accumulator: dict
+    :param values: array of values.
+    :type values: numpy.ndarray
+    :return: the updated accumulator dictionary.
+    :rtype: dict
+
+    The chunk is summarized with vectorized operations and merged into the accumulator, hence the cost is linear in the chunk size and the memory
+    does not depend on the number of values already accumulated. NaN values are ignored.
+    """
+
+    # get valid values
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+
+    # build chunk accumulator
+    chunk = init_accumulator(accumulator["relative_accuracy"])
+    if len(values) > 0:
+        chunk["n"] = len(values)
+        chunk["mean"] = values.mean()
+        chunk["m2"] = np.sum((values-chunk["mean"])**2)
+        chunk["min"] = values.min()
+        chunk["max"] = values.max()
+        chunk["sketch"] = sketch.build_sketch(values, accumulator["relative_accuracy"])
+
+    # merge chunk into accumulator
+    accumulator = merge_accumulators([accumulator, chunk])
+
+    return(accumulator)
+
+
+# ================================================================================================ #
+# ACCUMULATE DATAFRAMES
+# ================================================================================================ #
+def accumulate_columns(dfs, columns, chunk_size=None, relative_accuracy=0.01):
+
+    """
+    Feed the accumulators of dataframe columns, one dataframe at a time.
+
+    :param dfs: iterable of dataframes with the given columns, *e.g.* a list or a generator reading the dataframe of every logger of a collection.
+    :type dfs: iterable[pandas.DataFrame]
+    :param columns: list of column names.
+    :type columns: list[str]
+    :param chunk_size: number of rows fed at once, every dataframe is fed at once if None.
+    :type chunk_size: int
+    :param relative_accuracy: relative accuracy of the quantiles estimated from the accumulators.
+    :type relative_accuracy: float
+    :return: the dictionary of accumulators where keys are the column names.
+    :rtype: dict
+
+    Only the accumulators are kept in memory, hence dataframes can be produced lazily and never be concatenated.
+    """
+
+    # init accumulators
+    accumulators = {column:init_accumulator(relative_accuracy) for column in columns}
+
+    # feed accumulators by dataframe and by chunk
+    for df in dfs:
+        n_df = len(df)
+        step = n_df if chunk_size is None else chunk_size
+        for start in range(0, n_df, max(step, 1)):
+            for column in columns:
+                values = df[column].iloc[start:start+step].to_numpy(dtype=float, na_value=np.nan)
+                accumulators[column] = update_accumulator(accumulators[column], values)
+
+    return(accumulators)
+
+
+# ================================================================================================ #
+# ACCUMULATOR STATISTICS
+# ================================================================================================ #
+def get_accumulator_statistics(accumulator, quantiles=[0, 0.25, 0.5, 0.75, 1]):
+
+    """
+    Get the statistics of the values fed to an accumulator.
+
+    :param accumulator: the accumulator dictionary.
+    :type accumulator: dict
+    :param quantiles: quantiles to estimate in [0, 1].
+    :type quantiles: list[float]
+    :return: the statistics dictionary.
+    :rtype: dict
+
+    The count, mean, standard deviation, minimum and maximum are exact, the standard deviation being normalized by :math:`n-1` as ``pandas.Series.std``.
+    Quantiles are estimated within the relative accuracy of the accumulator, except quantiles 0 and 1 which are exact.
+    Find below the exhaustive table of the statistics keys.
+
+    .. csv-table::
+        :header: "name", "description"
+        :widths: auto
+
+        ``n``, "number of values"
+        ``mean``, "mean of values, NaN if empty"
+        ``std``, "standard deviation of values, NaN if less than two values"
+        ``min``, "minimum value"
+        ``max``, "maximum value"
+        ``quantiles``, "array of the estimated quantiles"
+    """
+
+    # compute statistics
+    n = accumulator["n"]
+    statistics = {"n":n,
+                  "mean":accumulator["mean"] if n > 0 else np.nan,
+                  "std":np.sqrt(accumulator["m2"]/(n-1)) if n > 1 else np.nan,
+                  "min":accumulator["min"],
+                  "max":accumulator["max"],
+                  "quantiles":sketch.get_sketch_quantiles(accumulator["sketch"], quantiles)}
+
+    return(statistics)
+
+
+def get_accumulator_histogram(accumulator, bins=10):
+
+    """
+    Estimate the histogram of the values fed to an accumulator.
+
+    :param accumulator: the accumulator dictionary.
+    :type accumulator: dict
+    :param bins: number of bins or bin edges.
+    :type bins: int | list[float]
+    :return: the density and the bin edges of the histogram.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+
+    # histogram from sketch
+    density, edges = sketch.get_sketch_histogram(accumulator["sketch"], bins)
+
+    return(density, edges)
@@ -3,8 +3,8 @@
 # ======================================================= #
 from cpforager.gps.gps import GPS
 from cpforager.tdr.tdr import TDR
-from cpforager import processing
-from cpforager.axy import display, diagnostic, interpolation
+from cpforager import processing, multiresolution
+from cpforager.axy import display, diagnostic, interpolation, slicing, resolution, timegrid, tracks
 
 
 # ======================================================= #
@@ -31,7 +31,7 @@ class AXY:
         :param params: the parameters dictionary.
         :type params: dict
         
-        :ivar df: the dataframe containing the raw and processed AXY data.
+        :ivar df: the dataframe containing the raw and processed AXY data at full resolution, processed GPS and TDR data being stored at their native rates in ``df_gps`` and ``df_tdr``.
         :vartype df: pandas.DataFrame
         :ivar group: The string representing the group to which the AXY data belongs (*e.g.* species, year, fieldwork, *etc*.) useful for statistics and filtering.
         :vartype group: str
@@ -43,12 +43,16 @@ class AXY:
         :vartype n_df: int
         :ivar gps: the GPS data of AXY at GPS resolution.
         :vartype gps: cpforager.GPS
-        :ivar df_gps: the dataframe containing AXY data at GPS resolution.
+        :ivar df_gps: the dataframe containing AXY data at GPS resolution, which is the dataframe of ``gps``.
         :vartype df_gps: pandas.DataFrame
         :ivar tdr: the TDR data of AXY at TDR resolution.
         :vartype tdr: cpforager.TDR
-        :ivar df_tdr: the dataframe containing AXY data at TDR resolution.
+        :ivar df_tdr: the dataframe containing AXY data at TDR resolution, which is the dataframe of ``tdr``.
         :vartype df_tdr: pandas.DataFrame
+        :ivar gps_indices: the row positions in ``df`` of the ``df_gps`` measures.
+        :vartype gps_indices: numpy.ndarray
+        :ivar tdr_indices: the row positions in ``df`` of the ``df_tdr`` measures.
+        :vartype tdr_indices: numpy.ndarray
         :ivar start_datetime:  the starting datetime of the AXY recording.
         :vartype start_datetime: datetime.datetime
         :ivar end_datetime: the ending datetime of the AXY recording.
@@ -65,16 +69,18 @@ class AXY:
         :vartype max_odba_f: float
         :ivar median_odba_f: the median filtered overall dynamical body acceleration.
         :vartype median_odba_f: float        
+        :ivar pyramid: the multi-resolution pyramid of the signals, built at the first query (see ``build_pyramid``).
+        :vartype pyramid: dict
         """
 
         # process data
-        df, df_gps, df_tdr = processing.add_axy_data(df, params)
+        df, df_gps, df_tdr, gps_indices, tdr_indices = processing.add_axy_data(df, params)
 
-        # build GPS object
-        gps = GPS(df_gps, group, id, params)
+        # build GPS object from already processed data
+        gps = GPS(df_gps, group, id, params, processed=True)
         
-        # build TDR object
-        tdr = TDR(df_tdr, group, id, params)
+        # build TDR object from already processed data
+        tdr = TDR(df_tdr, group, id, params, processed=True)
 
         # compute additional information
         basic_infos = processing.compute_basic_infos(df)
@@ -98,6 +104,9 @@ class AXY:
         self.df_gps = df_gps
         self.tdr = tdr
         self.df_tdr = df_tdr
+        self.gps_indices = gps_indices
+        self.tdr_indices = tdr_indices
+        self.pyramid = None
 
     # [BUILT-IN METHODS] length of the class
     def __len__(self):
@@ -114,6 +123,28 @@ class AXY:
     # [METHODS] interpolate data
     interpolate_lat_lon = interpolation.interpolate_lat_lon
 
+    # [METHODS] extract time windows
+    window = slicing.window
+    windows = slicing.windows
+
+    # [METHODS] resample data on a regular time grid
+    resample = timegrid.resample
+
+    # [METHODS] simplify trajectories
+    simplify_mask = tracks.simplify_mask
+
+    # [METHODS] export trips as lines
+    export_trips = tracks.export_trips
+
+    # [METHODS] produce full resolution data
+    full_resolution = resolution.full_resolution
+
+    # [METHODS] multi-resolution pyramid
+    build_pyramid = multiresolution.build_logger_pyramid
+    query_pyramid = multiresolution.query_logger_pyramid
+    save_pyramid = multiresolution.save_logger_pyramid
+    load_pyramid = multiresolution.load_logger_pyramid
+
     # [METHODS] display the summary of the data
     display_data_summary = display.display_data_summary
 
@@ -0,0 +1,41 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+import pandas as pd
+from cpforager import processing
+
+
+# ======================================================= #
+# AXY FULL RESOLUTION [AXY METHOD]
+# ======================================================= #
+def full_resolution(self, gps_columns=None, tdr_columns=None):
+    
+    """
+    Produce the dataframe of AXY data with GPS and TDR columns at full resolution.
+        
+    :param self: an AXY object
+    :type self: cpforager.AXY
+    :param gps_columns: list of ``df_gps`` columns to add, by default the processed GPS columns.
+    :type gps_columns: list[str]
+    :param tdr_columns: list of ``df_tdr`` columns to add, by default the processed TDR columns.
+    :type tdr_columns: list[str]
+    :return: the full resolution dataframe enhanced with GPS and TDR columns composed of NA values everywhere except at the GPS and TDR resolutions.
+    :rtype: pandas.DataFrame
+    
+    GPS and TDR data are stored at their native rates in ``df_gps`` and ``df_tdr``. The NA-filled full resolution columns are thus 
+    only produced on demand, which should be avoided on long recordings as it allocates as many values as acceleration measures.
+    """
+    
+    # get attributes
+    df = self.df
+    
+    # default columns
+    if gps_columns is None: gps_columns = ["step_length", "step_speed", "step_turning_angle", "step_heading", "step_heading_to_colony", "is_suspicious", "dist_to_nest", "trip"]
+    if tdr_columns is None: tdr_columns = ["depth", "dive"]
+    
+    # produce gps and tdr columns at full resolution
+    df_gps_full = processing.get_full_resolution_data(df, self.df_gps, self.gps_indices, gps_columns)
+    df_tdr_full = processing.get_full_resolution_data(df, self.df_tdr, self.tdr_indices, tdr_columns)
+    df_full = pd.concat([df, df_gps_full, df_tdr_full], axis=1)
+    
+    return(df_full)
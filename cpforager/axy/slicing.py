@@ -0,0 +1,73 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import utils
+
+
+# ======================================================= #
+# AXY SLICING [AXY METHOD]
+# ======================================================= #
+def window(self, t0, t1, columns=None, source="df"):
+    
+    """
+    Extract the data recorded between two datetimes.
+        
+    :param self: an AXY object
+    :type self: cpforager.AXY
+    :param t0: start of the time window.
+    :type t0: datetime.datetime | pandas.Timestamp | str
+    :param t1: end of the time window.
+    :type t1: datetime.datetime | pandas.Timestamp | str
+    :param columns: list of columns to keep, every column is kept if None.
+    :type columns: list[str]
+    :param source: the dataframe in which to search, ``df`` (full resolution), ``df_gps`` (GPS resolution) or ``df_tdr`` (TDR resolution).
+    :type source: str
+    :return: the dataframe restricted to the time window [t0, t1].
+    :rtype: pandas.DataFrame
+    
+    The time window is found by binary search on the sorted ``datetime`` column and the dataframe is sliced by position without copy.
+    """
+    
+    # raise error
+    if source not in ["df", "df_gps", "df_tdr"]:
+        raise ValueError("Source %s is not valid, choose among df, df_gps and df_tdr." % (source))
+    
+    # get attributes
+    df = getattr(self, source)
+    
+    # extract time window
+    df_window = utils.get_time_window(df, t0, t1, columns)
+    
+    return(df_window)
+
+
+def windows(self, starts, ends, columns=None, source="df"):
+    
+    """
+    Extract the data recorded between several pairs of datetimes.
+        
+    :param self: an AXY object
+    :type self: cpforager.AXY
+    :param starts: starts of the time windows.
+    :type starts: array-like of datetimes
+    :param ends: ends of the time windows.
+    :type ends: array-like of datetimes
+    :param columns: list of columns to keep, every column is kept if None.
+    :type columns: list[str]
+    :param source: the dataframe in which to search, ``df`` (full resolution), ``df_gps`` (GPS resolution) or ``df_tdr`` (TDR resolution).
+    :type source: str
+    :return: the list of dataframes restricted to each time window.
+    :rtype: list[pandas.DataFrame]
+    """
+    
+    # raise error
+    if source not in ["df", "df_gps", "df_tdr"]:
+        raise ValueError("Source %s is not valid, choose among df, df_gps and df_tdr." % (source))
+    
+    # get attributes
+    df = getattr(self, source)
+    
+    # extract time windows
+    df_windows = utils.get_time_windows(df, starts, ends, columns)
+    
+    return(df_windows)
@@ -0,0 +1,43 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import resampling
+
+
+# ======================================================= #
+# AXY RESAMPLING [AXY METHOD]
+# ======================================================= #
+def resample(self, period, columns_methods, source="df", chunk_size=1000000, max_gap=None):
+    
+    """
+    Resample the AXY data on a regular time grid.
+        
+    :param self: a AXY object
+    :type self: cpforager.AXY
+    :param period: period of the grid in seconds.
+    :type period: float
+    :param columns_methods: dictionary giving for each column to resample the method to apply, *e.g.* ``{"odba":"mean", "depth":"max"}``.
+    :type columns_methods: dict
+    :param source: the dataframe to resample, ``df`` (full resolution), ``df_gps`` (GPS resolution) or ``df_tdr`` (TDR resolution).
+    :type source: str
+    :param chunk_size: approximate number of rows processed at once, every row at once if None.
+    :type chunk_size: int
+    :param max_gap: maximum duration in seconds between the measures surrounding an interpolated datetime, no maximum if None.
+    :type max_gap: float
+    :return: the resampled dataframe with the ``datetime`` column of the grid and the resampled columns.
+    :rtype: pandas.DataFrame
+    
+    See ``resampling.resample_dataframe`` for the grid and the table of possible methods.
+    """
+    
+    # raise error
+    if source not in ["df", "df_gps", "df_tdr"]:
+        raise ValueError("Source %s is not valid, choose among df, df_gps and df_tdr." % (source))
+    
+    # get attributes
+    df = getattr(self, source)
+    
+    # resample dataframe
+    df_resampled = resampling.resample_dataframe(df, period, columns_methods, chunk_size, max_gap)
+    
+    return(df_resampled)
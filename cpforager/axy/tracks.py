@@ -0,0 +1,64 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import simplification, geoexport
+
+
+# ======================================================= #
+# AXY TRACK SIMPLIFICATION [AXY METHOD]
+# ======================================================= #
+def simplify_mask(self, tolerance, algorithm="douglas_peucker", projection="colony"):
+    
+    """
+    Compute the mask of the GPS positions kept by the simplification of every trip.
+        
+    :param self: a AXY object
+    :type self: cpforager.AXY
+    :param tolerance: tolerance in metres of the simplification.
+    :type tolerance: float
+    :param algorithm: ``"douglas_peucker"`` or ``"visvalingam"``.
+    :type algorithm: str
+    :param projection: ``"colony"`` for the projection centred on the nest position or ``"geodesic"``.
+    :type projection: str
+    :return: the mask of the kept rows of ``df_gps``.
+    :rtype: numpy.ndarray(bool)
+    
+    Trips and the periods between them are simplified independently so that trip boundaries are kept. Any column is subset consistently with the mask.
+    """
+    
+    # get attributes
+    gps = self.gps
+    
+    # compute mask
+    mask = simplification.get_gps_simplified_mask(gps, tolerance, algorithm, projection)
+    
+    return(mask)
+
+
+# ======================================================= #
+# AXY TRACK EXPORT [AXY METHOD]
+# ======================================================= #
+def export_trips(self, file_path, tolerance=None):
+    
+    """
+    Export the trips as LineStrings carrying the trip statistics to a GeoJSON or GeoParquet file.
+        
+    :param self: a AXY object
+    :type self: cpforager.AXY
+    :param file_path: path of the ``.geojson``, ``.json`` or ``.parquet`` file.
+    :type file_path: str
+    :param tolerance: tolerance in metres of the Douglas-Peucker simplification of the lines (see ``simplify_mask``), lines are not simplified if None.
+    :type tolerance: float
+    :return: the dataframe of trip attributes, one row per exported trip.
+    :rtype: pandas.DataFrame
+    
+    The format is given by the file extension, see ``geoexport.build_trip_lines`` for the exported attributes.
+    """
+    
+    # get attributes
+    gps = self.gps
+    
+    # build and write trip lines
+    df_attributes = geoexport.export_gps_trips(gps, file_path, tolerance)
+    
+    return(df_attributes)
@@ -1,7 +1,8 @@
 # ================================================================================================ #
 # LIBRARIES
 # ================================================================================================ #
-from cpforager.axy_collection import diagnostic, display
+from cpforager import rendering
+from cpforager.axy_collection import diagnostic, display, timegrid, tracks, formats
 from cpforager.gps_collection.gps_collection import GPS_Collection
 from cpforager.tdr_collection.tdr_collection import TDR_Collection
 
@@ -51,6 +52,11 @@ class AXY_Collection:
         # build GPS_Collection and TDR_Collection objects
         gps_collection = GPS_Collection(gps_collection)
         tdr_collection = TDR_Collection(tdr_collection)
+        
+        # share the rebuilt GPS and TDR dataframes
+        for axy in axy_collection:
+            axy.df_gps = axy.gps.df
+            axy.df_tdr = axy.tdr.df
 
         # set attributes
         self.axy_collection = axy_collection
@@ -77,10 +83,25 @@ class AXY_Collection:
     # [METHODS] display the summary of the data
     display_data_summary = display.display_data_summary
 
+    # [METHODS] align members on a common time grid
+    align = timegrid.align
+
+    # [METHODS] simplify trajectories
+    simplify_mask = tracks.simplify_mask
+
+    # [METHODS] export trips as lines
+    export_trips = tracks.export_trips
+
     # [METHODS] plot data
     plot_trip_stats_summary = diagnostic.plot_trip_stats_summary
     plot_dive_stats_summary = diagnostic.plot_dive_stats_summary
     maps_diag = diagnostic.maps_diagnostic
     indiv_map_all = diagnostic.indiv_map_all
     indiv_depth_all = diagnostic.indiv_depth_all
-    folium_map = diagnostic.folium_map
\ No newline at end of file
+    folium_map = diagnostic.folium_map
+
+    # [METHODS] render diagnostics of every member in parallel
+    render_all = rendering.render_all
+    
+    # [METHODS] Movebank formatting
+    to_Movebank = formats.to_Movebank
\ No newline at end of file
@@ -2,18 +2,26 @@
 # LIBRARIES
 # ======================================================= #
 import numpy as np
+from cpforager import accumulators
 
 
 # ======================================================= #
 # DISPLAY [AXY_COLLECTION METHODS]
 # ======================================================= #
-def display_data_summary(self, standalone=True):
+def display_data_summary(self, standalone=True, streaming=False):
     
     """    
     Print in terminal the AXY_Collection data summary.
     
     :param self: a AXY_Collection object
     :type self: cpforager.AXY_Collection
+    :param standalone: display information standalone if True.
+    :type standalone: bool
+    :param streaming: compute the collection statistics from streaming accumulators fed logger by logger if True (see ``GPS_Collection.display_data_summary``).
+    :type streaming: bool
+    
+    With ``streaming=True``, the ODBA statistics are also printed. They are computed from streaming accumulators fed AXY by AXY and chunk by chunk, 
+    since the AXY data are never concatenated. Thus, the ODBA quantiles are estimated within a 1% relative error (see ``accumulators.init_accumulator``).
     """
 
     # get attributes
@@ -30,6 +38,12 @@ def display_data_summary(self, standalone=True):
     groups_str = "| "
     for group in np.unique(groups):
         groups_str = groups_str + "%s [%d AXY] | " % (group, sum(np.isin(groups, group)))
+        
+    # get odba statistics chunk by chunk
+    if streaming:
+        odba_accumulators = accumulators.accumulate_columns([axy.df for axy in axy_collection], ["odba", "odba_f"], chunk_size=1000000)
+        odba_stats = accumulators.get_accumulator_statistics(odba_accumulators["odba"], [0.5])
+        odba_f_stats = accumulators.get_accumulator_statistics(odba_accumulators["odba_f"], [0.5])
     
     # print information
     if standalone:
@@ -38,8 +52,13 @@ def display_data_summary(self, standalone=True):
         print("# + Nb of AXY   = %d" % self.n_axy)
         print("# + Nb of trips = %d" % self.n_trips)
         print("# + Groups      = %s" % groups_str)
-    gps_collection.display_data_summary(standalone=False)
-    tdr_collection.display_data_summary(standalone=False)
+    gps_collection.display_data_summary(standalone=False, streaming=streaming)
+    tdr_collection.display_data_summary(standalone=False, streaming=streaming)
+    if streaming:
+        print("# ------------------------------ AXY COLLECTION DATA ------------------ #")
+        print("# + Nb of measures : %d" % sum([axy.n_df for axy in axy_collection]))
+        print("# + Odba           : mean=%.3f | std=%.3f | q50=%.3f | max=%.3f" % (odba_stats["mean"], odba_stats["std"], odba_stats["quantiles"][0], odba_stats["max"]))
+        print("# + Odba_f         : mean=%.3f | std=%.3f | q50=%.3f | max=%.3f" % (odba_f_stats["mean"], odba_f_stats["std"], odba_f_stats["quantiles"][0], odba_f_stats["max"]))
     if standalone:
         print("# ===================================================================== #")
     
\ No newline at end of file
@@ -0,0 +1,46 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import alignment
+
+
+# ======================================================= #
+# AXY_COLLECTION ALIGNMENT [AXY_COLLECTION METHOD]
+# ======================================================= #
+def align(self, period, columns_methods, source="df", reference="absolute", start=None, end=None, chunk_size=None, max_gap=None):
+    
+    """
+    Align every AXY of the collection on a common regular time grid.
+        
+    :param self: a AXY_Collection object
+    :type self: cpforager.AXY_Collection
+    :param period: period of the grid in seconds.
+    :type period: float
+    :param columns_methods: dictionary giving for each column to align the method to apply, ``"linear"`` or ``"nearest"``, *e.g.* ``{"odba":"linear", "trip":"nearest"}``.
+    :type columns_methods: dict
+    :param source: the dataframe of the members to align, ``df`` (full resolution), ``df_gps`` (GPS resolution) or ``df_tdr`` (TDR resolution).
+    :type source: str
+    :param reference: ``"absolute"`` to align every AXY on datetimes, or ``"trip"`` to align every trip on the time elapsed since its departure.
+    :type reference: str
+    :param start: first datetime of the grid for ``"absolute"`` reference, by default the earliest datetime of the collection.
+    :type start: datetime.datetime | pandas.Timestamp | str
+    :param end: last datetime of the grid for ``"absolute"`` reference, by default the latest datetime of the collection.
+    :type end: datetime.datetime | pandas.Timestamp | str
+    :param chunk_size: number of grid times interpolated at once, every grid time at once if None.
+    :type chunk_size: int
+    :param max_gap: maximum duration in seconds between the measures surrounding an interpolated time, no maximum if None.
+    :type max_gap: float
+    :return: the aligned dictionary.
+    :rtype: dict
+    
+    See ``alignment.align_members`` for the grid, the individuals and the exhaustive table of the aligned dictionary keys.
+    """
+    
+    # get attributes
+    members = self.axy_collection
+    gps_collection = self.gps_collection
+    
+    # align members
+    aligned = alignment.align_members(members, gps_collection, period, columns_methods, source, reference, start, end, chunk_size, max_gap)
+    
+    return(aligned)
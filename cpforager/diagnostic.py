@@ -1,14 +1,21 @@
 # ================================================================================================ #
 # LIBRARIES
 # ================================================================================================ #
+import os
+import pickle
+import hashlib
 import numpy as np
 import pandas as pd
-from cpforager import misc, processing
+from cpforager import misc, processing, sketch
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import matplotlib.colors as mcols
 from matplotlib.patches import Rectangle
+from matplotlib.lines import Line2D
 import cartopy.feature as cfeature
+import cartopy.crs as ccrs
+import cartopy.io.shapereader as shpreader
+import shapely
 import folium
 from folium.plugins import GroupedLayerControl, BeautifyIcon
 import branca.colormap as cm
@@ -53,6 +60,151 @@ def get_datetime_locator_formatter(df, custom_locator=None, custom_formatter=Non
     return(datetime_locator, datetime_formatter)
 
 
+# ================================================================================================ #
+# LEVEL OF DETAIL
+# ================================================================================================ #
+def get_lod_indices(datetimes, values, n_buckets):
+    
+    """    
+    Find the indices of the minimum and maximum values within every time bucket.
+    
+    :param datetimes: datetimes of the timeserie.
+    :type datetimes: pandas.Series(dtype="datetime64[ns]")
+    :param values: values of the timeserie.
+    :type values: pandas.Series
+    :param n_buckets: number of time buckets.
+    :type n_buckets: int
+    :return: the sorted indices of the points to keep.
+    :rtype: numpy.ndarray
+    
+    The time range is split into ``n_buckets`` buckets of equal duration, in which only the first, last, minimum and maximum points are kept. 
+    With one bucket per pixel column, the decimated timeserie draws the same envelope as the full timeserie, so that spikes are preserved. 
+    The computation is vectorized using NumPy reductions over contiguous buckets.
+    """
+    
+    # get timeserie as arrays
+    t = np.asarray(datetimes, dtype="datetime64[ns]").astype(np.int64)
+    v = np.asarray(values, dtype=float)
+    n = len(t)
+    
+    # compute bucket of every point
+    t_min, t_max = t.min(), t.max()
+    buckets = np.minimum(((t-t_min)/max(t_max-t_min, 1)*n_buckets).astype(np.int64), n_buckets-1)
+    order = np.argsort(buckets, kind="stable")
+    buckets = buckets[order]
+    v = v[order]
+    bucket_vals, bucket_starts = np.unique(buckets, return_index=True)
+    bucket_ends = np.append(bucket_starts[1:], n)
+    
+    # compute minimum and maximum of every bucket ignoring NaN values
+    v_min = np.where(np.isnan(v), np.inf, v)
+    v_max = np.where(np.isnan(v), -np.inf, v)
+    bucket_mins = np.repeat(np.minimum.reduceat(v_min, bucket_starts), bucket_ends-bucket_starts)
+    bucket_maxs = np.repeat(np.maximum.reduceat(v_max, bucket_starts), bucket_ends-bucket_starts)
+    
+    # keep first, last, minimum and maximum points of every bucket
+    is_kept = np.zeros(n, dtype=bool)
+    is_kept[bucket_starts] = True
+    is_kept[bucket_ends-1] = True
+    is_min = np.flatnonzero(v_min == bucket_mins)
+    is_max = np.flatnonzero(v_max == bucket_maxs)
+    is_kept[is_min[np.unique(buckets[is_min], return_index=True)[1]]] = True
+    is_kept[is_max[np.unique(buckets[is_max], return_index=True)[1]]] = True
+    indices = np.sort(order[is_kept])
+    
+    return(indices)
+
+
+def get_lod_df(ax, df, plot_params, columns):
+    
+    """    
+    Decimate the dataframe of a line timeserie panel according to the size in pixels of the axes.
+    
+    :param ax: plot axes. 
+    :type ax: matplotlib.Axes 
+    :param df: dataframe with a ``datetime`` column and the columns to plot.
+    :type df: pandas.DataFrame
+    :param plot_params: plot parameters dictionary. 
+    :type plot_params: dict
+    :param columns: names of the plotted columns whose extrema must be kept.
+    :type columns: list[str]
+    :return: the decimated dataframe.
+    :rtype: pandas.DataFrame
+    
+    The number of time buckets is the width of the axes in pixels, derived from the figure size and dpi. Points kept for every column are 
+    gathered, so that a decimated dataframe is only used when it is several times smaller than the full one. Level of detail is disabled if 
+    ``lod`` is False in the plot parameters.
+    """
+    
+    # number of buckets from the axes width in pixels
+    n_buckets = max(int(ax.get_window_extent().width), 1)
+    
+    # decimate only if the timeserie has many more points than pixels
+    if (not plot_params.get("lod")) or (len(df) <= 4*n_buckets):
+        return(df)
+    
+    # keep extrema of every column
+    indices = np.unique(np.concatenate([get_lod_indices(df["datetime"], df[column].to_numpy(dtype=float, na_value=np.nan), n_buckets) for column in columns]))
+    df_lod = df.iloc[indices]
+    
+    return(df_lod)
+
+
+def get_lod_scatter_df(ax, df, plot_params, column, groups=None):
+    
+    """    
+    Decimate the dataframe of a scatter timeserie panel to one point per pixel of the axes.
+    
+    :param ax: plot axes. 
+    :type ax: matplotlib.Axes 
+    :param df: dataframe with a ``datetime`` column and the plotted column.
+    :type df: pandas.DataFrame
+    :param plot_params: plot parameters dictionary. 
+    :type plot_params: dict
+    :param column: name of the plotted column.
+    :type column: str
+    :param groups: group of every point, *e.g.* its trip, one point being kept per pixel for every group.
+    :type groups: numpy.ndarray(int)
+    :return: the decimated dataframe.
+    :rtype: pandas.DataFrame
+    
+    The time and value ranges are split into as many cells as the axes has pixels, derived from the figure size and dpi, in which only the first 
+    point is kept. Unlike ``get_lod_df`` which keeps the extrema of every pixel column, and would draw a dense band of points as its hollow outline, 
+    every pixel covered by the full scatter plot remains covered. Level of detail is disabled if ``lod`` is False in the plot parameters.
+    """
+    
+    # number of cells from the axes size in pixels
+    window_extent = ax.get_window_extent()
+    n_cols = max(int(window_extent.width), 1)
+    n_rows = max(int(window_extent.height), 1)
+    
+    # decimate only if the timeserie has many more points than pixel columns
+    if (not plot_params.get("lod")) or (len(df) <= 4*n_cols):
+        return(df)
+    
+    # get valid points as arrays
+    t = np.asarray(df["datetime"], dtype="datetime64[ns]").astype(np.int64)
+    v = df[column].to_numpy(dtype=float, na_value=np.nan)
+    g = np.zeros(len(df), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+    valid_rows = np.flatnonzero(~np.isnan(v))
+    if len(valid_rows) == 0:
+        return(df.iloc[valid_rows])
+    t, v, g = t[valid_rows], v[valid_rows], g[valid_rows]
+    
+    # compute cell of every point
+    t_min, t_max = t.min(), t.max()
+    v_min, v_max = v.min(), v.max()
+    cols = np.minimum(((t-t_min)/max(t_max-t_min, 1)*n_cols).astype(np.int64), n_cols-1)
+    rows = np.minimum(((v-v_min)/max(v_max-v_min, np.finfo(float).tiny)*n_rows).astype(np.int64), n_rows-1)
+    
+    # keep first point of every cell and group
+    keys = (cols*n_rows+rows)*(g.max()-g.min()+1)+(g-g.min())
+    _, first_rows = np.unique(keys, return_index=True)
+    df_lod = df.iloc[np.sort(valid_rows[first_rows])]
+    
+    return(df_lod)
+
+
 # ================================================================================================ #
 # PLOT NIGHT
 # ================================================================================================ #
@@ -143,9 +295,11 @@ def plot_ts(ax, df, params, plot_params, var, title, var_lab, custom_locator=Non
     datetime_locator, datetime_formatter = get_datetime_locator_formatter(df, custom_locator, custom_formatter)
     plot_night(df, params, plot_params)
     if scatter:
-        plt.scatter(df["datetime"], df[var], s=plot_params["pnt_size"], marker=plot_params["pnt_type"])
+        df_lod = get_lod_scatter_df(ax, df, plot_params, var)
+        plt.scatter(df_lod["datetime"], df_lod[var], s=plot_params["pnt_size"], marker=plot_params["pnt_type"])
     else:
-        plt.plot(df["datetime"], df[var], linewidth=plot_params["pnt_size"])
+        df_lod = get_lod_df(ax, df, plot_params, [var])
+        plt.plot(df_lod["datetime"], df_lod[var], linewidth=plot_params["pnt_size"])
     if not(hline is None):
         plt.axhline(y=hline, color="orange", linestyle="--", linewidth=plot_params["pnt_size"])
     if not(eph_cond is None):
@@ -158,6 +312,38 @@ def plot_ts(ax, df, params, plot_params, var, title, var_lab, custom_locator=Non
     ax.xaxis.set(major_locator=datetime_locator, major_formatter=datetime_formatter)
 
 
+# ================================================================================================ #
+# GET TRIP COLORS
+# ================================================================================================ # 
+def get_trip_colors(trips, n_trips, color_palette):
+        
+    """    
+    Compute the color of every point belonging to a trip.
+    
+    :param trips: trip of every point, 0 or NA outside of trips.
+    :type trips: pandas.Series
+    :param n_trips: number of trips.
+    :type n_trips: int
+    :param color_palette: discrete color palette for the trip coloring.
+    :type color_palette: list[list[float]]
+    :return: the boolean array of points belonging to a trip and the RGBA colors of these points.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    
+    The i-th trip is colored with the i-th color of the palette, cycling over the palette. Colors are looked up in a single NumPy indexing 
+    so that the cost does not depend on the number of trips.
+    """
+    
+    # find points within trips
+    trips = trips.to_numpy(dtype=float, na_value=0).astype(int)
+    is_trip = (trips >= 1) & (trips <= n_trips)
+    
+    # look up trip colors
+    palette = mcols.to_rgba_array(color_palette)
+    trip_colors = palette[(trips[is_trip]-1) % len(palette)]
+    
+    return(is_trip, trip_colors)
+
+
 # ================================================================================================ #
 # PLOT TIMESERIES WITH TRIP COLORS
 # ================================================================================================ # 
@@ -189,14 +375,13 @@ def plot_ts_wtrips(ax, df, params, plot_params, n_trips, var, title, var_lab, cu
     """
 
     # plot timeserie of var in dataframe with trip colors
-    n_cols = len(plot_params["cols_1"])
     datetime_locator, datetime_formatter = get_datetime_locator_formatter(df, custom_locator, custom_formatter)
     plot_night(df, params, plot_params)
-    plt.scatter(df["datetime"], df[var], s=plot_params["pnt_size"], marker=plot_params["pnt_type"], color="black")
+    df_lod = get_lod_scatter_df(ax, df, plot_params, var, groups=df["trip"].to_numpy(dtype=float, na_value=0).astype(int))
+    plt.scatter(df_lod["datetime"], df_lod[var], s=plot_params["pnt_size"], marker=plot_params["pnt_type"], color="black")
     if n_trips >= 1:
-        for i in range(n_trips):
-            trip_id = i+1
-            plt.scatter(df.loc[df["trip"] == trip_id, "datetime"], df.loc[df["trip"] == trip_id, var], s=plot_params["pnt_size"], color=plot_params["cols_1"][i % n_cols])
+        is_trip, trip_colors = get_trip_colors(df_lod["trip"], n_trips, plot_params["cols_1"])
+        plt.scatter(df_lod.loc[is_trip, "datetime"], df_lod.loc[is_trip, var], s=plot_params["pnt_size"], color=trip_colors)
     plt.title(title, fontsize=plot_params["main_fs"])
     plt.xlabel("Time", fontsize=plot_params["labs_fs"])
     plt.ylabel(var_lab, fontsize=plot_params["labs_fs"])
@@ -241,13 +426,17 @@ def plot_ts_twinx(ax, df, params, plot_params, var, title, var_lab, custom_locat
     datetime_locator, datetime_formatter = get_datetime_locator_formatter(df, custom_locator, custom_formatter)
     plot_night(df, params, plot_params)
     if scatter:
-        plt.scatter(df["datetime"], df[var], s=plot_params["pnt_size"], marker=plot_params["pnt_type"], edgecolor="None")
+        df_lod = get_lod_scatter_df(ax, df, plot_params, var)
+        df_lod_f = get_lod_scatter_df(ax, df, plot_params, "%s_f" % var)
+        plt.scatter(df_lod["datetime"], df_lod[var], s=plot_params["pnt_size"], marker=plot_params["pnt_type"], edgecolor="None")
         ax_twinx = ax.twinx()
-        ax_twinx.scatter(df["datetime"], df["%s_f" % var], s=plot_params["pnt_size"], marker=plot_params["pnt_type"], edgecolor="None", color="red")
+        ax_twinx.scatter(df_lod_f["datetime"], df_lod_f["%s_f" % var], s=plot_params["pnt_size"], marker=plot_params["pnt_type"], edgecolor="None", color="red")
     else:
-        plt.plot(df["datetime"], df[var], linewidth=plot_params["pnt_size"])
+        df_lod = get_lod_df(ax, df, plot_params, [var])
+        df_lod_f = get_lod_df(ax, df, plot_params, ["%s_f" % var])
+        plt.plot(df_lod["datetime"], df_lod[var], linewidth=plot_params["pnt_size"])
         ax_twinx = ax.twinx()
-        ax_twinx.plot(df["datetime"], df["%s_f" % var], linewidth=plot_params["pnt_size"], color="red")
+        ax_twinx.plot(df_lod_f["datetime"], df_lod_f["%s_f" % var], linewidth=plot_params["pnt_size"], color="red")
     plt.title(title, fontsize=plot_params["main_fs"])
     plt.xlabel("Time", fontsize=plot_params["labs_fs"])
     plt.ylabel(var_lab, fontsize=plot_params["labs_fs"])
@@ -405,6 +594,119 @@ def plot_hist(df, plot_params, var, title, var_lab, bins=None, color=None, alpha
         plt.gca().xaxis.set(major_locator=datetime_locator, major_formatter=datetime_formatter)
     
  
+# ================================================================================================ #
+# PLOT SUMMARIES FROM SKETCHES
+# ================================================================================================ #
+def plot_hist_sketch(var_sketch, plot_params, title, var_lab, bins=10):
+        
+    """    
+    Plot the histogram of a variable from its quantile sketch.
+    
+    :param var_sketch: the sketch dictionary of the variable (see ``sketch.build_sketch``).
+    :type var_sketch: dict
+    :param plot_params: plot parameters dictionary. 
+    :type plot_params: dict
+    :param title: plot title.
+    :type title: str
+    :param var_lab: x-axis label.
+    :type var_lab: str
+    :param bins: number of bins or bin edges.
+    :type bins: int | list[float]
+    """
+       
+    # plot histogram of var
+    density, edges = sketch.get_sketch_histogram(var_sketch, bins)
+    plt.bar(edges[:-1], density, width=np.diff(edges), align="edge", edgecolor="white")
+    plt.title(title, fontsize=plot_params["main_fs"])
+    plt.xlabel(var_lab, fontsize=plot_params["labs_fs"])
+    plt.ylabel("Frequency", fontsize=plot_params["labs_fs"])
+    plt.tick_params(axis="both", labelsize=plot_params["axis_fs"])
+    plt.grid(linestyle=plot_params["grid_lty"], linewidth=plot_params["grid_lwd"], color=plot_params["grid_col"])
+
+
+def plot_box_sketch(var_sketch, plot_params, title, var_lab):
+        
+    """    
+    Plot the boxplot of a variable from its quantile sketch.
+    
+    :param var_sketch: the sketch dictionary of the variable (see ``sketch.build_sketch``).
+    :type var_sketch: dict
+    :param plot_params: plot parameters dictionary. 
+    :type plot_params: dict
+    :param title: plot title.
+    :type title: str
+    :param var_lab: x-axis label.
+    :type var_lab: str
+    
+    Whiskers extend to the furthest bucket within 1.5 times the interquartile range and buckets beyond are drawn as a single flier.
+    """
+    
+    # compute box statistics
+    [q1, med, q3] = sketch.get_sketch_quantiles(var_sketch, [0.25, 0.50, 0.75])
+    values, counts = sketch.get_sketch_buckets(var_sketch)
+    is_whisker = (values >= q1-1.5*(q3-q1)) & (values <= q3+1.5*(q3-q1))
+    whislo = values[is_whisker].min() if is_whisker.any() else q1
+    whishi = values[is_whisker].max() if is_whisker.any() else q3
+    stats = {"med":med, "q1":q1, "q3":q3, "whislo":whislo, "whishi":whishi, "fliers":values[~is_whisker], "label":""}
+       
+    # boxplot of var
+    plt.gca().bxp([stats], orientation="horizontal")
+    plt.title(title, fontsize=plot_params["main_fs"])
+    plt.xlabel(var_lab, fontsize=plot_params["labs_fs"])
+    plt.tick_params(axis="both", labelsize=plot_params["axis_fs"])
+    plt.grid(linestyle=plot_params["grid_lty"], linewidth=plot_params["grid_lwd"], color=plot_params["grid_col"])
+
+
+def plot_cumulative_distribution_sketch(var_sketch, plot_params, title, var_lab, v_qs=[0.25, 0.50, 0.75]):
+        
+    """   
+    Plot the cumulative distribution of a variable from its quantile sketch.
+    
+    :param var_sketch: the sketch dictionary of the variable (see ``sketch.build_sketch``).
+    :type var_sketch: dict
+    :param plot_params: plot parameters dictionary. 
+    :type plot_params: dict
+    :param title: plot title.
+    :type title: str
+    :param var_lab: x-axis label.
+    :type var_lab: str
+    :param v_qs: list of quantiles to emphasize.
+    :type v_qs: list[float]
+    
+    Useful to plot cumulative distribution of trip and dive statistics merged over a collection. Only the axes are drawn if the sketch is empty.
+    """
+    
+    # total number of trips
+    n_df = var_sketch["n"]
+    
+    # empty sketch
+    if n_df == 0:
+        plt.xlabel(var_lab, fontsize=plot_params["labs_fs"])
+        plt.ylabel("Number of trips", fontsize=plot_params["labs_fs"])
+        plt.tick_params(axis="both", labelsize=plot_params["axis_fs"])
+        plt.grid(linestyle=plot_params["grid_lty"], linewidth=plot_params["grid_lwd"], color=plot_params["grid_col"])
+        plt.title("Cumulative distribution - %s \n| no data |" % title, fontsize=plot_params["main_fs"])
+        return
+    
+    # compute cumulative distrib of var
+    quantiles = np.arange(0,1,0.01)
+    cumul_distrib = sketch.get_sketch_quantiles(var_sketch, quantiles)
+
+    # plot cumulative distrib of var
+    plt.plot(cumul_distrib, quantiles*n_df)
+    plt.xlabel(var_lab, fontsize=plot_params["labs_fs"])
+    plt.ylabel("Number of trips", fontsize=plot_params["labs_fs"])
+    plt.tick_params(axis="both", labelsize=plot_params["axis_fs"])
+    plt.grid(linestyle=plot_params["grid_lty"], linewidth=plot_params["grid_lwd"], color=plot_params["grid_col"])
+    plt.axhline(y=n_df, color="black", linestyle="dashed", linewidth=1.0)
+    title = "%s \n|" % title
+    for v_q, q in zip(v_qs, sketch.get_sketch_quantiles(var_sketch, v_qs)):
+        plt.axvline(x=q, color="red", linestyle="dashed", linewidth=1.0)
+        plt.text(q, 0, "q%d" % int(100*v_q), rotation="vertical", fontsize=plot_params["labs_fs"])
+        title = "%s q%d=%d |" % (title, int(100*v_q), int(q))
+    plt.title("Cumulative distribution - %s" % title, fontsize=plot_params["main_fs"])
+    
+ 
 # ================================================================================================ #
 # PLOT POLAR HISTOGRAMS
 # ================================================================================================ #    
@@ -441,6 +743,147 @@ def plot_angle_polar(ax, df, plot_params, var, title, var_lab):
     plt.grid(linestyle=plot_params["grid_lty"], linewidth=plot_params["grid_lwd"], color=plot_params["grid_col"])
     
     
+# ================================================================================================ #
+# CACHED LAND AND COASTLINE GEOMETRIES
+# ================================================================================================ #
+geometries_cache = {}
+
+
+def get_map_extent(df, params, zoom):
+    
+    """    
+    Compute the extent of the geometries to draw on a map panel.
+    
+    :param df: dataframe with ``longitude`` and ``latitude`` columns.
+    :type df: pandas.DataFrame
+    :param params: parameters dictionary. 
+    :type params: dict
+    :param zoom: zooming factor around nest, the extent of the trajectory being used if 0. 
+    :type zoom: float
+    :return: the extent [lon_min, lon_max, lat_min, lat_max] in degrees.
+    :rtype: list[float]
+    
+    The extent of a zoomed panel only depends on the colony box and the zoom. Otherwise the extent of the trajectory is padded by its largest 
+    span, to cover the equal aspect ratio view, and snapped to a 0.5° grid so that birds of the same colony mostly share the same extent.
+    
+    .. note::
+        The required fields in the parameters dictionary are ``colony``.
+    """
+    
+    # get parameters
+    colony = params.get("colony")
+    
+    # compute extent
+    if zoom > 0:
+        colony_clon = (colony["box_longitude"][0]+colony["box_longitude"][1])/2
+        colony_clat = (colony["box_latitude"][0]+colony["box_latitude"][1])/2
+        colony_dlon = (colony["box_longitude"][1]-colony["box_longitude"][0])/2
+        colony_dlat = (colony["box_latitude"][1]-colony["box_latitude"][0])/2
+        extent = [colony_clon - zoom*colony_dlon, colony_clon + zoom*colony_dlon, colony_clat - zoom*colony_dlat, colony_clat + zoom*colony_dlat]
+    else:
+        lon_min = np.nanmin(np.append(df["longitude"].to_numpy(dtype=float, na_value=np.nan), colony["center"][0]))
+        lon_max = np.nanmax(np.append(df["longitude"].to_numpy(dtype=float, na_value=np.nan), colony["center"][0]))
+        lat_min = np.nanmin(np.append(df["latitude"].to_numpy(dtype=float, na_value=np.nan), colony["center"][1]))
+        lat_max = np.nanmax(np.append(df["latitude"].to_numpy(dtype=float, na_value=np.nan), colony["center"][1]))
+        pad = max(lon_max-lon_min, lat_max-lat_min, 0.5)
+        extent = [np.floor(2*(lon_min-pad))/2, np.ceil(2*(lon_max+pad))/2, np.floor(2*(lat_min-pad))/2, np.ceil(2*(lat_max+pad))/2]
+    
+    return(extent)
+
+
+def get_cached_geometries(name, extent, plot_params):
+    
+    """    
+    Get the land or coastline geometries clipped to an extent from the cache.
+    
+    :param name: name of the Natural Earth physical layer, *i.e.* ``land`` or ``coastline``.
+    :type name: str
+    :param extent: the extent [lon_min, lon_max, lat_min, lat_max] in degrees.
+    :type extent: list[float]
+    :param plot_params: plot parameters dictionary. 
+    :type plot_params: dict
+    :return: the clipped geometries.
+    :rtype: numpy.ndarray
+    
+    Geometries are read once from the local shapefile given by ``land_shp`` or ``coastline_shp`` in the plot parameters, or from the 10m 
+    Natural Earth shapefile of cartopy otherwise, and are then clipped once by extent. Both the full and clipped geometries are kept in memory, 
+    and clipped geometries are also saved in the ``geom_cache_dir`` directory of the plot parameters if it is not None.
+    The shapefile is identified by its absolute path, modification time and size, so that shapefiles sharing a name or edited in place 
+    do not share cached geometries.
+    """
+    
+    # get parameters
+    shp_path = plot_params.get("%s_shp" % name)
+    cache_dir = plot_params.get("geom_cache_dir")
+    
+    # identify shapefile
+    if shp_path is None:
+        shp_path = shpreader.natural_earth(resolution="10m", category="physical", name=name)
+    shp_path = os.path.abspath(shp_path)
+    shp_stat = os.stat(shp_path)
+    source = (shp_path, shp_stat.st_mtime_ns, shp_stat.st_size)
+    
+    # get full geometries from memory or shapefile
+    if (name, source) not in geometries_cache:
+        geometries_cache[(name, source)] = np.array(list(shpreader.Reader(shp_path).geometries()), dtype=object)
+    
+    # get clipped geometries from memory, disk or by clipping full geometries
+    key = (name, source, tuple(np.round(extent, 6)))
+    if key not in geometries_cache:
+        cache_path = None
+        if cache_dir is not None:
+            source_id = hashlib.sha256(repr(source).encode("utf-8")).hexdigest()[:16]
+            cache_id = "%s_%s_%s_%.6f_%.6f_%.6f_%.6f" % (name, os.path.splitext(os.path.basename(shp_path))[0], source_id, *extent)
+            cache_path = os.path.join(cache_dir, "%s.pkl" % cache_id)
+        if (cache_path is not None) and os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                geometries = pickle.load(f)
+        else:
+            geometries = geometries_cache[(name, source)]
+            geometries = geometries[shapely.intersects(geometries, shapely.box(extent[0], extent[2], extent[1], extent[3]))]
+            geometries = shapely.clip_by_rect(geometries, extent[0], extent[2], extent[1], extent[3])
+            geometries = geometries[~shapely.is_empty(geometries)]
+            if cache_path is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(cache_path, "wb") as f:
+                    pickle.dump(geometries, f)
+        geometries_cache[key] = geometries
+    
+    return(geometries_cache[key])
+
+
+def plot_land(ax, df, params, plot_params, zoom):
+    
+    """    
+    Plot land and coastline on a map panel using the cached geometries.
+    
+    :param ax: plot axes.
+    :type ax: cartopy.mpl.geoaxes.GeoAxes
+    :param df: dataframe with ``longitude`` and ``latitude`` columns.
+    :type df: pandas.DataFrame
+    :param params: parameters dictionary. 
+    :type params: dict
+    :param plot_params: plot parameters dictionary. 
+    :type plot_params: dict
+    :param zoom: zooming factor around nest, the extent of the trajectory being used if 0. 
+    :type zoom: float
+    
+    Pre-clipped geometries are drawn directly, so that the full 10m Natural Earth geometries are not re-projected and re-clipped by every panel.
+    
+    .. note::
+        The required fields in the parameters dictionary are ``colony``.
+    """
+    
+    # get cached geometries
+    extent = get_map_extent(df, params, zoom)
+    land = get_cached_geometries("land", extent, plot_params)
+    coastline = get_cached_geometries("coastline", extent, plot_params)
+    
+    # plot land and coastline
+    ax.add_geometries(land, ccrs.PlateCarree(), facecolor=cfeature.COLORS["land"], edgecolor="none", zorder=0)
+    ax.add_geometries(coastline, ccrs.PlateCarree(), facecolor="none", edgecolor="black", zorder=1)
+    
+
 # ================================================================================================ #
 # PLOT COLONY
 # ================================================================================================ #  
@@ -497,6 +940,9 @@ def plot_map_wtrips(ax, df, params, plot_params, color_palette, n_trips, nest_lo
 
     .. note::
         The required fields in the parameters dictionary are ``colony``.
+        
+    Points within trips are drawn in a single scatter with one color by point and the legend is built from the trip lengths and durations, 
+    so that the rendering cost does not depend on the number of trips.
     """
     
     # get parameters
@@ -506,13 +952,14 @@ def plot_map_wtrips(ax, df, params, plot_params, color_palette, n_trips, nest_lo
     n_cols = len(color_palette)
     plt.scatter(df["longitude"], df["latitude"], s=plot_params["pnt_size"], marker=plot_params["pnt_type"], color="black")
     if n_trips >= 1:
-        for i in range(n_trips):
-            trip_id = i+1
-            if((trip_length is not None) and (trip_duration is not None)):
-                trip_lgd_lab = "%.1fkm - %.1fh " % (trip_length[i], trip_duration[i])
-                plt.scatter(df.loc[df["trip"] == trip_id, "longitude"], df.loc[df["trip"] == trip_id, "latitude"], s=plot_params["pnt_size"], color=color_palette[i % n_cols], label=trip_lgd_lab)   
-            else:
-                plt.scatter(df.loc[df["trip"] == trip_id, "longitude"], df.loc[df["trip"] == trip_id, "latitude"], s=plot_params["pnt_size"], color=color_palette[i % n_cols])   
+        is_trip, trip_colors = get_trip_colors(df["trip"], n_trips, color_palette)
+        plt.scatter(df.loc[is_trip, "longitude"], df.loc[is_trip, "latitude"], s=plot_params["pnt_size"], color=trip_colors)
+    
+    # legend handles of trips from trip statistics
+    trip_handles = []
+    if((trip_length is not None) and (trip_duration is not None)):
+        trip_handles = [Line2D([], [], linestyle="", marker="o", markersize=np.sqrt(plot_params["pnt_size"]), color=color_palette[i % n_cols], 
+                               label="%.1fkm - %.1fh " % (trip_length[i], trip_duration[i])) for i in range(n_trips)]
     plot_colony(ax, params)
     plt.title(title, fontsize=plot_params["main_fs"])
     ax.set_xlabel("Longitude [°]", fontsize=plot_params["labs_fs"])
@@ -520,8 +967,7 @@ def plot_map_wtrips(ax, df, params, plot_params, color_palette, n_trips, nest_lo
     ax.gridlines(linestyle=plot_params["grid_lty"], linewidth=plot_params["grid_lwd"], color=plot_params["grid_col"],
                  draw_labels=["bottom", "left"], xformatter=plot_params["lon_fmt"], yformatter=plot_params["lat_fmt"], 
                  xlabel_style={"size": plot_params["labs_fs"]}, ylabel_style={"size": plot_params["labs_fs"]})
-    ax.add_feature(cfeature.LAND.with_scale("10m"), zorder=0)
-    ax.add_feature(cfeature.COASTLINE.with_scale("10m"), zorder=1)
+    plot_land(ax, df, params, plot_params, zoom)
     if zoom>0:
         plt.scatter(nest_lon, nest_lat, marker="*", s=10*plot_params["mrk_size"], color="yellow", edgecolor="black")
         colony_clon = (colony["box_longitude"][0]+colony["box_longitude"][1])/2
@@ -532,7 +978,7 @@ def plot_map_wtrips(ax, df, params, plot_params, color_palette, n_trips, nest_lo
         plt.ylim([colony_clat - zoom*colony_dlat, colony_clat + zoom*colony_dlat])
     else:
         if(((trip_length is not None) and (trip_duration is not None)) and (n_trips>=1)):
-            plt.legend(loc="best", fontsize=plot_params["text_fs"], markerscale=5)
+            plt.legend(handles=trip_handles, loc="best", fontsize=plot_params["text_fs"], markerscale=5)
         plt.axis("equal")
 
 
@@ -581,8 +1027,7 @@ def plot_map_weph(ax, df, params, plot_params, nest_lon, nest_lat, title, zoom,
     ax.gridlines(linestyle=plot_params["grid_lty"], linewidth=plot_params["grid_lwd"], color=plot_params["grid_col"],
                  draw_labels=["bottom", "left"], xformatter=plot_params["lon_fmt"], yformatter=plot_params["lat_fmt"], 
                  xlabel_style={"size": plot_params["labs_fs"]}, ylabel_style={"size": plot_params["labs_fs"]})
-    ax.add_feature(cfeature.LAND.with_scale("10m"), zorder=0)
-    ax.add_feature(cfeature.COASTLINE.with_scale("10m"), zorder=1)
+    plot_land(ax, df, params, plot_params, zoom)
     if zoom>0:
         plt.scatter(nest_lon, nest_lat, marker="*", s=10*plot_params["mrk_size"], color="yellow", edgecolor="black")
         colony_clon = (colony["box_longitude"][0]+colony["box_longitude"][1])/2
@@ -635,8 +1080,8 @@ def plot_map_colorgrad(ax, df, params, plot_params, var, color_palette, nest_lon
     
     # global trajectory with a color gradient
     n_cols = len(color_palette)
-    df[var] = df[var].fillna(0)
-    t = (df[var]-df[var].min())/(df[var].max()-df[var].min())
+    values = df[var].fillna(0)
+    t = (values-values.min())/(values.max()-values.min())
     t[t > t.quantile(q_th)] = 1
     sbplt = plt.scatter(df["longitude"], df["latitude"], color=color_palette[np.round((n_cols-1)*t).values.round().astype(int)], s=plot_params["pnt_size"])
     plot_colony(ax, params)
@@ -646,10 +1091,9 @@ def plot_map_colorgrad(ax, df, params, plot_params, var, color_palette, nest_lon
     ax.gridlines(linestyle=plot_params["grid_lty"], linewidth=plot_params["grid_lwd"], color=plot_params["grid_col"],
                  draw_labels=["bottom", "left"], xformatter=plot_params["lon_fmt"], yformatter=plot_params["lat_fmt"], 
                  xlabel_style={"size": plot_params["labs_fs"]}, ylabel_style={"size": plot_params["labs_fs"]})
-    ax.add_feature(cfeature.LAND.with_scale("10m"), zorder=0)
-    ax.add_feature(cfeature.COASTLINE.with_scale("10m"), zorder=1)
+    plot_land(ax, df, params, plot_params, zoom)
     cb = plt.colorbar(sbplt, ax=ax, orientation="vertical", shrink=plot_params["cb_shrink"], pad=plot_params["cb_pad"], aspect=plot_params["cb_aspect"])
-    sbplt.set_clim(df[var].min(), df[var].max())
+    sbplt.set_clim(values.min(), values.max())
     cb.ax.yaxis.get_offset_text().set(size=plot_params["axis_fs"]/2)
     cb.ax.tick_params(labelsize=plot_params["axis_fs"])
     cb.set_label(title, size=plot_params["labs_fs"])  
@@ -712,6 +1156,60 @@ def plot_folium_traj(df, params, traj_id, nest_position):
     return(fmap)
 
 
+# ================================================================================================ #
+# PLOT MAP FOLIUM GEOJSON POINTS
+# ================================================================================================ # 
+def plot_folium_geojson_points(fg, df, bins, colors, labels):
+    
+    """    
+    Add to the feature group the points of the dataframe as a single GeoJSON layer with one MultiPoint feature by color bin. 
+    
+    :param fg: the folium feature group.
+    :type fg: folium.FeatureGroup
+    :param df: dataframe with ``longitude``, ``latitude``. 
+    :type df: pandas.DataFrame
+    :param bins: color bin of every point, negative values being ignored.
+    :type bins: numpy.ndarray
+    :param colors: hexadecimal color of every bin.
+    :type colors: list[str]
+    :param labels: popup label of every bin.
+    :type labels: list[str]
+    :return: the folium feature group.
+    :rtype: folium.FeatureGroup
+    
+    Points are grouped by color bin in NumPy and serialised as a compact GeoJSON FeatureCollection with coordinates rounded to 1e-5 degree, 
+    so that the html size and the building time grow linearly with the number of points with a small constant, while being drawn on the 
+    client side as circle markers.
+    """
+    
+    # keep valid points
+    bins = np.asarray(bins, dtype=int)
+    positions = np.round(df[["longitude", "latitude"]].to_numpy(dtype=float, na_value=np.nan), 5)
+    is_valid = (bins >= 0) & np.isfinite(positions).all(axis=1)
+    
+    # sort points by color bin
+    order = np.argsort(bins[is_valid], kind="stable")
+    bins = bins[is_valid][order]
+    positions = positions[is_valid][order]
+    bin_vals, bin_starts = np.unique(bins, return_index=True)
+    bin_ends = np.append(bin_starts[1:], len(bins))
+    
+    # build one multipoint feature by color bin
+    features = []
+    for bin_val, bin_start, bin_end in zip(bin_vals, bin_starts, bin_ends):
+        features.append({"type":"Feature", "id":str(bin_val), "properties":{"label":labels[bin_val], "color":colors[bin_val]},
+                         "geometry":{"type":"MultiPoint", "coordinates":positions[bin_start:bin_end].tolist()}})
+    
+    # add geojson layer drawn with circle markers
+    if len(features) > 0:
+        folium.GeoJson({"type":"FeatureCollection", "features":features}, 
+                       marker=folium.CircleMarker(radius=1, fill=True, fill_opacity=0.7),
+                       style_function=lambda feature: {"color":feature["properties"]["color"], "fillColor":feature["properties"]["color"]},
+                       popup=folium.GeoJsonPopup(fields=["label"], labels=False)).add_to(fg)
+    
+    return(fg)
+
+
 # ================================================================================================ #
 # PLOT MAP FOLIUM DISCRETE COLORGRAD 
 # ================================================================================================ # 
@@ -750,8 +1248,7 @@ def plot_folium_traj_disc_colorgrad(fmap, df, color_palettes):
         n_cols = len(color_palette)
         
         # determine discrete values (without zeros)
-        df_var_isna = df[var].isna()
-        var_vals = df[var].unique()
+        var_vals = df[var].dropna().unique()
         var_vals = var_vals[var_vals>0]
         n_var_vals = len(var_vals)
         
@@ -760,15 +1257,10 @@ def plot_folium_traj_disc_colorgrad(fmap, df, color_palettes):
 
         # add points with discrete color gradient
         if n_var_vals >= 1:
-            for i in range(n_var_vals):
-                var_val = var_vals[i]
-                df_var_val = df.loc[df[var] == var_val].reset_index(drop=True)
-                n_df_var = len(df_var_val)
-                for k in range(n_df_var):
-                    if not df_var_isna[k]:
-                        fg.add_child(folium.CircleMarker(location=(df_var_val.loc[k,"latitude"], df_var_val.loc[k,"longitude"]), 
-                                                        fill=True, fill_opacity=0.7, popup="%s=%s" % (var, var_val), radius=1,
-                                                        color=misc.rgb_to_hex(color_palette[i % n_cols])))
+            bins = pd.Index(var_vals).get_indexer(df[var])
+            colors = [misc.rgb_to_hex(color_palette[i % n_cols]) for i in range(n_var_vals)]
+            labels = ["%s=%s" % (var, var_val) for var_val in var_vals]
+            fg = plot_folium_geojson_points(fg, df, bins, colors, labels)
         fmap.add_child(fg) 
         fmap.add_child(cb)
 
@@ -793,6 +1285,9 @@ def plot_folium_traj_cont_colorgrad(fmap, df, color_palettes, q_th):
     :type q_th: float
     :return: the folium map and the feature groups.
     :rtype: (folium.Map, list[folium.FeatureGroupe])
+    
+    Every point is colored by the closest color of the palette, so that points sharing a color are grouped in the same GeoJSON feature 
+    whose popup gives the range of values.
     """
     
     # initialize groups with an empty layer
@@ -808,12 +1303,11 @@ def plot_folium_traj_cont_colorgrad(fmap, df, color_palettes, q_th):
         fg = folium.FeatureGroup(name=var, overlay=True, control=True, show=False)
         fgs.append(fg)
         
-        # get size of color palette and dataframe
-        n_df = len(df)
+        # get size of color palette
         n_cols = len(color_palette)
 
         # compute normalized values of var
-        df_var_isna = df[var].isna()
+        var_values = df[var].to_numpy(dtype=float, na_value=np.nan)
         t = (df[var]-df[var].min())/(df[var].max()-df[var].min())
         t[t > t.quantile(q_th)] = 1
         
@@ -821,17 +1315,95 @@ def plot_folium_traj_cont_colorgrad(fmap, df, color_palettes, q_th):
         cb = cm.LinearColormap([misc.rgb_to_hex(rgb_col) for rgb_col in color_palette], vmin=df[var].min(), vmax=df[var].max(), caption=var)
         
         # add points with continuous color gradient
-        for k in range(n_df):
-            if not df_var_isna[k]:
-                fg.add_child(folium.CircleMarker(location=(df.loc[k,"latitude"], df.loc[k,"longitude"]), 
-                                                fill=True, fill_opacity=0.7, popup="%s=%.1f" % (var, df.loc[k,var]),radius=1, 
-                                                color=misc.rgb_to_hex(color_palette[np.round((n_cols-1)*t[k]).round().astype(int)])))
+        t = t.to_numpy(dtype=float, na_value=np.nan)
+        bins = np.where(np.isnan(t), -1, np.round((n_cols-1)*np.nan_to_num(t))).astype(int)
+        colors = [misc.rgb_to_hex(rgb_col) for rgb_col in color_palette]
+        labels = ["%s=%.1f-%.1f" % (var, np.min(var_values[bins == i]), np.max(var_values[bins == i])) if np.any(bins == i) else "" for i in range(n_cols)]
+        fg = plot_folium_geojson_points(fg, df, bins, colors, labels)
         fmap.add_child(fg)
         fmap.add_child(cb)
         
     return(fmap, fgs)
 
     
+# ================================================================================================ #
+# PLOT MAP FOLIUM DENSITY
+# ================================================================================================ # 
+def plot_folium_density(fmap, pyramid, color_palette, var_lab):
+    
+    """    
+    Add to the folium map a density layer by level of a grid pyramid. 
+    
+    :param fmap: the folium map.
+    :type fmap: folium.Map
+    :param pyramid: list of levels produced by ``indexing.build_density_pyramid``.
+    :type pyramid: list[dict]
+    :param color_palette: continuous color palette.
+    :type color_palette: list[list[float]]
+    :param var_lab: label of the aggregated value.
+    :type var_lab: str
+    :return: the folium map and the feature groups.
+    :rtype: (folium.Map, list[folium.FeatureGroupe])
+    
+    Cells are colored according to the logarithm of their value normalized by level and are grouped by color in one GeoJSON MultiPolygon 
+    feature, so that only the aggregated cells are embedded in the html. Only the finest level is shown by default, coarser levels 
+    being better suited to zoomed out views.
+    """
+    
+    # get size of color palette
+    n_cols = len(color_palette)
+    colors = [misc.rgb_to_hex(rgb_col) for rgb_col in color_palette]
+    
+    # loop over levels
+    fgs = []
+    for level in pyramid:
+        
+        # define feature group
+        cell_size = level["cell_size"]
+        fg = folium.FeatureGroup(name="density %.3f°" % (cell_size), overlay=True, control=True, show=(len(fgs) == 0))
+        fgs.append(fg)
+        
+        # compute color bins from log values
+        log_values = np.log10(np.maximum(level["value"], 1e-12))
+        log_range = log_values.max()-log_values.min() if len(log_values) > 0 else 0
+        t = (log_values-log_values.min())/log_range if log_range > 0 else np.ones(len(log_values))
+        bins = np.round((n_cols-1)*t).astype(int)
+        
+        # build cells polygons sorted by color bin
+        order = np.argsort(bins, kind="stable")
+        lon_0 = np.round(level["longitude"][order], 5)
+        lat_0 = np.round(level["latitude"][order], 5)
+        lon_1 = np.round(lon_0+cell_size, 5)
+        lat_1 = np.round(lat_0+cell_size, 5)
+        polygons = np.stack((np.column_stack((lon_0, lat_0)), np.column_stack((lon_1, lat_0)), np.column_stack((lon_1, lat_1)), 
+                             np.column_stack((lon_0, lat_1)), np.column_stack((lon_0, lat_0))), axis=1)
+        bins = bins[order]
+        values = level["value"][order]
+        bin_vals, bin_starts = np.unique(bins, return_index=True)
+        bin_ends = np.append(bin_starts[1:], len(bins))
+        
+        # build one multipolygon feature by color bin
+        features = []
+        for bin_val, bin_start, bin_end in zip(bin_vals, bin_starts, bin_ends):
+            features.append({"type":"Feature", "id":str(bin_val), 
+                             "properties":{"label":"%s=%.3g-%.3g" % (var_lab, values[bin_start:bin_end].min(), values[bin_start:bin_end].max()), "color":colors[bin_val]},
+                             "geometry":{"type":"MultiPolygon", "coordinates":polygons[bin_start:bin_end, np.newaxis].tolist()}})
+        
+        # add geojson layer
+        if len(features) > 0:
+            folium.GeoJson({"type":"FeatureCollection", "features":features}, 
+                           style_function=lambda feature: {"color":feature["properties"]["color"], "fillColor":feature["properties"]["color"], 
+                                                           "weight":0, "fillOpacity":0.6},
+                           popup=folium.GeoJsonPopup(fields=["label"], labels=False)).add_to(fg)
+        fmap.add_child(fg)
+        
+    # set colorbar
+    cb = cm.LinearColormap(colors, vmin=0, vmax=1, caption="%s (log scale normalized by level)" % (var_lab))
+    fmap.add_child(cb)
+        
+    return(fmap, fgs)
+
+
 # ================================================================================================ #
 # PLOT MAP MULTIPLE COLORGRAD FOLIUM
 # ================================================================================================ # 
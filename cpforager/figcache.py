@@ -0,0 +1,240 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+# ================================================================================================ #
+# HASH INPUTS
+# ================================================================================================ #
+def update_hash(h, obj):
+
+    """
+    Update a hash with the content of an object.
+
+    :param h: the hash object.
+    :type h: hashlib._Hash
+    :param obj: the object to hash, *e.g.* dataframe, series, array, dictionary, list or scalar.
+    :type obj: any
+
+    Dataframes and series are hashed row by row with ``pandas.util.hash_pandas_object`` together with their column names and dtypes.
+    Dictionaries are hashed in the order of their sorted keys so that the hash does not depend on insertion order. Objects without a proper
+    representation (*e.g.* tick formatters) are hashed by their type only, since their default representation holds a memory address.
+    """
+
+    # hash object depending on its type
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"dataframe")
+        h.update(repr(list(zip(obj.columns, obj.dtypes.astype(str)))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(b"series")
+        h.update(repr((obj.name, str(obj.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(b"array")
+        h.update(repr((obj.shape, str(obj.dtype))).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for key in sorted(obj.keys(), key=str):
+            h.update(repr(key).encode())
+            update_hash(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"list")
+        for item in obj:
+            update_hash(h, item)
+    elif type(obj).__repr__ is object.__repr__:
+        h.update(("%s.%s" % (type(obj).__module__, type(obj).__qualname__)).encode())
+    else:
+        h.update(repr(obj).encode())
+
+
+def get_figure_key(kind, inputs, plot_params):
+
+    """
+    Compute the content hash of the inputs of a diagnostic figure.
+
+    :param kind: name of the diagnostic, *e.g.* ``full_diag``.
+    :type kind: str
+    :param inputs: list of the data and parameters used by the diagnostic.
+    :type inputs: list
+    :param plot_params: plot parameters dictionary.
+    :type plot_params: dict
+    :return: the hexadecimal SHA-256 digest of the inputs, None if the cache is disabled.
+    :rtype: str
+
+    Inputs are only hashed if the ``fig_cache`` plot parameter is True. This parameter is not hashed itself, so that switching the cache
+    on does not invalidate previously recorded figures.
+    """
+
+    # check cache is enabled
+    if not plot_params.get("fig_cache"):
+        return(None)
+
+    # hash kind, inputs and plot parameters
+    h = hashlib.sha256()
+    update_hash(h, kind)
+    update_hash(h, inputs)
+    update_hash(h, {key:value for (key, value) in plot_params.items() if key != "fig_cache"})
+    fig_key = h.hexdigest()
+
+    return(fig_key)
+
+
+# ================================================================================================ #
+# CACHE ENTRIES
+# ================================================================================================ #
+def get_entry_path(fig_dir, file_id):
+
+    """
+    Get the path of the cache entry of a figure.
+
+    :param fig_dir: figure saving directory.
+    :type fig_dir: str
+    :param file_id: name of the saved figure.
+    :type file_id: str
+    :return: the path of the json cache entry.
+    :rtype: str
+
+    Every figure has its own entry in the ``.figcache`` subdirectory of ``fig_dir``, so that figures rendered concurrently by several processes do not
+    write the same file.
+    """
+
+    # build entry path
+    entry_path = os.path.join(fig_dir, ".figcache", "%s.json" % file_id)
+
+    return(entry_path)
+
+
+def write_entry(fig_dir, file_id, kind, fig_key, file_name, status):
+
+    """
+    Write the cache entry of a figure.
+
+    :param fig_dir: figure saving directory.
+    :type fig_dir: str
+    :param file_id: name of the saved figure.
+    :type file_id: str
+    :param kind: name of the diagnostic.
+    :type kind: str
+    :param fig_key: content hash of the diagnostic inputs.
+    :type fig_key: str
+    :param file_name: name of the figure file in ``fig_dir``.
+    :type file_name: str
+    :param status: ``rendered`` or ``cached``.
+    :type status: str
+    """
+
+    # build entry
+    entry = {"file_id":file_id, "kind":kind, "key":fig_key, "file":file_name, "status":status, "updated":pd.Timestamp.now().isoformat()}
+
+    # write entry
+    entry_path = get_entry_path(fig_dir, file_id)
+    os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+    with open(entry_path, "w") as f:
+        json.dump(entry, f)
+
+
+def is_figure_cached(fig_dir, file_id, kind, fig_key, plot_params, file_ext="png"):
+
+    """
+    Check if an up-to-date figure exists in the figure saving directory.
+
+    :param fig_dir: figure saving directory.
+    :type fig_dir: str
+    :param file_id: name of the saved figure.
+    :type file_id: str
+    :param kind: name of the diagnostic.
+    :type kind: str
+    :param fig_key: content hash of the diagnostic inputs.
+    :type fig_key: str
+    :param plot_params: plot parameters dictionary.
+    :type plot_params: dict
+    :param file_ext: extension of the figure file.
+    :type file_ext: str
+    :return: True if the cache is enabled and the figure was rendered from the same inputs.
+    :rtype: bool
+
+    The cache entry status is set to ``cached`` if the figure is up-to-date.
+    """
+
+    # check cache is enabled
+    if not plot_params.get("fig_cache"):
+        return(False)
+
+    # read cache entry
+    file_name = "%s.%s" % (file_id, file_ext)
+    entry_path = get_entry_path(fig_dir, file_id)
+    if not os.path.isfile(entry_path):
+        return(False)
+    with open(entry_path, "r") as f:
+        entry = json.load(f)
+
+    # compare keys and check figure exists
+    is_cached = (entry.get("key") == fig_key) and (entry.get("file") == file_name) and os.path.isfile(os.path.join(fig_dir, file_name))
+    if is_cached:
+        write_entry(fig_dir, file_id, kind, fig_key, file_name, "cached")
+
+    return(is_cached)
+
+
+def record_figure(fig_dir, file_id, kind, fig_key, plot_params, file_ext="png"):
+
+    """
+    Record a rendered figure in the cache.
+
+    :param fig_dir: figure saving directory.
+    :type fig_dir: str
+    :param file_id: name of the saved figure.
+    :type file_id: str
+    :param kind: name of the diagnostic.
+    :type kind: str
+    :param fig_key: content hash of the diagnostic inputs.
+    :type fig_key: str
+    :param plot_params: plot parameters dictionary.
+    :type plot_params: dict
+    :param file_ext: extension of the figure file.
+    :type file_ext: str
+    """
+
+    # write cache entry if cache is enabled
+    if plot_params.get("fig_cache"):
+        write_entry(fig_dir, file_id, kind, fig_key, "%s.%s" % (file_id, file_ext), "rendered")
+
+
+# ================================================================================================ #
+# CACHE REPORT
+# ================================================================================================ #
+def get_cache_report(fig_dir):
+
+    """
+    Produce the report of the cached figures of a figure saving directory.
+
+    :param fig_dir: figure saving directory.
+    :type fig_dir: str
+    :return: the dataframe with ``file_id``, ``kind``, ``status`` and ``updated`` columns where each row corresponds to one figure, sorted by ``updated``.
+    :rtype: pandas.DataFrame
+
+    The ``status`` column tells whether the figure was ``rendered`` or found ``cached`` at the last call of its diagnostic.
+    """
+
+    # read cache entries
+    cache_dir = os.path.join(fig_dir, ".figcache")
+    entries = []
+    if os.path.isdir(cache_dir):
+        for file_name in sorted(os.listdir(cache_dir)):
+            if file_name.endswith(".json"):
+                with open(os.path.join(cache_dir, file_name), "r") as f:
+                    entries.append(json.load(f))
+
+    # build report dataframe
+    df_report = pd.DataFrame(entries, columns=["file_id", "kind", "status", "updated"])
+    df_report["updated"] = pd.to_datetime(df_report["updated"])
+    df_report = df_report.sort_values("updated").reset_index(drop=True)
+
+    return(df_report)
@@ -0,0 +1,267 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import os
+import json
+import numpy as np
+import pandas as pd
+import shapely
+from cpforager import simplification
+
+
+# ================================================================================================ #
+# TRIP RUNS
+# ================================================================================================ #
+def get_trip_runs(trips, offsets):
+
+    """
+    Find the contiguous runs of rows of every trip.
+
+    :param trips: the trip numbers of the rows, 0 outside trips, concatenated over several GPS.
+    :type trips: numpy.ndarray
+    :param offsets: the positions of the first row of every GPS, plus the total number of rows.
+    :type offsets: numpy.ndarray
+    :return: the first row, the last row plus one, the GPS index and the trip number of every run.
+    :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+
+    A run starts wherever the trip number changes or a GPS starts, hence runs are found in a single pass over the rows.
+    """
+
+    # find run boundaries
+    trips = np.asarray(trips)
+    n_rows = len(trips)
+    is_start = np.zeros(n_rows, dtype=bool)
+    is_start[offsets[:-1][offsets[:-1] < n_rows]] = True
+    is_start[1:] |= (trips[1:] != trips[:-1])
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], n_rows)
+
+    # keep runs within trips
+    is_trip = trips[starts] > 0
+    starts = starts[is_trip]
+    ends = ends[is_trip]
+    gps_indices = np.searchsorted(offsets, starts, side="right")-1
+    trip_numbers = trips[starts]
+
+    return(starts, ends, gps_indices, trip_numbers)
+
+
+# ================================================================================================ #
+# BUILD TRIP LINES
+# ================================================================================================ #
+def build_trip_lines(gps_list, longitudes, latitudes, trips, datetimes, offsets, mask=None):
+
+    """
+    Build the LineString of every trip with its attributes.
+
+    :param gps_list: the list of GPS whose rows are concatenated.
+    :type gps_list: list[cpforager.GPS]
+    :param longitudes: the longitudes of the rows.
+    :type longitudes: numpy.ndarray
+    :param latitudes: the latitudes of the rows.
+    :type latitudes: numpy.ndarray
+    :param trips: the trip numbers of the rows, 0 outside trips.
+    :type trips: numpy.ndarray
+    :param datetimes: the datetimes of the rows.
+    :type datetimes: numpy.ndarray(datetime64[ns])
+    :param offsets: the positions of the first row of every GPS, plus the total number of rows.
+    :type offsets: numpy.ndarray
+    :param mask: the mask of the rows kept in the lines, *e.g.* computed by ``simplification.get_simplified_mask``, every row is kept if None.
+    :type mask: numpy.ndarray(bool)
+    :return: the dataframe of trip attributes and the array of LineStrings, one per trip.
+    :rtype: (pandas.DataFrame, numpy.ndarray)
+
+    Every LineString is built at once from the positions of the contiguous trip runs by ``shapely.linestrings``. Attributes are the
+    ``trip_statistics`` of every GPS, together with ``group``, ``id``, ``trip``, ``trip_id`` and the ``start_datetime`` and ``end_datetime`` of the trip.
+    Trips with less than two valid positions are ignored.
+    """
+
+    # find trip runs
+    starts, ends, gps_indices, trip_numbers = get_trip_runs(trips, offsets)
+
+    # label every row of a trip with its run and keep valid positions
+    rows = np.arange(len(trips))
+    run_indices = np.searchsorted(starts, rows, side="right")-1
+    is_valid = (run_indices >= 0) & (rows < ends[np.maximum(run_indices, 0)]) & np.isfinite(longitudes) & np.isfinite(latitudes)
+    if mask is not None:
+        is_valid &= mask
+    n_valid = np.bincount(run_indices[is_valid], minlength=len(starts))
+    is_line = n_valid >= 2
+    if (~is_line).any():
+        print("WARNING : %d trips with less than two valid positions are ignored" % (~is_line).sum())
+    is_valid &= is_line[np.maximum(run_indices, 0)]
+
+    # build every line at once
+    line_indices = np.cumsum(is_line)-1
+    coordinates = np.column_stack([longitudes[is_valid], latitudes[is_valid]])
+    lines = shapely.linestrings(coordinates, indices=line_indices[run_indices[is_valid]])
+
+    # build trip attributes from runs and trip statistics
+    df_attributes = pd.DataFrame({"gps_index":gps_indices, "group":np.array([gps.group for gps in gps_list], dtype=object)[gps_indices],
+                                  "id":np.array([gps.id for gps in gps_list], dtype=object)[gps_indices], "trip":trip_numbers.astype(np.int64),
+                                  "start_datetime":datetimes[starts], "end_datetime":datetimes[ends-1]})[is_line]
+    df_attributes["trip_id"] = ["%s_%s_T%04d" % (group, id, trip) for (group, id, trip) in zip(df_attributes["group"], df_attributes["id"], df_attributes["trip"])]
+    trip_statistics = [gps.trip_statistics.rename(columns={"id":"trip"}).assign(gps_index=k) for (k, gps) in enumerate(gps_list)]
+    statistics_columns = ["length", "duration", "max_hole", "dmax", "n_step"]
+    trip_statistics = pd.concat(trip_statistics, ignore_index=True).reindex(columns=["gps_index", "trip"]+statistics_columns)
+    trip_statistics = trip_statistics.astype({"gps_index":np.int64, "trip":np.int64, "n_step":"Int64"} | {column:float for column in statistics_columns[:-1]})
+    df_attributes = df_attributes.merge(trip_statistics, on=["gps_index", "trip"], how="left")
+    df_attributes = df_attributes[["group", "id", "trip", "trip_id"]+statistics_columns+["start_datetime", "end_datetime"]]
+
+    return(df_attributes, lines)
+
+
+# ================================================================================================ #
+# WRITE TRIP LINES
+# ================================================================================================ #
+def write_geojson(df_attributes, lines, file_path):
+
+    """
+    Write the trip lines and their attributes as a GeoJSON feature collection.
+
+    :param df_attributes: the dataframe of trip attributes.
+    :type df_attributes: pandas.DataFrame
+    :param lines: the array of LineStrings.
+    :type lines: numpy.ndarray
+    :param file_path: path of the GeoJSON file.
+    :type file_path: str
+
+    Geometries and properties are serialized at once by ``shapely.to_geojson`` and ``pandas.DataFrame.to_json``, with datetimes as ISO strings.
+    """
+
+    # serialize geometries and properties
+    geometries = shapely.to_geojson(lines)
+    properties = df_attributes.to_json(orient="records", lines=True, date_format="iso").splitlines() if len(df_attributes) > 0 else []
+
+    # write feature collection
+    with open(file_path, "w") as f:
+        f.write('{"type":"FeatureCollection","features":[')
+        f.write(",".join(['{"type":"Feature","properties":%s,"geometry":%s}' % (p, g) for (p, g) in zip(properties, geometries)]))
+        f.write("]}")
+
+
+def write_geoparquet(df_attributes, lines, file_path):
+
+    """
+    Write the trip lines and their attributes as a GeoParquet file.
+
+    :param df_attributes: the dataframe of trip attributes.
+    :type df_attributes: pandas.DataFrame
+    :param lines: the array of LineStrings.
+    :type lines: numpy.ndarray
+    :param file_path: path of the GeoParquet file.
+    :type file_path: str
+
+    Geometries are encoded at once as WKB in the ``geometry`` column, described by the GeoParquet 1.0.0 metadata in WGS84 longitude/latitude.
+
+    .. note::
+        The optional ``pyarrow`` package is required, *e.g.* installed with ``pip install cpforager[geoparquet]``.
+    """
+
+    # import optional dependency
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # build table with wkb geometries
+    table = pa.Table.from_pandas(df_attributes, preserve_index=False)
+    table = table.append_column("geometry", pa.array(shapely.to_wkb(lines), type=pa.binary()))
+
+    # add geoparquet metadata
+    bbox = shapely.total_bounds(lines).tolist() if len(lines) > 0 else []
+    geo = {"version":"1.0.0", "primary_column":"geometry",
+           "columns":{"geometry":{"encoding":"WKB", "geometry_types":["LineString"], "bbox":bbox}}}
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"geo":json.dumps(geo).encode()})
+
+    # write table
+    pq.write_table(table, file_path)
+
+
+def write_trip_lines(df_attributes, lines, file_path):
+
+    """
+    Write the trip lines and their attributes in the format given by the file extension.
+
+    :param df_attributes: the dataframe of trip attributes.
+    :type df_attributes: pandas.DataFrame
+    :param lines: the array of LineStrings.
+    :type lines: numpy.ndarray
+    :param file_path: path of the ``.geojson``, ``.json`` or ``.parquet`` file.
+    :type file_path: str
+    """
+
+    # write depending on extension
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in [".geojson", ".json"]:
+        write_geojson(df_attributes, lines, file_path)
+    elif extension in [".parquet", ".geoparquet"]:
+        write_geoparquet(df_attributes, lines, file_path)
+    else:
+        raise ValueError("Extension %s is not among .geojson, .json, .parquet and .geoparquet." % (extension))
+
+
+# ================================================================================================ #
+# EXPORT GPS TRIPS
+# ================================================================================================ #
+def export_gps_trips(gps, file_path, tolerance=None):
+
+    """
+    Export the trips as LineStrings carrying the trip statistics to a GeoJSON or GeoParquet file.
+
+    :param gps: a GPS object.
+    :type gps: cpforager.GPS
+    :param file_path: path of the ``.geojson``, ``.json`` or ``.parquet`` file.
+    :type file_path: str
+    :param tolerance: tolerance in metres of the Douglas-Peucker simplification of the lines (see ``simplification.get_gps_simplified_mask``), lines are not simplified if None.
+    :type tolerance: float
+    :return: the dataframe of trip attributes, one row per exported trip.
+    :rtype: pandas.DataFrame
+
+    The format is given by the file extension, see ``build_trip_lines`` for the exported attributes.
+    """
+
+    # get gps data
+    df = gps.df
+
+    # simplify lines
+    mask = simplification.get_gps_simplified_mask(gps, tolerance) if tolerance is not None else None
+
+    # build and write trip lines
+    df_attributes, lines = build_trip_lines([gps], df["longitude"].to_numpy(dtype=float, na_value=np.nan), df["latitude"].to_numpy(dtype=float, na_value=np.nan),
+                                            df["trip"].to_numpy(), df["datetime"].to_numpy(), np.array([0, len(df)]), mask)
+    write_trip_lines(df_attributes, lines, file_path)
+
+    return(df_attributes)
+
+
+# ================================================================================================ #
+# EXPORT GPS COLLECTION TRIPS
+# ================================================================================================ #
+def export_gps_collection_trips(gps_collection, file_path, tolerance=None):
+
+    """
+    Export the trips of a collection as LineStrings carrying the trip statistics to a GeoJSON or GeoParquet file.
+
+    :param gps_collection: a GPS_Collection object.
+    :type gps_collection: cpforager.GPS_Collection
+    :param file_path: path of the ``.geojson``, ``.json`` or ``.parquet`` file.
+    :type file_path: str
+    :param tolerance: tolerance in metres of the Douglas-Peucker simplification of the lines (see ``simplification.get_gps_collection_simplified_mask``), lines are not simplified if None.
+    :type tolerance: float
+    :return: the dataframe of trip attributes, one row per exported trip.
+    :rtype: pandas.DataFrame
+
+    Lines are built in a single pass over the columnar store of the GPS collection, see ``build_trip_lines`` for the exported attributes.
+    """
+
+    # get columnar store
+    store = gps_collection.store
+
+    # simplify lines
+    mask = simplification.get_gps_collection_simplified_mask(gps_collection, tolerance) if tolerance is not None else None
+
+    # build and write trip lines
+    df_attributes, lines = build_trip_lines(gps_collection.gps_collection, store["longitude"].astype(float), store["latitude"].astype(float),
+                                            store["trip"], store["datetime"], gps_collection.offsets, mask)
+    write_trip_lines(df_attributes, lines, file_path)
+
+    return(df_attributes)
@@ -2,7 +2,7 @@
 # LIBRARIES
 # ======================================================= #
 import os
-from cpforager import diagnostic
+from cpforager import diagnostic, figcache
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
 
@@ -23,7 +23,7 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     :type file_id: str
     :param plot_params: plot parameters dictionary. 
     :type plot_params: dict
-    :return: the full diagnostic figure.
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     
     The figure is save at the png format.
@@ -52,6 +52,10 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     trip_duration = trip_statistics["duration"]
     trip_length = trip_statistics["length"]
 
+    # skip rendering if the figure is up-to-date
+    fig_key = figcache.get_figure_key("full_diag", [df, group, id, params], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "full_diag", fig_key, plot_params): return(None)
+
     # set infos to print on diagnostic
     infos = []
     infos.append("Group = %s" % group)
@@ -89,9 +93,8 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     
     # global trajectory with a time color gradient
     ax = fig.add_subplot(gs[0,3], projection=ccrs.PlateCarree())
-    df["duration"] = (df["datetime"]-df["datetime"].min()).dt.total_seconds()/3600
-    diagnostic.plot_map_colorgrad(ax, df, params, plot_params, "duration", cols_3, nest_lon, nest_lat, "Trajectory [duration color gradient]", 1.0, 0)
-    del df["duration"]
+    df_duration = df.assign(duration=(df["datetime"]-df["datetime"].min()).dt.total_seconds()/3600)
+    diagnostic.plot_map_colorgrad(ax, df_duration, params, plot_params, "duration", cols_3, nest_lon, nest_lat, "Trajectory [duration color gradient]", 1.0, 0)
     
     # plot infos
     ax = fig.add_subplot(gs[0,4])
@@ -136,9 +139,8 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     # heading polar plot
     ax = fig.add_subplot(gs[2,4], projection="polar")
     if(n_trips>0):
-        df["step_heading_to_colony_trip"] = df.loc[df["trip"]>0, "step_heading_to_colony"]
-        diagnostic.plot_angle_polar(ax, df, plot_params, "step_heading_to_colony_trip", "Step heading to colony", "Angle [°]")
-        del df["step_heading_to_colony_trip"]
+        df_trip = df.assign(step_heading_to_colony_trip=df["step_heading_to_colony"].where(df["trip"]>0))
+        diagnostic.plot_angle_polar(ax, df_trip, plot_params, "step_heading_to_colony_trip", "Step heading to colony", "Angle [°]")
     else:
         diagnostic.plot_angle_polar(ax, df, plot_params, "step_heading_to_colony", "Step heading to colony", "Angle [°]")
     
@@ -148,7 +150,8 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "full_diag", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
@@ -171,7 +174,7 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params):
     :type file_id: str
     :param plot_params: plot parameters dictionary. 
     :type plot_params: dict
-    :return: the full diagnostic figure.
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     
     The figure is save at the png format.
@@ -186,6 +189,10 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params):
     df = self.df
     params = self.params
     
+    # skip rendering if the figure is up-to-date
+    fig_key = figcache.get_figure_key("maps_diag", [df, params], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "maps_diag", fig_key, plot_params): return(None)
+    
     # get infos
     n_trips = self.n_trips
     [nest_lon, nest_lat] = self.nest_position
@@ -213,13 +220,13 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params):
     
     # global trajectory with a time color gradient
     ax = fig.add_subplot(gs[1,1], projection=ccrs.PlateCarree())
-    df["duration"] = (df["datetime"]-df["datetime"].min()).dt.total_seconds()/3600
-    diagnostic.plot_map_colorgrad(ax, df, params, plot_params, "duration", cols_3, nest_lon, nest_lat, "Trajectory [duration color gradient]", 1.0, 0)
-    del df["duration"]
+    df_duration = df.assign(duration=(df["datetime"]-df["datetime"].min()).dt.total_seconds()/3600)
+    diagnostic.plot_map_colorgrad(ax, df_duration, params, plot_params, "duration", cols_3, nest_lon, nest_lat, "Trajectory [duration color gradient]", 1.0, 0)
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "maps_diag", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
@@ -245,10 +252,7 @@ def folium_map(self, fig_dir, file_id, plot_params):
     :return: the folium map.
     :rtype: folium.Map
     
-    The figure is saved at the html format.
-    
-    .. warning::
-        Producing the figure may take some time and the resulting html may be heavy.
+    The figure is saved at the html format. Colored points are rendered as one compact GeoJSON layer by variable.
     """
     
     # get attributes
@@ -260,15 +264,16 @@ def folium_map(self, fig_dir, file_id, plot_params):
     # get parameters
     cols_1 = plot_params.get("cols_1")
     cols_2 = plot_params.get("cols_2")
+    simplify_tol = plot_params.get("simplify_tol")
     
     # define color palettes
     discrete_color_palettes = {"trip":cols_1}
     continuous_color_palettes = {"step_speed":cols_2, "duration":cols_2}
 
     # produce beautiful map
-    df["duration"] = (df["datetime"]-df["datetime"].min()).dt.total_seconds()/3600
-    fmap = diagnostic.plot_folium_map_multiple_colorgrad(df, params, id, nest_position, discrete_color_palettes, continuous_color_palettes, 0.99)
-    del df["duration"]
+    df_map = df.assign(duration=(df["datetime"]-df["datetime"].min()).dt.total_seconds()/3600)
+    df_map = df_map.loc[self.simplify_mask(simplify_tol)] if simplify_tol is not None else df_map
+    fmap = diagnostic.plot_folium_map_multiple_colorgrad(df_map, params, id, nest_position, discrete_color_palettes, continuous_color_palettes, 0.99)
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.html" % file_id)
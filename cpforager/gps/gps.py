@@ -3,7 +3,7 @@
 # ======================================================= #
 import pandas as pd
 from cpforager import processing
-from cpforager.gps import diagnostic, display, interpolation
+from cpforager.gps import diagnostic, display, interpolation, slicing, timegrid, tracks
 
 
 # ======================================================= #
@@ -16,7 +16,7 @@ class GPS:
     """
 
     # [CONSTRUCTOR] GPS
-    def __init__(self, df, group, id, params):
+    def __init__(self, df, group, id, params, processed=False):
         
         """
         Constructor of a GPS object.
@@ -29,6 +29,8 @@ class GPS:
         :type id: str
         :param params: the parameters dictionary.
         :type params: dict
+        :param processed: skip the data processing if True, *i.e.* ``df`` has already been enhanced by ``processing.add_gps_data``, in which case ``df`` is kept as is without copy.
+        :type processed: bool
         
         :ivar df: the dataframe containing the raw and processed GPS data.
         :vartype df: pandas.DataFrame
@@ -61,7 +63,7 @@ class GPS:
         """
         
         # process data
-        df = processing.add_gps_data(df, params)
+        if not processed: df = processing.add_gps_data(df, params)
 
         # compute additional information
         basic_infos = processing.compute_basic_infos(df)
@@ -98,6 +100,19 @@ class GPS:
     # [METHODS] interpolate data
     interpolate_lat_lon = interpolation.interpolate_lat_lon
 
+    # [METHODS] extract time windows
+    window = slicing.window
+    windows = slicing.windows
+
+    # [METHODS] resample data on a regular time grid
+    resample = timegrid.resample
+
+    # [METHODS] simplify trajectories
+    simplify_mask = tracks.simplify_mask
+
+    # [METHODS] export trips as lines
+    export_trips = tracks.export_trips
+
     # [METHODS] display the summary of the data
     display_data_summary = display.display_data_summary
 
@@ -0,0 +1,61 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import utils
+
+
+# ======================================================= #
+# GPS SLICING [GPS METHOD]
+# ======================================================= #
+def window(self, t0, t1, columns=None):
+    
+    """
+    Extract the data recorded between two datetimes.
+        
+    :param self: a GPS object
+    :type self: cpforager.GPS
+    :param t0: start of the time window.
+    :type t0: datetime.datetime | pandas.Timestamp | str
+    :param t1: end of the time window.
+    :type t1: datetime.datetime | pandas.Timestamp | str
+    :param columns: list of columns to keep, every column is kept if None.
+    :type columns: list[str]
+    :return: the dataframe restricted to the time window [t0, t1].
+    :rtype: pandas.DataFrame
+    
+    The time window is found by binary search on the sorted ``datetime`` column and the dataframe is sliced by position without copy.
+    """
+    
+    # get attributes
+    df = self.df
+    
+    # extract time window
+    df_window = utils.get_time_window(df, t0, t1, columns)
+    
+    return(df_window)
+
+
+def windows(self, starts, ends, columns=None):
+    
+    """
+    Extract the data recorded between several pairs of datetimes.
+        
+    :param self: a GPS object
+    :type self: cpforager.GPS
+    :param starts: starts of the time windows.
+    :type starts: array-like of datetimes
+    :param ends: ends of the time windows.
+    :type ends: array-like of datetimes
+    :param columns: list of columns to keep, every column is kept if None.
+    :type columns: list[str]
+    :return: the list of dataframes restricted to each time window.
+    :rtype: list[pandas.DataFrame]
+    """
+    
+    # get attributes
+    df = self.df
+    
+    # extract time windows
+    df_windows = utils.get_time_windows(df, starts, ends, columns)
+    
+    return(df_windows)
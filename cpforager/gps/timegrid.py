@@ -0,0 +1,37 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import resampling
+
+
+# ======================================================= #
+# GPS RESAMPLING [GPS METHOD]
+# ======================================================= #
+def resample(self, period, columns_methods, chunk_size=1000000, max_gap=None):
+    
+    """
+    Resample the GPS data on a regular time grid.
+        
+    :param self: a GPS object
+    :type self: cpforager.GPS
+    :param period: period of the grid in seconds.
+    :type period: float
+    :param columns_methods: dictionary giving for each column to resample the method to apply, *e.g.* ``{"step_speed":"mean"}``.
+    :type columns_methods: dict
+    :param chunk_size: approximate number of rows processed at once, every row at once if None.
+    :type chunk_size: int
+    :param max_gap: maximum duration in seconds between the measures surrounding an interpolated datetime, no maximum if None.
+    :type max_gap: float
+    :return: the resampled dataframe with the ``datetime`` column of the grid and the resampled columns.
+    :rtype: pandas.DataFrame
+    
+    See ``resampling.resample_dataframe`` for the grid and the table of possible methods.
+    """
+    
+    # get attributes
+    df = self.df
+    
+    # resample dataframe
+    df_resampled = resampling.resample_dataframe(df, period, columns_methods, chunk_size, max_gap)
+    
+    return(df_resampled)
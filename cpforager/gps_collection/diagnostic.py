@@ -2,7 +2,8 @@
 # LIBRARIES
 # ======================================================= #
 import os
-from cpforager import diagnostic, misc, utils
+import numpy as np
+from cpforager import diagnostic, misc, utils, indexing, figcache, sketch
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
 import folium
@@ -11,7 +12,7 @@ import folium
 # ======================================================= #
 # STATS SUMMARY [GPS_COLLECTION METHOD]
 # ======================================================= #
-def plot_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.50, 0.75, 0.90]):
+def plot_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.50, 0.75, 0.90], from_sketches=False):
     
     """    
     Produce the trip statistics summary of every GPS data.
@@ -26,52 +27,63 @@ def plot_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.5
     :type plot_params: dict
     :param quantiles: quantiles to emphasize. 
     :type quantiles: list[float]
-    :return: the full diagnostic figure.
+    :param from_sketches: plot from the quantile sketches of every GPS merged over the collection if True. 
+    :type from_sketches: bool
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     
-    The figure is save at the png format. Plots are histogram, boxplot and cumulative distribution.
+    The figure is save at the png format. Plots are histogram, boxplot and cumulative distribution. With sketches, the memory and plotting time 
+    do not depend on the number of trips and quantiles are estimated within a 1% relative error (see ``sketch.build_sketch``).
     """
     
     # get parameters
     dpi = plot_params.get("fig_dpi")
     
     # get attributes
-    trip_statistics_all = self.trip_statistics_all
+    gps_collection = self.gps_collection
+
+    # skip rendering if the figure is up-to-date, sketches only depending on the statistics of every GPS
+    if from_sketches:
+        fig_key = figcache.get_figure_key("stats_summary", [[gps.trip_statistics for gps in gps_collection], quantiles, from_sketches], plot_params)
+    else:
+        trip_statistics_all = self.trip_statistics_all
+        fig_key = figcache.get_figure_key("stats_summary", [trip_statistics_all, quantiles, from_sketches], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "stats_summary", fig_key, plot_params): return(None)
 
     # produce diagnostic
     fig = plt.figure(figsize=(20, 10), dpi=dpi)
     fig.subplots_adjust(hspace=0.45, wspace=0.25, bottom=0.06, top=0.95, left=0.05, right=0.95)
     gs = fig.add_gridspec(3, 4)
     
+    # merge sketches of every trip statistics
+    variables = [("length", "Trip length", "Length [km]", "Distance [km]"),
+                 ("duration", "Trip duration", "Time [h]", "Time [h]"),
+                 ("n_step", "Trip number of step", "Steps", "Steps"),
+                 ("dmax", "Distance max to nest", "Distance [km]", "Distance [km]")]
+    if from_sketches:
+        sketches = sketch.build_merged_sketches([gps.trip_statistics for gps in gps_collection], [var for (var, _, _, _) in variables])
+    
     # add subplots
-    fig.add_subplot(gs[0,0])
-    diagnostic.plot_hist(trip_statistics_all, plot_params, "length", "Trip length", "Length [km]")
-    fig.add_subplot(gs[1,0])
-    diagnostic.plot_box(trip_statistics_all, plot_params, "length", "Trip length", "Length [km]")
-    fig.add_subplot(gs[2,0])
-    diagnostic.plot_cumulative_distribution(trip_statistics_all, plot_params, "length", "Trip length", "Distance [km]", quantiles)
-    fig.add_subplot(gs[0,1])
-    diagnostic.plot_hist(trip_statistics_all, plot_params, "duration", "Trip duration", "Time [h]")
-    fig.add_subplot(gs[1,1])
-    diagnostic.plot_box(trip_statistics_all, plot_params, "duration", "Trip duration", "Time [h]")
-    fig.add_subplot(gs[2,1])
-    diagnostic.plot_cumulative_distribution(trip_statistics_all, plot_params, "duration", "Trip duration", "Time [h]", quantiles)
-    fig.add_subplot(gs[0,2])
-    diagnostic.plot_hist(trip_statistics_all, plot_params, "n_step", "Trip number of step", "Steps")
-    fig.add_subplot(gs[1,2])
-    diagnostic.plot_box(trip_statistics_all, plot_params, "n_step", "Trip number of step", "Steps")
-    fig.add_subplot(gs[2,2])
-    diagnostic.plot_cumulative_distribution(trip_statistics_all, plot_params, "n_step", "Trip number of step", "Steps", quantiles)
-    fig.add_subplot(gs[0,3])
-    diagnostic.plot_hist(trip_statistics_all, plot_params, "dmax", "Distance max to nest", "Distance [km]")
-    fig.add_subplot(gs[1,3])
-    diagnostic.plot_box(trip_statistics_all, plot_params, "dmax", "Distance max to nest", "Distance [km]")
-    fig.add_subplot(gs[2,3])
-    diagnostic.plot_cumulative_distribution(trip_statistics_all, plot_params, "dmax", "Distance max to nest", "Distance [km]", quantiles)
+    for k, (var, title, var_lab, cumul_lab) in enumerate(variables):
+        if from_sketches:
+            fig.add_subplot(gs[0,k])
+            diagnostic.plot_hist_sketch(sketches[var], plot_params, title, var_lab)
+            fig.add_subplot(gs[1,k])
+            diagnostic.plot_box_sketch(sketches[var], plot_params, title, var_lab)
+            fig.add_subplot(gs[2,k])
+            diagnostic.plot_cumulative_distribution_sketch(sketches[var], plot_params, title, cumul_lab, quantiles)
+        else:
+            fig.add_subplot(gs[0,k])
+            diagnostic.plot_hist(trip_statistics_all, plot_params, var, title, var_lab)
+            fig.add_subplot(gs[1,k])
+            diagnostic.plot_box(trip_statistics_all, plot_params, var, title, var_lab)
+            fig.add_subplot(gs[2,k])
+            diagnostic.plot_cumulative_distribution(trip_statistics_all, plot_params, var, title, cumul_lab, quantiles)
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "stats_summary", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
@@ -96,7 +108,7 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params, rand=False):
     :type plot_params: dict
     :param rand: True if colors should be random. 
     :type rand: bool
-    :return: the full diagnostic figure.
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     
     The figure is save at the png format.
@@ -107,6 +119,10 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params, rand=False):
     n_trips = self.n_trips
     params = self.gps_collection[0].params
     
+    # skip rendering if the figure is up-to-date
+    fig_key = figcache.get_figure_key("maps_diag", [df_all, params, rand], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "maps_diag", fig_key, plot_params): return(None)
+    
     # get parameters
     dpi = plot_params.get("fig_dpi")
     cols_1 = plot_params.get("cols_1")
@@ -149,7 +165,8 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params, rand=False):
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "maps_diag", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
@@ -172,7 +189,7 @@ def indiv_map_all(self, fig_dir, file_id, plot_params):
     :type file_id: str
     :param plot_params: plot parameters dictionary. 
     :type plot_params: dict
-    :return: the full diagnostic figure.
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     
     The figure is save at the png format.
@@ -182,6 +199,10 @@ def indiv_map_all(self, fig_dir, file_id, plot_params):
     n_gps = self.n_gps
     gps_collection = self.gps_collection
     
+    # skip rendering if the figure is up-to-date
+    fig_key = figcache.get_figure_key("indiv_map_all", [[gps.df for gps in gps_collection], [gps.params for gps in gps_collection]], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "indiv_map_all", fig_key, plot_params): return(None)
+    
     # get parameters
     dpi = plot_params.get("fig_dpi")
     cols_1 = plot_params.get("cols_1")
@@ -222,7 +243,8 @@ def indiv_map_all(self, fig_dir, file_id, plot_params):
             
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "indiv_map_all", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
@@ -232,7 +254,7 @@ def indiv_map_all(self, fig_dir, file_id, plot_params):
 # ======================================================= #
 # GPS FOLIUM MAPS [GPS_COLLECTION METHOD]
 # ======================================================= #
-def folium_map(self, fig_dir, file_id, plot_params, rand=False):
+def folium_map(self, fig_dir, file_id, plot_params, rand=False, density=False, time_weighted=False, cell_size=0.01, n_levels=4):
     
     """    
     Produce the html map with every GPS data colored by seabird id.
@@ -247,10 +269,21 @@ def folium_map(self, fig_dir, file_id, plot_params, rand=False):
     :type plot_params: dict
     :param rand: True if colors should be random. 
     :type rand: bool
+    :param density: True if positions should be aggregated into density layers instead of drawing every trajectory. 
+    :type density: bool
+    :param time_weighted: True if the density should be weighted by step time to get the time spent at location in hours. 
+    :type time_weighted: bool
+    :param cell_size: size in degrees of the cells of the finest density layer. 
+    :type cell_size: float
+    :param n_levels: number of density layers, the cell size being doubled from one layer to the next. 
+    :type n_levels: int
     :return: the folium map.
     :rtype: folium.Map
     
-    The figure is save at the html format.
+    The figure is save at the html format. With ``density=True``, every position of ``df_all`` is binned onto a grid pyramid using 
+    ``indexing.build_density_pyramid`` and only the aggregated cells are embedded in the html, which keeps the overview map of large 
+    collections fast to build and to open.
+    Otherwise, trajectories are simplified with the ``simplify_tol`` tolerance in metres of the plot parameters (see ``simplify_mask``).
     """
     
     # get attributes
@@ -261,19 +294,42 @@ def folium_map(self, fig_dir, file_id, plot_params, rand=False):
     # get parameters
     colony_0 = params_0.get("colony")
     cols_1 = plot_params.get("cols_1")
+    cols_2 = plot_params.get("cols_2")
+    simplify_tol = plot_params.get("simplify_tol")
     
     # produce folium map
     fmap = folium.Map(location=[colony_0["center"][1], colony_0["center"][0]])
-    for k in range(n_gps):
-        gps = gps_collection[k]
-        colony = gps.params.get("colony")
-        folium.Marker(location=[colony["center"][1], colony["center"][0]], popup="<i>Colony %s</i>" % (colony["name"])).add_to(fmap)
-        if rand:
-            folium.PolyLine(tooltip="<i>Id %s</i>" % (gps.id), locations=gps.df[["latitude", "longitude"]].values.tolist(), 
-                            color=misc.rgb_to_hex(misc.random_colors()[0]), weight=2, opacity=0.7).add_to(fmap)   
-        else:
-            folium.PolyLine(tooltip="<i>Id %s</i>" % (gps.id), locations=gps.df[["latitude", "longitude"]].values.tolist(), 
-                            color=misc.rgb_to_hex(cols_1[k % len(cols_1)]), weight=2, opacity=0.7).add_to(fmap)   
+    if density:
+        
+        # add colony markers
+        colonies = {gps.params.get("colony")["name"]:gps.params.get("colony") for gps in gps_collection}
+        for colony in colonies.values():
+            folium.Marker(location=[colony["center"][1], colony["center"][0]], popup="<i>Colony %s</i>" % (colony["name"])).add_to(fmap)
+            
+        # aggregate positions onto a grid pyramid
+        df_all = self.df_all
+        weights = df_all["step_time"].to_numpy(dtype=float, na_value=0)/3600 if time_weighted else None
+        pyramid = indexing.build_density_pyramid(df_all["longitude"].to_numpy(dtype=float, na_value=float("nan")), 
+                                                 df_all["latitude"].to_numpy(dtype=float, na_value=float("nan")), weights, cell_size, n_levels)
+        
+        # add density layers
+        fmap, _ = diagnostic.plot_folium_density(fmap, pyramid, cols_2, "time (h)" if time_weighted else "positions")
+        fmap.add_child(folium.LayerControl(collapsed=False))
+        
+    else:
+        offsets = self.offsets
+        mask = self.simplify_mask(simplify_tol) if simplify_tol is not None else np.ones(offsets[-1], dtype=bool)
+        for k in range(n_gps):
+            gps = gps_collection[k]
+            locations = gps.df.loc[mask[offsets[k]:offsets[k+1]], ["latitude", "longitude"]].values.tolist()
+            colony = gps.params.get("colony")
+            folium.Marker(location=[colony["center"][1], colony["center"][0]], popup="<i>Colony %s</i>" % (colony["name"])).add_to(fmap)
+            if rand:
+                folium.PolyLine(tooltip="<i>Id %s</i>" % (gps.id), locations=locations, 
+                                color=misc.rgb_to_hex(misc.random_colors()[0]), weight=2, opacity=0.7).add_to(fmap)   
+            else:
+                folium.PolyLine(tooltip="<i>Id %s</i>" % (gps.id), locations=locations, 
+                                color=misc.rgb_to_hex(cols_1[k % len(cols_1)]), weight=2, opacity=0.7).add_to(fmap)   
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.html" % file_id)
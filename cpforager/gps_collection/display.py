@@ -2,23 +2,30 @@
 # LIBRARIES
 # ======================================================= #
 import numpy as np
+from cpforager import accumulators
 
 
 # ======================================================= #
 # DISPLAY [GPS_COLLECTION METHODS]
 # ======================================================= #
-def display_data_summary(self, standalone=True):
+def display_data_summary(self, standalone=True, streaming=False):
     
     """    
     Print in terminal the GPS_Collection data summary.
     
     :param self: a GPS_Collection object
     :type self: cpforager.GPS_Collection
+    :param standalone: display information standalone if True.
+    :type standalone: bool
+    :param streaming: compute the trip statistics from streaming accumulators fed GPS by GPS if True, instead of ``trip_statistics_all``.
+    :type streaming: bool
+    
+    With ``streaming=True``, the memory does not depend on the number of trips and quantiles are estimated within a 1% relative error 
+    (see ``accumulators.init_accumulator``), hence the quantiles of the number of steps are printed as floats.
     """
 
     # get attributes
     gps_collection = self.gps_collection
-    trip_statistics_all = self.trip_statistics_all
     
     # append groups
     groups = []
@@ -30,11 +37,19 @@ def display_data_summary(self, standalone=True):
     for group in np.unique(groups):
         groups_str = groups_str + "%s [%d GPS] | " % (group, sum(np.isin(groups, group)))
         
-    # get quantiles trip statistics
-    trip_length_quantiles = trip_statistics_all["length"].quantile([0,0.25,0.5,0.75,1])
-    trip_duration_quantiles = trip_statistics_all["duration"].quantile([0,0.25,0.5,0.75,1])
-    trip_dmax_quantiles = trip_statistics_all["dmax"].quantile([0,0.25,0.5,0.75,1])
-    trip_nstep_quantiles = trip_statistics_all["n_step"].quantile([0,0.25,0.5,0.75,1])
+    # get mean, std and quantiles of trip statistics
+    variables = ["length", "duration", "dmax", "n_step"]
+    if streaming:
+        trip_accumulators = accumulators.accumulate_columns([gps.trip_statistics for gps in gps_collection], variables)
+        stats = {var:accumulators.get_accumulator_statistics(trip_accumulators[var], [0,0.25,0.5,0.75,1]) for var in variables}
+    else:
+        trip_statistics_all = self.trip_statistics_all
+        stats = {var:{"mean":trip_statistics_all[var].mean(), "std":trip_statistics_all[var].std(), 
+                      "quantiles":trip_statistics_all[var].quantile([0,0.25,0.5,0.75,1]).to_numpy()} for var in variables}
+    trip_length_quantiles = stats["length"]["quantiles"]
+    trip_duration_quantiles = stats["duration"]["quantiles"]
+    trip_dmax_quantiles = stats["dmax"]["quantiles"]
+    trip_nstep_quantiles = stats["n_step"]["quantiles"]
     
     # print information
     if standalone:
@@ -44,14 +59,17 @@ def display_data_summary(self, standalone=True):
         print("# + Nb of trips = %d" % self.n_trips)
         print("# + Groups      = %s" % groups_str)
     print("# ------------------------------ GPS COLLECTION DATA ------------------ #")
-    print("# + Trip length   : mean=%.1fkm | std=%.1fkm" % (trip_statistics_all["length"].mean(), trip_statistics_all["length"].std()))
-    print("# + Trip length   : min=%.1fkm | q25=%.1fkm | q50=%.1fkm | q75=%.1fkm | max=%.1fkm" % (trip_length_quantiles[0], trip_length_quantiles[0.25], trip_length_quantiles[0.5], trip_length_quantiles[0.75], trip_length_quantiles[1]))
-    print("# + Trip duration : mean=%.1fh | std=%.1fh" % (trip_statistics_all["duration"].mean(), trip_statistics_all["duration"].std()))
-    print("# + Trip duration : min=%.1fh | q25=%.1fh | q50=%.1fh | q75=%.1fh | max=%.1fh" % (trip_duration_quantiles[0], trip_duration_quantiles[0.25], trip_duration_quantiles[0.5], trip_duration_quantiles[0.75], trip_duration_quantiles[1]))
-    print("# + Trip dist max : mean=%.1fkm | std=%.1fkm" % (trip_statistics_all["dmax"].mean(), trip_statistics_all["dmax"].std()))
-    print("# + Trip dist max : min=%.1fkm | q25=%.1fkm | q50=%.1fkm | q75=%.1fkm | max=%.1fkm" % (trip_dmax_quantiles[0], trip_dmax_quantiles[0.25], trip_dmax_quantiles[0.5], trip_dmax_quantiles[0.75], trip_dmax_quantiles[1])) 
-    print("# + Trip nb steps : mean=%.1f | std=%.1f" % (trip_statistics_all["n_step"].mean(), trip_statistics_all["n_step"].std()))
-    print("# + Trip nb steps : min=%d | q25=%d | q50=%d | q75=%d | max=%d" % (trip_nstep_quantiles[0], trip_nstep_quantiles[0.25], trip_nstep_quantiles[0.5], trip_nstep_quantiles[0.75], trip_nstep_quantiles[1])) 
+    print("# + Trip length   : mean=%.1fkm | std=%.1fkm" % (stats["length"]["mean"], stats["length"]["std"]))
+    print("# + Trip length   : min=%.1fkm | q25=%.1fkm | q50=%.1fkm | q75=%.1fkm | max=%.1fkm" % (trip_length_quantiles[0], trip_length_quantiles[1], trip_length_quantiles[2], trip_length_quantiles[3], trip_length_quantiles[4]))
+    print("# + Trip duration : mean=%.1fh | std=%.1fh" % (stats["duration"]["mean"], stats["duration"]["std"]))
+    print("# + Trip duration : min=%.1fh | q25=%.1fh | q50=%.1fh | q75=%.1fh | max=%.1fh" % (trip_duration_quantiles[0], trip_duration_quantiles[1], trip_duration_quantiles[2], trip_duration_quantiles[3], trip_duration_quantiles[4]))
+    print("# + Trip dist max : mean=%.1fkm | std=%.1fkm" % (stats["dmax"]["mean"], stats["dmax"]["std"]))
+    print("# + Trip dist max : min=%.1fkm | q25=%.1fkm | q50=%.1fkm | q75=%.1fkm | max=%.1fkm" % (trip_dmax_quantiles[0], trip_dmax_quantiles[1], trip_dmax_quantiles[2], trip_dmax_quantiles[3], trip_dmax_quantiles[4])) 
+    print("# + Trip nb steps : mean=%.1f | std=%.1f" % (stats["n_step"]["mean"], stats["n_step"]["std"]))
+    if streaming:
+        print("# + Trip nb steps : min=%.1f | q25=%.1f | q50=%.1f | q75=%.1f | max=%.1f" % (trip_nstep_quantiles[0], trip_nstep_quantiles[1], trip_nstep_quantiles[2], trip_nstep_quantiles[3], trip_nstep_quantiles[4])) 
+    else:
+        print("# + Trip nb steps : min=%d | q25=%d | q50=%d | q75=%d | max=%d" % (trip_nstep_quantiles[0], trip_nstep_quantiles[1], trip_nstep_quantiles[2], trip_nstep_quantiles[3], trip_nstep_quantiles[4])) 
     if standalone:
         print("# ===================================================================== #")
     
\ No newline at end of file
@@ -3,8 +3,8 @@
 # ================================================================================================ #
 import pandas as pd
 import numpy as np
-from cpforager import parameters
-from cpforager.gps_collection import diagnostic, display, stdb
+from cpforager import parameters, utils, rendering
+from cpforager.gps_collection import diagnostic, display, slicing, spatial, stdb, timegrid, tracks, formats
 
 
 # ================================================================================================ #
@@ -33,8 +33,18 @@ class GPS_Collection:
         :vartype n_trips: int
         :ivar trip_statistics_all: the trip statistics dataframe merged over every GPS included in the list.
         :vartype trip_statistics_all: pandas.DataFrame
-        :ivar df_all: the enhanced GPS dataframe merged over every GPS included in the list.
+        :ivar store: the columnar store, *i.e.* the dictionary of contiguous arrays by column concatenated over every GPS included in the list.
+        :vartype store: dict
+        :ivar df_all: the enhanced GPS dataframe merged over every GPS included in the list, built over the columnar store.
         :vartype df_all: pandas.DataFrame
+        :ivar offsets: the positions in ``df_all`` of the first row of every GPS, plus the total number of rows.
+        :vartype offsets: numpy.ndarray
+        :ivar spatial_index: the grid spatial index over the positions of ``df_all``, built at the first spatial query (see ``build_spatial_index``).
+        :vartype spatial_index: dict
+        
+        .. note::
+            Every column of ``df_all`` is allocated once in the columnar store, ``df_all`` being built over the store without copy. The dataframes of 
+            the GPS included in the list are left untouched, hence their later modifications are not reflected in ``df_all``. Rebuild the collection after such changes.
         """
         
         # init dataframes
@@ -42,10 +52,8 @@ class GPS_Collection:
         dtypes_1 = parameters.get_columns_dtypes(column_names_1)
         trip_statistics_all = pd.DataFrame(columns=column_names_1).astype(dtype=dtypes_1)
         
-        column_names_2 = ["group", "id", "datetime", "longitude", "latitude", "step_time", "step_length", "step_speed", "step_heading",
+        column_names_2 = ["datetime", "longitude", "latitude", "step_time", "step_length", "step_speed", "step_heading",
                           "step_turning_angle", "step_heading_to_colony", "is_night", "is_suspicious", "dist_to_nest", "trip"]
-        dtypes_2 = parameters.get_columns_dtypes(column_names_2)
-        df_all = pd.DataFrame(columns=column_names_2).astype(dtype=dtypes_2)
 
         # compute statistics
         group = []
@@ -62,29 +70,27 @@ class GPS_Collection:
             trip_id = np.concatenate((trip_id, [f"{gps.group}_{gps.id}_T{k:04}" for k in gps.df.loc[gps.df["trip"]>0, "trip"].unique()]))
             trip_statistics_all = pd.concat([trip_statistics_all, gps.trip_statistics], ignore_index=True)
 
-            # build the full data dataframe of the entire collection
-            df_tmp = pd.DataFrame(columns=df_all.columns)
-            df_tmp[["datetime", "longitude", "latitude", "step_time", "step_length", "step_speed","step_heading", 
-                    "step_turning_angle","step_heading_to_colony", "is_night", "is_suspicious", "dist_to_nest", "trip"]] = gps.df[["datetime", "longitude", "latitude", "step_time", "step_length", "step_speed", "step_heading",
-                                                                                                                                   "step_turning_angle", "step_heading_to_colony", "is_night", "is_suspicious", "dist_to_nest", "trip"]]
-            df_tmp = df_tmp.astype(dtype=dtypes_2)
-
-            # add metadata in df for each trip
-            df_tmp["id"] = gps.id
-            df_tmp["group"] = gps.group
-            df_all = pd.concat([df_all, df_tmp], ignore_index=True)
-
         # replace id column with full trip ids
         trip_statistics_all["group"] = group
         trip_statistics_all["id"] = id
         trip_statistics_all["trip_id"] = trip_id
 
+        # build the columnar store of the entire collection
+        store, offsets = utils.build_columnar_store([gps.df for gps in gps_collection], column_names_2)
+
+        # build the full data dataframe of the entire collection over the columnar store
+        metadata = {"group":[gps.group for gps in gps_collection], "id":[gps.id for gps in gps_collection]}
+        df_all = utils.get_columnar_store_dataframe(store, offsets, metadata, parameters.get_columns_dtypes(column_names_2))
+
         # set attributes
         self.gps_collection = gps_collection
         self.n_gps = len(gps_collection)
         self.n_trips = len(trip_statistics_all)
         self.trip_statistics_all = trip_statistics_all
+        self.store = store
         self.df_all = df_all
+        self.offsets = offsets
+        self.spatial_index = None
 
     # [METHODS] length of the class
     def __len__(self):
@@ -98,6 +104,25 @@ class GPS_Collection:
     def __repr__(self):
         return "%s(%d GPS, %d trips)" % (type(self).__name__, self.n_gps, self.n_trips)
 
+    # [METHODS] extract time windows
+    window = slicing.window
+    windows = slicing.windows
+
+    # [METHODS] align members on a common time grid
+    align = timegrid.align
+
+    # [METHODS] simplify trajectories
+    simplify_mask = tracks.simplify_mask
+
+    # [METHODS] export trips as lines
+    export_trips = tracks.export_trips
+
+    # [METHODS] spatial queries
+    build_spatial_index = spatial.build_spatial_index
+    query_bbox = spatial.query_bbox
+    query_polygon = spatial.query_polygon
+    query_radius = spatial.query_radius
+
     # [METHODS] display the summary of the data
     display_data_summary = display.display_data_summary
 
@@ -106,6 +131,12 @@ class GPS_Collection:
     maps_diag = diagnostic.maps_diagnostic
     indiv_map_all = diagnostic.indiv_map_all
     folium_map = diagnostic.folium_map
+
+    # [METHODS] render diagnostics of every member in parallel
+    render_all = rendering.render_all
     
     # [METHODS] Seabird Tracking Database formatting
-    to_SeabirdTracking = stdb.convert_to_stdb_format
\ No newline at end of file
+    to_SeabirdTracking = stdb.convert_to_stdb_format
+    
+    # [METHODS] Movebank formatting
+    to_Movebank = formats.to_Movebank
\ No newline at end of file
@@ -0,0 +1,152 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import pandas as pd
+from cpforager import indexing
+
+
+# ================================================================================================ #
+# SPATIAL INDEX [GPS_COLLECTION METHODS]
+# ================================================================================================ #
+def build_spatial_index(self, cell_size=0.01):
+
+    """
+    Build the uniform grid spatial index over the positions of the collection dataframe.
+
+    :param self: a GPS_Collection object
+    :type self: cpforager.GPS_Collection
+    :param cell_size: size in degrees of the square grid cells.
+    :type cell_size: float
+    :return: the grid index dictionary, also stored in the ``spatial_index`` attribute.
+    :rtype: dict
+
+    The index is built once and kept with the collection, so that subsequent queries are answered without scanning ``df_all``.
+    See ``indexing.build_grid_index`` for the content of the dictionary.
+    """
+
+    # get attributes
+    df_all = self.df_all
+
+    # build grid index
+    spatial_index = indexing.build_grid_index(df_all["longitude"].to_numpy(dtype=float, na_value=float("nan")),
+                                              df_all["latitude"].to_numpy(dtype=float, na_value=float("nan")), cell_size)
+
+    # set attributes
+    self.spatial_index = spatial_index
+
+    return(spatial_index)
+
+
+def get_query_results(df_all, rows):
+
+    """
+    Format the rows returned by a spatial query.
+
+    :param df_all: the collection dataframe.
+    :type df_all: pandas.DataFrame
+    :param rows: the sorted row positions in ``df_all``.
+    :type rows: numpy.ndarray
+    :return: the dataframe with ``id``, ``trip`` and ``row`` columns where each row corresponds to one position.
+    :rtype: pandas.DataFrame
+    """
+
+    # build results dataframe
+    df_results = pd.DataFrame({"id":df_all["id"].to_numpy()[rows], "trip":df_all["trip"].array[rows], "row":rows})
+
+    return(df_results)
+
+
+def query_bbox(self, lon_min, lon_max, lat_min, lat_max):
+
+    """
+    Find the positions of the collection within a bounding box.
+
+    :param self: a GPS_Collection object
+    :type self: cpforager.GPS_Collection
+    :param lon_min: minimum longitude of the bounding box.
+    :type lon_min: float
+    :param lon_max: maximum longitude of the bounding box.
+    :type lon_max: float
+    :param lat_min: minimum latitude of the bounding box.
+    :type lat_min: float
+    :param lat_max: maximum latitude of the bounding box.
+    :type lat_max: float
+    :return: the dataframe with ``id``, ``trip`` and ``row`` columns where ``row`` is the position in ``df_all``.
+    :rtype: pandas.DataFrame
+
+    The spatial index is built with default parameters at the first query if it does not exist yet.
+    """
+
+    # get attributes
+    spatial_index = self.spatial_index
+    if spatial_index is None: spatial_index = self.build_spatial_index()
+
+    # query grid index
+    rows = indexing.query_bbox(spatial_index, lon_min, lon_max, lat_min, lat_max)
+
+    # format results
+    df_results = get_query_results(self.df_all, rows)
+
+    return(df_results)
+
+
+def query_polygon(self, polygon_lon, polygon_lat):
+
+    """
+    Find the positions of the collection within a polygon.
+
+    :param self: a GPS_Collection object
+    :type self: cpforager.GPS_Collection
+    :param polygon_lon: longitudes of the polygon vertices.
+    :type polygon_lon: array-like of floats
+    :param polygon_lat: latitudes of the polygon vertices.
+    :type polygon_lat: array-like of floats
+    :return: the dataframe with ``id``, ``trip`` and ``row`` columns where ``row`` is the position in ``df_all``.
+    :rtype: pandas.DataFrame
+
+    The spatial index is built with default parameters at the first query if it does not exist yet.
+    """
+
+    # get attributes
+    spatial_index = self.spatial_index
+    if spatial_index is None: spatial_index = self.build_spatial_index()
+
+    # query grid index
+    rows = indexing.query_polygon(spatial_index, polygon_lon, polygon_lat)
+
+    # format results
+    df_results = get_query_results(self.df_all, rows)
+
+    return(df_results)
+
+
+def query_radius(self, lon, lat, radius):
+
+    """
+    Find the positions of the collection within a given distance of a point.
+
+    :param self: a GPS_Collection object
+    :type self: cpforager.GPS_Collection
+    :param lon: longitude of the point.
+    :type lon: float
+    :param lat: latitude of the point.
+    :type lat: float
+    :param radius: distance in km.
+    :type radius: float
+    :return: the dataframe with ``id``, ``trip`` and ``row`` columns where ``row`` is the position in ``df_all``.
+    :rtype: pandas.DataFrame
+
+    The spatial index is built with default parameters at the first query if it does not exist yet.
+    """
+
+    # get attributes
+    spatial_index = self.spatial_index
+    if spatial_index is None: spatial_index = self.build_spatial_index()
+
+    # query grid index
+    rows = indexing.query_radius(spatial_index, lon, lat, radius)
+
+    # format results
+    df_results = get_query_results(self.df_all, rows)
+
+    return(df_results)
@@ -1,14 +1,88 @@
 # ================================================================================================ #
 # LIBRARIES
 # ================================================================================================ #
+import os
+import csv
+import numpy as np
 import pandas as pd
 from cpforager import utils, GPS
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ================================================================================================ #
+# FORMAT SEABIRD TRACKING DATABASE DATETIMES
+# ================================================================================================ #
+def get_time_strings():
+    
+    """    
+    Produce the lookup table of the ``HH:MM:SS`` strings of every second of a day.
+    
+    :return: the array of the 86400 time strings indexed by the number of seconds since midnight.
+    :rtype: numpy.ndarray
+    """
+    
+    # format every second of a day once
+    time_strings = np.array(["%02d:%02d:%02d" % (s//3600, (s%3600)//60, s%60) for s in range(86400)], dtype=object)
+    
+    return(time_strings)
+
+
+def format_stdb_datetimes(datetimes, time_strings):
+    
+    """    
+    Format datetimes as the ``date_gmt`` and ``time_gmt`` strings of the Seabird Tracking Database.
+    
+    :param datetimes: the UTC datetimes.
+    :type datetimes: numpy.ndarray(datetime64[ns])
+    :param time_strings: the lookup table of time strings (see ``get_time_strings``).
+    :type time_strings: numpy.ndarray
+    :return: the ``%d/%m/%Y`` date strings and the ``%H:%M:%S`` time strings, NaN for missing datetimes.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    
+    Datetimes are split into days and seconds since midnight as integers. Only the unique days are formatted as strings, 
+    and time strings are read from the lookup table, hence no string formatting is done per row.
+    """
+    
+    # split datetimes into days and seconds since midnight
+    datetimes = np.asarray(datetimes).astype("datetime64[s]")
+    is_nat = np.isnat(datetimes)
+    days = datetimes.astype("datetime64[D]")
+    seconds = np.where(is_nat, 0, (datetimes-days).astype(np.int64))
+    
+    # format unique days only
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    date_gmt = pd.DatetimeIndex(unique_days).strftime("%d/%m/%Y").to_numpy(dtype=object)[inverse]
+    
+    # read times in lookup table
+    time_gmt = time_strings[seconds]
+    date_gmt[is_nat] = np.nan
+    time_gmt[is_nat] = np.nan
+    
+    return(date_gmt, time_gmt)
+
+
+def format_stdb_track_ids(trips):
+    
+    """    
+    Format trip numbers as the ``track_id`` strings of the Seabird Tracking Database, *i.e.* with leading zeros.
+    
+    :param trips: the trip numbers.
+    :type trips: numpy.ndarray
+    :return: the track id strings.
+    :rtype: numpy.ndarray
+    """
+    
+    # format unique trips only
+    unique_trips, inverse = np.unique(trips, return_inverse=True)
+    track_id = np.array(["%02d" % trip for trip in unique_trips], dtype=object)[inverse]
+    
+    return(track_id)
 
 
 # ================================================================================================ #
 # CONVERT TO SEABIRD TRACKING DATABASE FORMAT [GPS_COLLECTION METHODS]
 # ================================================================================================ #
-def convert_to_stdb_format(self, metadata):
+def convert_to_stdb_format(self, metadata, file_path=None, chunk_size=1000000):
     
     """    
     Produce the dataframe formatted for Seabird Tracking Database from GPS_collection.
@@ -17,7 +91,11 @@ def convert_to_stdb_format(self, metadata):
     :type self: cpforager.GPS_Collection
     :param metadata: the dataframe with the metadata needed for Seabird Tracking Database.
     :type metadata: pandas.DataFrame.
-    :return: the dataframe at the Seabird Tracking Database format.
+    :param file_path: path of the csv file where rows are written chunk by chunk, the dataframe is returned if None.
+    :type file_path: str
+    :param chunk_size: maximum number of rows written at once in the csv file.
+    :type chunk_size: int
+    :return: the dataframe at the Seabird Tracking Database format, None if written in ``file_path``.
     :rtype: pandas.DataFrame
     
     The resulting dataframe contains all the position recordings found in the GPS_Collection and its associated metadata 
@@ -26,6 +104,10 @@ def convert_to_stdb_format(self, metadata):
     GPS but are for Seabird Tracking, they are set to "NA". See `STDB <https://www.seabirdtracking.org/>`_ for more details 
     about the format.
     
+    Positions are read from the columnar store of the collection without copying the GPS dataframes, and every column of the 
+    resulting dataframe is allocated once. With ``file_path``, at most ``chunk_size`` rows are formatted at once, so that the 
+    memory does not depend on the size of the collection. The csv file is written with the non-numeric fields quoted.
+    
     .. note::
         The required fields in the metadata dataframe are ``bird_id``,``sex``,``age``,``breed_stage``, ``equinox`` and 
         ``argos_quality``. Possible values for these fields are constrained by Seabird Tracking Database.
@@ -33,108 +115,238 @@ def convert_to_stdb_format(self, metadata):
 
     # get attributes
     gps_collection = self.gps_collection
-    n_gps = self.n_gps
+    store = self.store
+    offsets = self.offsets
     
     # columns of a seabird tracking csv file
     stdb_columns_dtypes = {"bird_id":"str", "sex":"str", "age":"str", "breed_stage":"str", "track_id":"str", "date_gmt":"str", "time_gmt":"str", "latitude":"float", "longitude":"float", "equinox":"str", "argos_quality":"str"}
-
-    # initialize the overall seabird tracking dataframe
-    df_stdb = pd.DataFrame(columns=stdb_columns_dtypes.keys())
-    df_stdb = df_stdb.astype(dtype=stdb_columns_dtypes)
+    stdb_columns = list(stdb_columns_dtypes.keys())
     
-    # loop over gps in the gps collection
-    for k in range(n_gps):
-        
-        # load individual gps data from the gps collection
-        gps = gps_collection[k]
-        df = gps.df.copy(deep=True)
+    # index metadata by bird id once
+    metadata_by_id = metadata.drop_duplicates(subset="bird_id").set_index("bird_id", drop=False)
+    
+    # find the row ranges of the gps found in metadata
+    ranges = []
+    for (k, gps) in enumerate(gps_collection):
+        if gps.id in metadata_by_id.index:
+            ranges.append((gps, offsets[k], offsets[k+1]))
+        else:
+            print("WARNING : GPS id %s not found in metadata" % (gps.id))
+            
+    # split row ranges into chunks when writing to file
+    if file_path is not None:
+        ranges = [(gps, i0, min(i0+chunk_size, idx_1)) for (gps, idx_0, idx_1) in ranges for i0 in range(idx_0, idx_1, chunk_size)]
+    
+    # allocate the overall seabird tracking columns once
+    if file_path is None:
+        n_rows = sum([i1-i0 for (_, i0, i1) in ranges])
+        stdb = {column:np.empty(n_rows, dtype=float if dtype == "float" else object) for (column, dtype) in stdb_columns_dtypes.items()}
+    
+    # format rows by range
+    time_strings = get_time_strings()
+    n_written = 0
+    for (gps, i0, i1) in ranges:
         
         # convert datetime from local to utc timezone
-        local_timezone = gps.params.get("local_tz")
-        df = utils.convert_loc_to_utc(df, local_timezone)
+        df_utc = utils.convert_loc_to_utc(pd.DataFrame({"datetime":store["datetime"][i0:i1]}), gps.params.get("local_tz"))
         
-        # find row in metadata corresponding to id
-        metadata_row = metadata.loc[metadata["bird_id"] == gps.id].reset_index(drop=True)
+        # build range columns constantly equal to metadata
+        metadata_row = metadata_by_id.loc[gps.id]
+        chunk = {"bird_id":metadata_row["bird_id"], "sex":metadata_row["sex"], "age":metadata_row["age"], "breed_stage":metadata_row["breed_stage"]}
         
-        if(len(metadata_row)>0):
-            
-            # define new column in dataframe constantly equals to metadata
-            df["bird_id"] = metadata_row["bird_id"][0]
-            df["sex"] = metadata_row["sex"][0]
-            df["age"] = metadata_row["age"][0]
-            df["breed_stage"] = metadata_row["breed_stage"][0]
-            
-            # track_id as a string with leading zeros
-            df["track_id"] = df["trip"].apply(lambda x: "%02d" % x)
-            
-            # reformat UTC datetime
-            df["date_gmt"] = df["datetime"].dt.strftime("%d/%m/%Y")
-            df["time_gmt"] = df["datetime"].dt.strftime("%H:%M:%S")        
-            
-            # define to NA the required columns equinox (GLS) and argos_quality (PTT)
-            df["equinox"] = "NA"
-            df["argos_quality"] = "NA"
-
-            # only select columns of interest
-            df = df[stdb_columns_dtypes.keys()]
-            
-            # concatenate to the overall dataframe
-            df_stdb = pd.concat([df_stdb, df]).reset_index(drop=True)
-            
+        # build range columns from data
+        chunk["track_id"] = format_stdb_track_ids(store["trip"][i0:i1])
+        chunk["date_gmt"], chunk["time_gmt"] = format_stdb_datetimes(df_utc["datetime"].to_numpy(), time_strings)
+        chunk["latitude"] = store["latitude"][i0:i1]
+        chunk["longitude"] = store["longitude"][i0:i1]
+        
+        # define to NA the required columns equinox (GLS) and argos_quality (PTT)
+        chunk["equinox"] = "NA"
+        chunk["argos_quality"] = "NA"
+        
+        # append chunk to file or fill the overall columns
+        if file_path is not None:
+            df_chunk = pd.DataFrame(chunk, columns=stdb_columns)
+            df_chunk.to_csv(file_path, mode="w" if n_written == 0 else "a", header=(n_written == 0), index=False, quoting=csv.QUOTE_NONNUMERIC)
         else:
-            print("WARNING : GPS id %s not found in metadata" % (gps.id))
+            for column in stdb_columns:
+                stdb[column][n_written:n_written+i1-i0] = chunk[column]
+        n_written = n_written+i1-i0
+    
+    # build the overall seabird tracking dataframe
+    if file_path is not None:
+        if n_written == 0:
+            pd.DataFrame(columns=stdb_columns).to_csv(file_path, index=False, quoting=csv.QUOTE_NONNUMERIC)
+        df_stdb = None
+    else:
+        df_stdb = pd.DataFrame(stdb, columns=stdb_columns, copy=False)
         
     return(df_stdb)
 
 
+# ================================================================================================ #
+# PARSE SEABIRD TRACKING DATABASE DATETIMES
+# ================================================================================================ #
+def parse_stdb_datetimes(date_gmt, time_gmt):
+    
+    """    
+    Parse the ``date_gmt`` and ``time_gmt`` strings of the Seabird Tracking Database as datetimes.
+    
+    :param date_gmt: the ``%d/%m/%Y`` date strings.
+    :type date_gmt: pandas.Series(str)
+    :param time_gmt: the ``%H:%M:%S`` time strings.
+    :type time_gmt: pandas.Series(str)
+    :return: the UTC datetimes, NaT for missing dates or times.
+    :rtype: numpy.ndarray(datetime64[ns])
+    
+    Only the unique dates and times are parsed, then mapped back to every row and summed, hence no string is built or parsed per row.
+    """
+    
+    # parse unique dates, missing dates being mapped to the appended NaT
+    date_codes, date_uniques = pd.factorize(date_gmt)
+    days = pd.to_datetime(date_uniques, format="%d/%m/%Y").to_numpy(dtype="datetime64[ns]")
+    days = np.append(days, np.datetime64("NaT", "ns"))[date_codes]
+    
+    # parse unique times, missing times being mapped to the appended NaT
+    time_codes, time_uniques = pd.factorize(time_gmt)
+    times = pd.to_timedelta(time_uniques).to_numpy(dtype="timedelta64[ns]")
+    times = np.append(times, np.timedelta64("NaT", "ns"))[time_codes]
+    
+    # sum dates and times
+    datetimes = days+times
+    
+    return(datetimes)
+
+
+# ================================================================================================ #
+# READ A SEABIRD TRACKING DATABASE FILE
+# ================================================================================================ #
+def read_stdb_chunks(file_path, chunk_size=1000000):
+    
+    """    
+    Read a Seabird Tracking Database csv file chunk by chunk and parse its datetimes.
+    
+    :param file_path: path of the Seabird Tracking Database csv file.
+    :type file_path: str
+    :param chunk_size: number of rows read at once.
+    :type chunk_size: int
+    :return: the iterator over the chunks at the Seabird Tracking Database format with the additional ``datetime`` column at UTC.
+    :rtype: Iterator[pandas.DataFrame]
+    
+    Chunks are read and yielded one at a time, so that only the current chunk and the temporary arrays of its datetime parser are held by the reader.
+    """
+    
+    # read and parse datetimes chunk by chunk
+    for df_chunk in pd.read_csv(file_path, sep=",", chunksize=chunk_size):
+        df_chunk["datetime"] = parse_stdb_datetimes(df_chunk["date_gmt"], df_chunk["time_gmt"])
+        yield df_chunk
+
+
+# ================================================================================================ #
+# SPLIT SEABIRD TRACKING DATABASE CHUNKS BY BIRD
+# ================================================================================================ #
+def split_stdb_by_bird(df_chunks, params):
+    
+    """    
+    Split Seabird Tracking Database chunks into the dataframes of every bird.
+    
+    :param df_chunks: the chunks at the Seabird Tracking Database format with the additional ``datetime`` column at UTC.
+    :type df_chunks: Iterable[pandas.DataFrame]
+    :param params: the parameters dictionary.
+    :type params: dict
+    :return: the list of bird ids ordered by first appearance and the list of their dataframes.
+    :rtype: (list, list[pandas.DataFrame])
+    
+    Datetimes of every chunk are converted to local timezone and its rows are grouped by ``bird_id`` with a single stable sort, then appended 
+    to the rows of the same bird found in previous chunks. The whole file is thus never concatenated nor sorted at once.
+    
+    .. note::
+        The required fields in the parameters dictionary are ``local_tz``.
+    """
+    
+    # group rows of every chunk by bird id
+    bird_chunks = {}
+    for df_chunk in df_chunks:
+        
+        # convert datetimes to local timezone
+        df_chunk = utils.convert_utc_to_loc(df_chunk, params.get("local_tz"))
+        
+        # group rows by bird id with a single stable sort
+        bird_codes, chunk_bird_ids = pd.factorize(df_chunk["bird_id"])
+        order = np.argsort(bird_codes, kind="stable")
+        order = order[bird_codes[order] >= 0]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(bird_codes[bird_codes >= 0], minlength=len(chunk_bird_ids)))])
+        df_chunk = df_chunk.take(order)
+        
+        # append rows to those of previous chunks
+        for (k, bird_id) in enumerate(chunk_bird_ids):
+            bird_chunks.setdefault(bird_id, []).append(df_chunk.iloc[offsets[k]:offsets[k+1]])
+    
+    # extract dataframe of every bird id
+    bird_ids = list(bird_chunks.keys())
+    dfs = [pd.concat(bird_chunks.pop(bird_id), ignore_index=True) for bird_id in bird_ids]
+    
+    return(bird_ids, dfs)
+
+
 # ================================================================================================ #
 # CONVERT A SEABIRD TRACKING DATABASE FILE TO GPS_COLLECTION
 # ================================================================================================ #
-def convert_to_gps_collection(df_stdb, group, params):
+def convert_to_gps_collection(df_stdb, group, params, workers=1, chunk_size=1000000):
     
     """    
     Construct a GPS_Collection object from a Seabird Tracking Database dataframe.
     
-    :param self: a dataframe at the Seabird Tracking Database format.
-    :type self: pandas.DataFrame
+    :param df_stdb: a dataframe at the Seabird Tracking Database format, or the path of a Seabird Tracking Database csv file.
+    :type df_stdb: pandas.DataFrame | str
+    :param group: the group of every GPS.
+    :type group: str
     :param params: the parameters dictionary.
     :type params: dict
-    :return: the GPS_Collection object
-    :rtype: cpforager.GPS_Collection
+    :param workers: number of worker processes building the GPS objects, every available core if None. GPS are built serially in the current process by default.
+    :type workers: int
+    :param chunk_size: number of rows read at once if ``df_stdb`` is a file path.
+    :type chunk_size: int
+    :return: the list of GPS and the metadata dataframe.
+    :rtype: (list[cpforager.GPS], pandas.DataFrame)
     
+    Datetimes are parsed once over the whole dataframe (see ``parse_stdb_datetimes``), and rows are grouped by ``bird_id`` with a 
+    single stable sort, so that the dataframe is scanned once whatever the number of birds. A file is read and grouped chunk by chunk 
+    without being concatenated (see ``split_stdb_by_bird``). GPS are ordered by first appearance of their ``bird_id``. 
     See `STDB <https://www.seabirdtracking.org/>`_ for more details about the format.
+    
+    .. warning::
+        With several workers, on platforms starting processes with ``spawn`` (Windows, macOS), the calling script must be protected by ``if __name__ == "__main__":``.
     """
     
-    # get unique identifier
-    bird_ids = df_stdb["bird_id"].unique()
+    # read file chunk by chunk or parse datetimes of the dataframe
+    if isinstance(df_stdb, str):
+        df_chunks = read_stdb_chunks(df_stdb, chunk_size)
+    else:
+        df_stdb = df_stdb.copy()
+        df_stdb["datetime"] = parse_stdb_datetimes(df_stdb["date_gmt"], df_stdb["time_gmt"])
+        df_chunks = [df_stdb]
     
-    # initialize the metadata dataframe
-    metadata = pd.DataFrame(columns=["bird_id", "sex", "age", "breed_stage"])
-    metadata["bird_id"] = bird_ids
+    # extract dataframe of every bird id
+    bird_ids, dfs = split_stdb_by_bird(df_chunks, params)
     
-    # initialize the gps collection
-    gps_collection = []
+    # set number of workers
+    if workers is None:
+        workers = os.cpu_count()
+    workers = max(1, min(workers, len(dfs)))
     
-    # loop over bird ids
-    for k in range(len(metadata)):
-        
-        # set bird id
-        bird_id = metadata.loc[k, "bird_id"]
-        
-        # extract dataframe of given bird id
-        df = df_stdb.loc[df_stdb["bird_id"]==bird_id].reset_index(drop=True)
-        
-        # produce "datetime" column of type datetime64
-        df["datetime"] = pd.to_datetime(df["date_gmt"] + " " + df["time_gmt"], format="%d/%m/%Y %H:%M:%S")
-        df = utils.convert_utc_to_loc(df, params.get("local_tz"))
-        
-        # construct GPS object
-        gps = GPS(df, group, bird_id, params)
-        
-        # append gps to collection 
-        gps_collection.append(gps)
-        
-        # complete metadata dataframe
+    # construct GPS objects serially or in a process pool
+    if workers == 1:
+        gps_collection = [GPS(df, group, bird_id, params) for (df, bird_id) in zip(dfs, bird_ids)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(GPS, df, group, bird_id, params) for (df, bird_id) in zip(dfs, bird_ids)]
+            gps_collection = [future.result() for future in futures]
+    
+    # build metadata dataframe
+    metadata = pd.DataFrame(columns=["bird_id", "sex", "age", "breed_stage"])
+    metadata["bird_id"] = bird_ids
+    for (k, df) in enumerate(dfs):
         metadata.loc[k, "sex"] = df["sex"].unique()
         metadata.loc[k, "age"] = df["age"].unique()
         metadata.loc[k, "breed_stage"] = df["breed_stage"].unique()
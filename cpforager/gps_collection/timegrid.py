@@ -0,0 +1,44 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import alignment
+
+
+# ======================================================= #
+# GPS_COLLECTION ALIGNMENT [GPS_COLLECTION METHOD]
+# ======================================================= #
+def align(self, period, columns_methods, reference="absolute", start=None, end=None, chunk_size=None, max_gap=None):
+    
+    """
+    Align every GPS of the collection on a common regular time grid.
+        
+    :param self: a GPS_Collection object
+    :type self: cpforager.GPS_Collection
+    :param period: period of the grid in seconds.
+    :type period: float
+    :param columns_methods: dictionary giving for each column to align the method to apply, ``"linear"`` or ``"nearest"``, *e.g.* ``{"longitude":"linear", "trip":"nearest"}``.
+    :type columns_methods: dict
+    :param reference: ``"absolute"`` to align every GPS on datetimes, or ``"trip"`` to align every trip on the time elapsed since its departure.
+    :type reference: str
+    :param start: first datetime of the grid for ``"absolute"`` reference, by default the earliest datetime of the collection.
+    :type start: datetime.datetime | pandas.Timestamp | str
+    :param end: last datetime of the grid for ``"absolute"`` reference, by default the latest datetime of the collection.
+    :type end: datetime.datetime | pandas.Timestamp | str
+    :param chunk_size: number of grid times interpolated at once, every grid time at once if None.
+    :type chunk_size: int
+    :param max_gap: maximum duration in seconds between the measures surrounding an interpolated time, no maximum if None.
+    :type max_gap: float
+    :return: the aligned dictionary.
+    :rtype: dict
+    
+    See ``alignment.align_members`` for the grid, the individuals and the exhaustive table of the aligned dictionary keys.
+    """
+    
+    # get attributes
+    members = self.gps_collection
+    gps_collection = self
+    
+    # align members
+    aligned = alignment.align_members(members, gps_collection, period, columns_methods, "df", reference, start, end, chunk_size, max_gap)
+    
+    return(aligned)
@@ -2,7 +2,7 @@
 # LIBRARIES
 # ======================================================= #
 import os
-from cpforager import diagnostic
+from cpforager import diagnostic, figcache
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
 
@@ -23,7 +23,7 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     :type file_id: str
     :param plot_params: plot parameters dictionary. 
     :type plot_params: dict
-    :return: the full diagnostic figure.
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     
     The figure is save at the png format. 
@@ -55,6 +55,10 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     mean_temperature = self.tdr.mean_temperature
     dive_statistics = self.tdr.dive_statistics
 
+    # skip rendering if the figure is up-to-date
+    fig_key = figcache.get_figure_key("full_diag", [self.df, df_gps, df_tdr, group, id, params], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "full_diag", fig_key, plot_params): return(None)
+
     # get parameters
     cols_1 = plot_params.get("cols_1")
     cols_2 = plot_params.get("cols_2")
@@ -109,9 +113,8 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     
     # global trajectory with a time color gradient
     ax = fig.add_subplot(gs[0,3], projection=ccrs.PlateCarree())
-    df_gps["duration"] = (df_gps["datetime"]-df_gps["datetime"].min()).dt.total_seconds()/3600
-    diagnostic.plot_map_colorgrad(ax, df_gps, params, plot_params, "duration", cols_3, nest_lon, nest_lat, "Trajectory [duration color gradient]", 1.0, 0)
-    del df_gps["duration"]
+    df_duration = df_gps.assign(duration=(df_gps["datetime"]-df_gps["datetime"].min()).dt.total_seconds()/3600)
+    diagnostic.plot_map_colorgrad(ax, df_duration, params, plot_params, "duration", cols_3, nest_lon, nest_lat, "Trajectory [duration color gradient]", 1.0, 0)
     
     # trajectory with dives emphasized
     ax = fig.add_subplot(gs[0,4], projection=ccrs.PlateCarree())
@@ -156,9 +159,8 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     # heading polar plot
     ax = fig.add_subplot(gs[2,4], projection="polar")
     if(n_trips>0):
-        df_gps["step_heading_to_colony_trip"] = df_gps.loc[df_gps["trip"]>0, "step_heading_to_colony"]
-        diagnostic.plot_angle_polar(ax, df_gps, plot_params, "step_heading_to_colony_trip", "Step heading to colony", "Angle [°]")
-        del df_gps["step_heading_to_colony_trip"]
+        df_trip = df_gps.assign(step_heading_to_colony_trip=df_gps["step_heading_to_colony"].where(df_gps["trip"]>0))
+        diagnostic.plot_angle_polar(ax, df_trip, plot_params, "step_heading_to_colony_trip", "Step heading to colony", "Angle [°]")
     else:
         diagnostic.plot_angle_polar(ax, df_gps, plot_params, "step_heading_to_colony", "Step heading to colony", "Angle [°]")
     
@@ -184,7 +186,8 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "full_diag", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
@@ -207,7 +210,7 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params):
     :type file_id: str
     :param plot_params: plot parameters dictionary. 
     :type plot_params: dict
-    :return: the full diagnostic figure.
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     
     The figure is saved at the png format.
@@ -223,6 +226,10 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params):
     df_gps = self.df_gps
     params = self.params
     
+    # skip rendering if the figure is up-to-date
+    fig_key = figcache.get_figure_key("maps_diag", [df_gps, params], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "maps_diag", fig_key, plot_params): return(None)
+    
     # get infos
     n_trips = gps.n_trips
     [nest_lon, nest_lat] = gps.nest_position
@@ -254,9 +261,8 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params):
     
     # global trajectory with a time color gradient
     ax = fig.add_subplot(gs[1,1], projection=ccrs.PlateCarree())
-    df_gps["duration"] = (df_gps["datetime"]-df_gps["datetime"].min()).dt.total_seconds()/3600
-    diagnostic.plot_map_colorgrad(ax, df_gps, params, plot_params, "duration", cols_3, nest_lon, nest_lat, "Trajectory [duration color gradient]", 1.0, 0)
-    del df_gps["duration"]
+    df_duration = df_gps.assign(duration=(df_gps["datetime"]-df_gps["datetime"].min()).dt.total_seconds()/3600)
+    diagnostic.plot_map_colorgrad(ax, df_duration, params, plot_params, "duration", cols_3, nest_lon, nest_lat, "Trajectory [duration color gradient]", 1.0, 0)
 
     # global trajectory with a depth color gradient
     ax = fig.add_subplot(gs[1,2], projection=ccrs.PlateCarree())
@@ -264,7 +270,8 @@ def maps_diagnostic(self, fig_dir, file_id, plot_params):
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "maps_diag", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
@@ -290,10 +297,7 @@ def folium_map(self, fig_dir, file_id, plot_params):
     :return: the folium map.
     :rtype: folium.Map
     
-    The figure is saved at the html format.
-    
-    .. warning::
-        Producing the figure may take some time and the resulting html may be heavy.
+    The figure is saved at the html format. Colored points are rendered as one compact GeoJSON layer by variable.
     """
     
     # get attributes
@@ -302,15 +306,18 @@ def folium_map(self, fig_dir, file_id, plot_params):
     id = self.id
     nest_position = self.gps.nest_position
     
+    # get parameters
+    simplify_tol = plot_params.get("simplify_tol")
+    
     # define color palettes
     discrete_color_palettes = {"trip":plot_params.get("cols_1"), "n_dives":plot_params.get("cols_1")}
     continuous_color_palettes = {"step_speed":plot_params.get("cols_2"), "duration":plot_params.get("cols_2"), 
                                  "pressure":plot_params.get("cols_2")}
 
     # produce beautiful map
-    df_gps["duration"] = (df_gps["datetime"]-df_gps["datetime"].min()).dt.total_seconds()/3600
-    fmap = diagnostic.plot_folium_map_multiple_colorgrad(df_gps, params, id, nest_position, discrete_color_palettes, continuous_color_palettes, 0.99)
-    del df_gps["duration"]
+    df_map = df_gps.assign(duration=(df_gps["datetime"]-df_gps["datetime"].min()).dt.total_seconds()/3600)
+    df_map = df_map.loc[self.simplify_mask(simplify_tol)] if simplify_tol is not None else df_map
+    fmap = diagnostic.plot_folium_map_multiple_colorgrad(df_map, params, id, nest_position, discrete_color_palettes, continuous_color_palettes, 0.99)
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.html" % file_id)
@@ -4,7 +4,7 @@
 from cpforager.gps.gps import GPS
 from cpforager.tdr.tdr import TDR
 from cpforager import processing
-from cpforager.gps_tdr import display, diagnostic, interpolation
+from cpforager.gps_tdr import display, diagnostic, interpolation, slicing, resolution, sensors, timegrid, tracks
 
 
 # ======================================================= #
@@ -31,7 +31,7 @@ class GPS_TDR:
         :param params: the parameters dictionary.
         :type params: dict
         
-        :ivar df: the dataframe containing the merged GPS and TDR data.
+        :ivar df: the dataframe containing the merged GPS and TDR data, processed GPS and TDR data being stored at their native rates in ``df_gps`` and ``df_tdr``.
         :vartype df: pandas.DataFrame
         :ivar group: The string representing the group to which the AXY data belongs (*e.g.* species, year, fieldwork, *etc*.) useful for statistics and filtering.
         :vartype group: str
@@ -43,12 +43,16 @@ class GPS_TDR:
         :vartype n_df: int
         :ivar gps: the GPS data of GPS_TDR at GPS resolution.
         :vartype gps: cpforager.GPS
-        :ivar df_gps: the dataframe containing the GPS data.
+        :ivar df_gps: the dataframe containing the GPS data, which is the dataframe of ``gps``.
         :vartype df_gps: pandas.DataFrame
         :ivar tdr: the TDR data of GPS_TDR at TDR resolution.
         :vartype tdr: cpforager.TDR
-        :ivar df_tdr: the dataframe containing the TDR data.
+        :ivar df_tdr: the dataframe containing the TDR data, which is the dataframe of ``tdr``.
         :vartype df_tdr: pandas.DataFrame
+        :ivar gps_indices: the row positions in ``df`` of the ``df_gps`` measures.
+        :vartype gps_indices: numpy.ndarray
+        :ivar tdr_indices: the row positions in ``df`` of the ``df_tdr`` measures.
+        :vartype tdr_indices: numpy.ndarray
         :ivar start_datetime:  the starting datetime of the merged GPS and TDR recording.
         :vartype start_datetime: datetime.datetime
         :ivar end_datetime: the ending datetime of the merged GPS and TDR recording.
@@ -60,13 +64,13 @@ class GPS_TDR:
         """
         
         # process data
-        df, df_gps, df_tdr = processing.add_gps_tdr_data(df, params)
+        df, df_gps, df_tdr, gps_indices, tdr_indices = processing.add_gps_tdr_data(df, params)
         
-        # build GPS object
-        gps = GPS(df_gps, group, id, params)
+        # build GPS object from already processed data
+        gps = GPS(df_gps, group, id, params, processed=True)
         
-        # build TDR object
-        tdr = TDR(df_tdr, group, id, params)
+        # build TDR object from already processed data
+        tdr = TDR(df_tdr, group, id, params, processed=True)
 
         # compute additional information
         basic_infos = processing.compute_basic_infos(df)
@@ -85,6 +89,8 @@ class GPS_TDR:
         self.df_gps = df_gps
         self.tdr = tdr
         self.df_tdr = df_tdr
+        self.gps_indices = gps_indices
+        self.tdr_indices = tdr_indices
 
     # [BUILT-IN METHODS] length of the class
     def __len__(self):
@@ -98,9 +104,28 @@ class GPS_TDR:
     def __repr__(self):
         return "%s(group=%s, id=%s, trips=%d, dives=%d, n=%d, n_gps=%d, n_tdr=%d)" % (type(self).__name__, self.group, self.id, self.gps.n_trips, self.tdr.n_dives, self.n_df, self.gps.n_df, self.tdr.n_df)
 
+    # [METHODS] build from separate GPS and TDR data
+    from_sensors = classmethod(sensors.from_sensors)
+
     # [METHODS] interpolate data
     interpolate_lat_lon = interpolation.interpolate_lat_lon
 
+    # [METHODS] extract time windows
+    window = slicing.window
+    windows = slicing.windows
+
+    # [METHODS] resample data on a regular time grid
+    resample = timegrid.resample
+
+    # [METHODS] simplify trajectories
+    simplify_mask = tracks.simplify_mask
+
+    # [METHODS] export trips as lines
+    export_trips = tracks.export_trips
+
+    # [METHODS] produce full resolution data
+    full_resolution = resolution.full_resolution
+
     # [METHODS] display the summary of the data
     display_data_summary = display.display_data_summary
 
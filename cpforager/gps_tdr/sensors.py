@@ -0,0 +1,46 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import utils
+
+
+# ======================================================= #
+# GPS_TDR FROM SENSORS [GPS_TDR CLASS METHOD]
+# ======================================================= #
+def from_sensors(cls, df_gps, df_tdr, group, id, params):
+
+    """
+    Build a GPS_TDR object from the separate dataframes of the GPS and TDR loggers.
+
+    :param cls: the GPS_TDR class.
+    :type cls: type
+    :param df_gps: the dataframe containing ``date``, ``time``, ``datetime``, ``longitude`` and ``latitude`` columns. Type of ``datetime`` column must be datetime64.
+    :type df_gps: pandas.DataFrame
+    :param df_tdr: the dataframe containing ``date``, ``time``, ``datetime``, ``pressure`` and ``temperature`` columns. Type of ``datetime`` column must be datetime64.
+    :type df_tdr: pandas.DataFrame
+    :param group: the string representing the group to which the GPS_TDR data belongs (*e.g.* species, year, fieldwork, *etc*.) useful for statistics and filtering.
+    :type group: str
+    :param id: the string representing the unique identifier of the central-place foraging seabird.
+    :type id: str
+    :param params: the parameters dictionary.
+    :type params: dict
+    :return: the GPS_TDR object.
+    :rtype: cpforager.GPS_TDR
+
+    GPS and TDR measures are merged on datetime by ``utils.merge_sorted_dataframes`` into the multi-rate dataframe expected by the GPS_TDR
+    constructor, with NaN where a sensor has no measure. Contrary to ``pandas.merge_ordered``, duplicated datetimes never multiply rows and
+    ``date`` and ``time`` columns are filled at every row. Datetimes of both dataframes must share the same timezone.
+    """
+
+    # keep sensor columns
+    df_gps = df_gps[[c for c in ["date", "time", "datetime", "longitude", "latitude"] if c in df_gps.columns]]
+    df_tdr = df_tdr[[c for c in ["date", "time", "datetime", "pressure", "temperature"] if c in df_tdr.columns]]
+
+    # merge sensors on datetime
+    df = utils.merge_sorted_dataframes([df_gps, df_tdr])
+    df = df[["date", "time", "datetime", "longitude", "latitude", "pressure", "temperature"]]
+
+    # build GPS_TDR object
+    gps_tdr = cls(df, group, id, params)
+
+    return(gps_tdr)
@@ -6,7 +6,7 @@
 # ======================================================= #
 # TRIP STATS SUMMARY [GPS_TDR_COLLECTION METHOD]
 # ======================================================= #
-def plot_trip_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.50, 0.75, 0.90]):
+def plot_trip_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.50, 0.75, 0.90], from_sketches=False):
     
     """    
     Produce the trip statistics summary of every GPS_TDR data.
@@ -21,6 +21,8 @@ def plot_trip_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25
     :type plot_params: dict
     :param quantiles: quantiles to emphasize. 
     :type quantiles: list[float]
+    :param from_sketches: plot from the quantile sketches merged over the collection if True. 
+    :type from_sketches: bool
     :return: the full diagnostic figure.
     :rtype: matplotlib.pyplot.Figure 
     
@@ -31,7 +33,7 @@ def plot_trip_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25
     gps_collection = self.gps_collection
     
     # plot using GPS_Collection method
-    fig = gps_collection.plot_stats_summary(fig_dir, file_id, plot_params, quantiles)
+    fig = gps_collection.plot_stats_summary(fig_dir, file_id, plot_params, quantiles, from_sketches)
     
     return(fig)
 
@@ -39,7 +41,7 @@ def plot_trip_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25
 # ======================================================= #
 # DIVE STATS SUMMARY [GPS_TDR_COLLECTION METHOD]
 # ======================================================= #
-def plot_dive_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.50, 0.75, 0.90]):
+def plot_dive_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.50, 0.75, 0.90], from_sketches=False):
     
     """    
     Produce the dive statistics summary of every GPS_TDR data.
@@ -54,6 +56,8 @@ def plot_dive_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25
     :type plot_params: dict
     :param quantiles: quantiles to emphasize. 
     :type quantiles: list[float]
+    :param from_sketches: plot from the quantile sketches merged over the collection if True. 
+    :type from_sketches: bool
     :return: the full diagnostic figure.
     :rtype: matplotlib.pyplot.Figure 
     
@@ -64,7 +68,7 @@ def plot_dive_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25
     tdr_collection = self.tdr_collection
     
     # plot using TDR_Collection method
-    fig = tdr_collection.plot_stats_summary(fig_dir, file_id, plot_params, quantiles)
+    fig = tdr_collection.plot_stats_summary(fig_dir, file_id, plot_params, quantiles, from_sketches)
     
     return(fig)
 
@@ -167,7 +171,7 @@ def indiv_depth_all(self, fig_dir, file_id, plot_params):
 # ======================================================= #
 # GPS_TDR FOLIUM MAPS [GPS_TDR_COLLECTION METHOD]
 # ======================================================= #
-def folium_map(self, fig_dir, file_id, plot_params, rand=False):
+def folium_map(self, fig_dir, file_id, plot_params, rand=False, density=False, time_weighted=False, cell_size=0.01, n_levels=4):
     
     """    
     Produce the html map with every GPS_TDR data colored randomly.
@@ -182,16 +186,24 @@ def folium_map(self, fig_dir, file_id, plot_params, rand=False):
     :type plot_params: dict
     :param rand: True if colors should be random. 
     :type rand: bool
+    :param density: True if positions should be aggregated into density layers instead of drawing every trajectory. 
+    :type density: bool
+    :param time_weighted: True if the density should be weighted by step time to get the time spent at location in hours. 
+    :type time_weighted: bool
+    :param cell_size: size in degrees of the cells of the finest density layer. 
+    :type cell_size: float
+    :param n_levels: number of density layers, the cell size being doubled from one layer to the next. 
+    :type n_levels: int
     :return: the folium map.
     :rtype: folium.Map
     
-    The figure is save at the html format.
+    The figure is save at the html format. See ``GPS_Collection.folium_map`` for the density layers.
     """
     
     # get attributes
     gps_collection = self.gps_collection
    
     # plot using GPS_Collection method
-    fmap = gps_collection.folium_map(fig_dir, file_id, plot_params, rand)
+    fmap = gps_collection.folium_map(fig_dir, file_id, plot_params, rand, density, time_weighted, cell_size, n_levels)
 
     return(fmap)
\ No newline at end of file
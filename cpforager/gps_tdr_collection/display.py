@@ -7,13 +7,17 @@ import numpy as np
 # ======================================================= #
 # DISPLAY [GPS_TDR_COLLECTION METHODS]
 # ======================================================= #
-def display_data_summary(self, standalone=True):
+def display_data_summary(self, standalone=True, streaming=False):
     
     """    
     Print in terminal the GPS_TDR_Collection data summary.
     
     :param self: a GPS_TDR_Collection object
     :type self: cpforager.GPS_TDR_Collection
+    :param standalone: display information standalone if True.
+    :type standalone: bool
+    :param streaming: compute the collection statistics from streaming accumulators fed logger by logger if True (see ``GPS_Collection.display_data_summary``).
+    :type streaming: bool
     """
 
     # get attributes
@@ -38,8 +42,8 @@ def display_data_summary(self, standalone=True):
         print("# + Nb of GPS_TDR = %d" % self.n_gps_tdr)
         print("# + Nb of trips   = %d" % self.n_trips)
         print("# + Groups        = %s" % groups_str)
-    gps_collection.display_data_summary(standalone=False)
-    tdr_collection.display_data_summary(standalone=False)
+    gps_collection.display_data_summary(standalone=False, streaming=streaming)
+    tdr_collection.display_data_summary(standalone=False, streaming=streaming)
     if standalone:
         print("# ===================================================================== #")
     
\ No newline at end of file
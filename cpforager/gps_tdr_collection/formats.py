@@ -0,0 +1,29 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import movebank
+
+
+# ======================================================= #
+# GPS_TDR_COLLECTION TO MOVEBANK [GPS_TDR_COLLECTION METHOD]
+# ======================================================= #
+def to_Movebank(self, file_path, chunk_size=1000000):
+    
+    """
+    Write the data of every GPS_TDR of the collection in a Movebank csv file chunk by chunk.
+        
+    :param self: a GPS_TDR_Collection object
+    :type self: cpforager.GPS_TDR_Collection
+    :param file_path: path of the Movebank csv file.
+    :type file_path: str
+    :param chunk_size: maximum number of rows written at once.
+    :type chunk_size: int
+    
+    See ``movebank.write_movebank`` for the written rows and columns.
+    """
+    
+    # get attributes
+    members = self.gps_tdr_collection
+    
+    # write movebank file
+    movebank.write_movebank(members, file_path, chunk_size)
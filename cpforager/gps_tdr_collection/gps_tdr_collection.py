@@ -3,7 +3,8 @@
 # ================================================================================================ #
 import pandas as pd
 import numpy as np
-from cpforager.gps_tdr_collection import diagnostic, display
+from cpforager import rendering
+from cpforager.gps_tdr_collection import diagnostic, display, sensors, timegrid, tracks, formats
 from cpforager.gps_collection.gps_collection import GPS_Collection
 from cpforager.tdr_collection.tdr_collection import TDR_Collection
 
@@ -52,6 +53,11 @@ class GPS_TDR_Collection:
         # build GPS_Collection and TDR_Collection objects
         gps_collection = GPS_Collection(gps_collection)
         tdr_collection = TDR_Collection(tdr_collection)
+        
+        # share the rebuilt GPS and TDR dataframes
+        for gps_tdr in gps_tdr_collection:
+            gps_tdr.df_gps = gps_tdr.gps.df
+            gps_tdr.df_tdr = gps_tdr.tdr.df
 
         # set attributes
         self.gps_tdr_collection = gps_tdr_collection
@@ -75,13 +81,31 @@ class GPS_TDR_Collection:
     def __repr__(self):
         return "%s(%d GPS_TDR, %d trips, %d dives)" % (type(self).__name__, self.n_gps_tdr, self.n_trips, self.n_dives)
 
+    # [METHODS] build from separate GPS and TDR data paired by bird id
+    from_sensors = classmethod(sensors.from_sensors)
+
     # [METHODS] display the summary of the data
     display_data_summary = display.display_data_summary
 
+    # [METHODS] align members on a common time grid
+    align = timegrid.align
+
+    # [METHODS] simplify trajectories
+    simplify_mask = tracks.simplify_mask
+
+    # [METHODS] export trips as lines
+    export_trips = tracks.export_trips
+
     # [METHODS] plot data
     plot_trip_stats_summary = diagnostic.plot_trip_stats_summary
     plot_dive_stats_summary = diagnostic.plot_dive_stats_summary
     maps_diag = diagnostic.maps_diagnostic
     indiv_map_all = diagnostic.indiv_map_all
     indiv_depth_all = diagnostic.indiv_depth_all
-    folium_map = diagnostic.folium_map
\ No newline at end of file
+    folium_map = diagnostic.folium_map
+
+    # [METHODS] render diagnostics of every member in parallel
+    render_all = rendering.render_all
+    
+    # [METHODS] Movebank formatting
+    to_Movebank = formats.to_Movebank
\ No newline at end of file
@@ -0,0 +1,47 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager.gps_tdr.gps_tdr import GPS_TDR
+
+
+# ======================================================= #
+# GPS_TDR_COLLECTION FROM SENSORS [GPS_TDR_Collection CLASS METHOD]
+# ======================================================= #
+def from_sensors(cls, dfs_gps, dfs_tdr, group, params, params_by_id=None):
+
+    """
+    Build a GPS_TDR_Collection object by pairing the separate dataframes of the GPS and TDR loggers by bird id.
+
+    :param cls: the GPS_TDR_Collection class.
+    :type cls: type
+    :param dfs_gps: the dictionary of GPS dataframes where keys are the bird ids (see ``GPS_TDR.from_sensors``).
+    :type dfs_gps: dict
+    :param dfs_tdr: the dictionary of TDR dataframes where keys are the bird ids (see ``GPS_TDR.from_sensors``).
+    :type dfs_tdr: dict
+    :param group: the string representing the group to which the data belongs (*e.g.* species, year, fieldwork, *etc*.) useful for statistics and filtering.
+    :type group: str
+    :param params: the parameters dictionary.
+    :type params: dict
+    :param params_by_id: the dictionary of parameters dictionaries used instead of ``params`` for some bird ids, *e.g.* species-specific dive parameters.
+    :type params_by_id: dict
+    :return: the GPS_TDR_Collection object.
+    :rtype: cpforager.GPS_TDR_Collection
+
+    Every bird id found in both dictionaries gives a GPS_TDR built with ``GPS_TDR.from_sensors``, in the order of ``dfs_gps``. Bird ids
+    with a single sensor are reported and ignored.
+    """
+
+    # pair sensors by bird id
+    bird_ids = [bird_id for bird_id in dfs_gps if bird_id in dfs_tdr]
+    unpaired_ids = [bird_id for bird_id in list(dfs_gps)+list(dfs_tdr) if bird_id not in bird_ids]
+    if len(unpaired_ids) > 0:
+        print("WARNING : bird ids %s have a single sensor and are ignored" % (", ".join([str(bird_id) for bird_id in unpaired_ids])))
+
+    # build GPS_TDR of every bird
+    params_by_id = {} if params_by_id is None else params_by_id
+    gps_tdr_collection = [GPS_TDR.from_sensors(dfs_gps[bird_id], dfs_tdr[bird_id], group, bird_id, params_by_id.get(bird_id, params)) for bird_id in bird_ids]
+
+    # build GPS_TDR_Collection object
+    gps_tdr_collection = cls(gps_tdr_collection)
+
+    return(gps_tdr_collection)
@@ -0,0 +1,64 @@
+# ======================================================= #
+# LIBRARIES
+# ======================================================= #
+from cpforager import simplification, geoexport
+
+
+# ======================================================= #
+# GPS_TDR_COLLECTION TRACK SIMPLIFICATION [GPS_TDR_COLLECTION METHOD]
+# ======================================================= #
+def simplify_mask(self, tolerance, algorithm="douglas_peucker", projection="colony"):
+    
+    """
+    Compute the mask of the GPS positions kept by the simplification of every trip of the collection.
+        
+    :param self: a GPS_TDR_Collection object
+    :type self: cpforager.GPS_TDR_Collection
+    :param tolerance: tolerance in metres of the simplification.
+    :type tolerance: float
+    :param algorithm: ``"douglas_peucker"`` or ``"visvalingam"``.
+    :type algorithm: str
+    :param projection: ``"colony"`` for the projection centred on the nest position of every GPS or ``"geodesic"``.
+    :type projection: str
+    :return: the mask of the kept rows of ``df_all`` of the GPS collection, the rows of GPS k being between ``offsets[k]`` and ``offsets[k+1]``.
+    :rtype: numpy.ndarray(bool)
+    
+    Every trip of every GPS is simplified in a single vectorized pass over the columnar store of the GPS collection.
+    """
+    
+    # get attributes
+    gps_collection = self.gps_collection
+    
+    # compute mask
+    mask = simplification.get_gps_collection_simplified_mask(gps_collection, tolerance, algorithm, projection)
+    
+    return(mask)
+
+
+# ======================================================= #
+# GPS_TDR_COLLECTION TRACK EXPORT [GPS_TDR_COLLECTION METHOD]
+# ======================================================= #
+def export_trips(self, file_path, tolerance=None):
+    
+    """
+    Export the trips of the collection as LineStrings carrying the trip statistics to a GeoJSON or GeoParquet file.
+        
+    :param self: a GPS_TDR_Collection object
+    :type self: cpforager.GPS_TDR_Collection
+    :param file_path: path of the ``.geojson``, ``.json`` or ``.parquet`` file.
+    :type file_path: str
+    :param tolerance: tolerance in metres of the Douglas-Peucker simplification of the lines (see ``simplify_mask``), lines are not simplified if None.
+    :type tolerance: float
+    :return: the dataframe of trip attributes, one row per exported trip.
+    :rtype: pandas.DataFrame
+    
+    Lines are built in a single pass over the columnar store of the GPS collection, see ``geoexport.build_trip_lines`` for the exported attributes.
+    """
+    
+    # get attributes
+    gps_collection = self.gps_collection
+    
+    # build and write trip lines
+    df_attributes = geoexport.export_gps_collection_trips(gps_collection, file_path, tolerance)
+    
+    return(df_attributes)
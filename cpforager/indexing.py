@@ -0,0 +1,313 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import numpy as np
+import matplotlib.path as mpath
+from cpforager import utils
+
+
+# ================================================================================================ #
+# BUILD GRID INDEX
+# ================================================================================================ #
+def build_grid_index(longitude, latitude, cell_size=0.01):
+
+    """
+    Build a uniform grid spatial index over longitude/latitude positions.
+
+    :param longitude: array of longitudes in degrees.
+    :type longitude: numpy.ndarray
+    :param latitude: array of latitudes in degrees.
+    :type latitude: numpy.ndarray
+    :param cell_size: size in degrees of the square grid cells.
+    :type cell_size: float
+    :return: the grid index dictionary.
+    :rtype: dict
+
+    Positions are bucketed into square cells of the regular grid. Rows are sorted by cell so that the rows of a given cell are contiguous,
+    and the index stores, in a compressed sparse row fashion, the sorted keys of non-empty cells together with the offsets of their rows.
+    Positions with NaN longitude or latitude are not indexed. Find below the exhaustive table of the grid index keys.
+
+    .. csv-table::
+        :header: "name", "description"
+        :widths: auto
+
+        ``cell_size``, "size in degrees of the grid cells"
+        ``lon_0``, "longitude of the lower-left corner of the grid"
+        ``lat_0``, "latitude of the lower-left corner of the grid"
+        ``n_lon``, "number of grid cells along longitude"
+        ``n_lat``, "number of grid cells along latitude"
+        ``cell_keys``, "sorted keys ``i_lon*n_lat+i_lat`` of non-empty cells"
+        ``cell_offsets``, "position in ``rows`` of the first row of every non-empty cell, plus the number of indexed rows"
+        ``rows``, "row positions sorted by cell"
+        ``longitude``, "longitudes sorted by cell"
+        ``latitude``, "latitudes sorted by cell"
+    """
+
+    # get positions as float arrays
+    longitude = np.asarray(longitude, dtype=float)
+    latitude = np.asarray(latitude, dtype=float)
+
+    # keep valid positions only
+    rows = np.flatnonzero(np.isfinite(longitude) & np.isfinite(latitude))
+
+    # define grid extent
+    if len(rows) > 0:
+        lon_0 = np.floor(longitude[rows].min()/cell_size)*cell_size
+        lat_0 = np.floor(latitude[rows].min()/cell_size)*cell_size
+        n_lon = int((longitude[rows].max()-lon_0)//cell_size)+1
+        n_lat = int((latitude[rows].max()-lat_0)//cell_size)+1
+    else:
+        lon_0, lat_0, n_lon, n_lat = 0.0, 0.0, 0, 0
+
+    # compute cell keys of every position
+    i_lon = np.clip(((longitude[rows]-lon_0)//cell_size).astype(np.int64), 0, max(n_lon-1, 0))
+    i_lat = np.clip(((latitude[rows]-lat_0)//cell_size).astype(np.int64), 0, max(n_lat-1, 0))
+    keys = i_lon*n_lat + i_lat
+
+    # sort rows by cell
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    rows = rows[order]
+
+    # compress cells
+    cell_keys, cell_starts = np.unique(keys, return_index=True)
+    cell_offsets = np.append(cell_starts, len(keys)).astype(np.int64)
+
+    # build grid index dictionary
+    grid_index = {"cell_size":cell_size, "lon_0":lon_0, "lat_0":lat_0, "n_lon":n_lon, "n_lat":n_lat,
+                  "cell_keys":cell_keys, "cell_offsets":cell_offsets, "rows":rows,
+                  "longitude":longitude[rows], "latitude":latitude[rows]}
+
+    return(grid_index)
+
+
+# ================================================================================================ #
+# GRID INDEX CANDIDATES
+# ================================================================================================ #
+def get_bbox_candidates(grid_index, lon_min, lon_max, lat_min, lat_max):
+
+    """
+    Find the positions of the sorted rows belonging to the grid cells intersecting a bounding box.
+
+    :param grid_index: the grid index dictionary.
+    :type grid_index: dict
+    :param lon_min: minimum longitude of the bounding box.
+    :type lon_min: float
+    :param lon_max: maximum longitude of the bounding box.
+    :type lon_max: float
+    :param lat_min: minimum latitude of the bounding box.
+    :type lat_min: float
+    :param lat_max: maximum latitude of the bounding box.
+    :type lat_max: float
+    :return: the positions in ``grid_index["rows"]`` of the candidate rows.
+    :rtype: numpy.ndarray
+
+    Only non-empty cells are visited, either by looking up the keys of the cells covered by the bounding box when they are few,
+    or by filtering the non-empty cell keys otherwise. Candidates still have to be filtered by their exact position.
+    """
+
+    # get attributes
+    cell_size = grid_index["cell_size"]
+    n_lon = grid_index["n_lon"]
+    n_lat = grid_index["n_lat"]
+    cell_keys = grid_index["cell_keys"]
+    cell_offsets = grid_index["cell_offsets"]
+
+    # compute range of cells covered by the bounding box
+    i_lon_0 = max(int((lon_min-grid_index["lon_0"])//cell_size), 0)
+    i_lon_1 = min(int((lon_max-grid_index["lon_0"])//cell_size), n_lon-1)
+    i_lat_0 = max(int((lat_min-grid_index["lat_0"])//cell_size), 0)
+    i_lat_1 = min(int((lat_max-grid_index["lat_0"])//cell_size), n_lat-1)
+
+    # empty intersection with the grid
+    if (i_lon_0 > i_lon_1) or (i_lat_0 > i_lat_1):
+        return(np.array([], dtype=np.int64))
+
+    # find non-empty cells intersecting the bounding box
+    n_cells = (i_lon_1-i_lon_0+1)*(i_lat_1-i_lat_0+1)
+    if n_cells < len(cell_keys):
+        keys = np.add.outer(np.arange(i_lon_0, i_lon_1+1, dtype=np.int64)*n_lat, np.arange(i_lat_0, i_lat_1+1, dtype=np.int64)).ravel()
+        cells = np.minimum(np.searchsorted(cell_keys, keys), len(cell_keys)-1)
+        cells = cells[cell_keys[cells] == keys]
+    else:
+        i_lon = cell_keys // n_lat
+        i_lat = cell_keys % n_lat
+        cells = np.flatnonzero((i_lon >= i_lon_0) & (i_lon <= i_lon_1) & (i_lat >= i_lat_0) & (i_lat <= i_lat_1))
+
+    # concatenate row ranges of every cell
+    starts = cell_offsets[cells]
+    counts = cell_offsets[cells+1]-starts
+    candidates = np.repeat(starts-np.cumsum(counts)+counts, counts) + np.arange(counts.sum())
+
+    return(candidates)
+
+
+# ================================================================================================ #
+# GRID INDEX QUERIES
+# ================================================================================================ #
+def query_bbox(grid_index, lon_min, lon_max, lat_min, lat_max):
+
+    """
+    Find the rows whose position lies within a bounding box.
+
+    :param grid_index: the grid index dictionary.
+    :type grid_index: dict
+    :param lon_min: minimum longitude of the bounding box.
+    :type lon_min: float
+    :param lon_max: maximum longitude of the bounding box.
+    :type lon_max: float
+    :param lat_min: minimum latitude of the bounding box.
+    :type lat_min: float
+    :param lat_max: maximum latitude of the bounding box.
+    :type lat_max: float
+    :return: the sorted row positions.
+    :rtype: numpy.ndarray
+    """
+
+    # get candidates from grid cells
+    candidates = get_bbox_candidates(grid_index, lon_min, lon_max, lat_min, lat_max)
+
+    # exact filtering
+    lon = grid_index["longitude"][candidates]
+    lat = grid_index["latitude"][candidates]
+    is_inside = (lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max)
+    rows = np.sort(grid_index["rows"][candidates[is_inside]])
+
+    return(rows)
+
+
+def query_polygon(grid_index, polygon_lon, polygon_lat):
+
+    """
+    Find the rows whose position lies within a polygon.
+
+    :param grid_index: the grid index dictionary.
+    :type grid_index: dict
+    :param polygon_lon: longitudes of the polygon vertices.
+    :type polygon_lon: array-like of floats
+    :param polygon_lat: latitudes of the polygon vertices.
+    :type polygon_lat: array-like of floats
+    :return: the sorted row positions.
+    :rtype: numpy.ndarray
+
+    Longitudes and latitudes are treated as planar coordinates, which is appropriate for polygons that do not cross the antimeridian.
+    """
+
+    # polygon vertices
+    vertices = np.column_stack((np.asarray(polygon_lon, dtype=float), np.asarray(polygon_lat, dtype=float)))
+
+    # get candidates from grid cells intersecting the polygon bounding box
+    candidates = get_bbox_candidates(grid_index, vertices[:,0].min(), vertices[:,0].max(), vertices[:,1].min(), vertices[:,1].max())
+
+    # exact filtering
+    points = np.column_stack((grid_index["longitude"][candidates], grid_index["latitude"][candidates]))
+    is_inside = mpath.Path(vertices).contains_points(points)
+    rows = np.sort(grid_index["rows"][candidates[is_inside]])
+
+    return(rows)
+
+
+def query_radius(grid_index, lon, lat, radius):
+
+    """
+    Find the rows whose position lies within a given distance of a point.
+
+    :param grid_index: the grid index dictionary.
+    :type grid_index: dict
+    :param lon: longitude of the point.
+    :type lon: float
+    :param lat: latitude of the point.
+    :type lat: float
+    :param radius: distance in km.
+    :type radius: float
+    :return: the sorted row positions.
+    :rtype: numpy.ndarray
+
+    The bounding box of the disk is used to find candidates, which are then filtered using the orthodromic distance.
+    """
+
+    # bounding box of the disk with a safety margin
+    dlat = 1.01*np.degrees(radius/6356.752)
+    dlon = 180.0 if abs(lat)+dlat >= 90 else dlat/np.cos(np.radians(abs(lat)+dlat))
+
+    # get candidates from grid cells
+    candidates = get_bbox_candidates(grid_index, lon-dlon, lon+dlon, lat-dlat, lat+dlat)
+
+    # exact filtering
+    dist = utils.ortho_distance(lon, lat, grid_index["longitude"][candidates], grid_index["latitude"][candidates])
+    rows = np.sort(grid_index["rows"][candidates[dist <= radius]])
+
+    return(rows)
+
+
+# ================================================================================================ #
+# DENSITY PYRAMID
+# ================================================================================================ #
+def build_density_pyramid(longitude, latitude, weights=None, cell_size=0.01, n_levels=4):
+
+    """
+    Aggregate positions onto a multi-resolution pyramid of uniform grids.
+
+    :param longitude: array of longitudes in degrees.
+    :type longitude: numpy.ndarray
+    :param latitude: array of latitudes in degrees.
+    :type latitude: numpy.ndarray
+    :param weights: array of weights of every position (*e.g.* step time to get time-at-location), every position counts for one if None.
+    :type weights: numpy.ndarray
+    :param cell_size: size in degrees of the square grid cells of the finest level.
+    :type cell_size: float
+    :param n_levels: number of levels of the pyramid, the cell size being doubled from one level to the next.
+    :type n_levels: int
+    :return: the list of levels, from finest to coarsest, as dictionaries.
+    :rtype: list[dict]
+
+    Each level is aggregated from the non-empty cells of the previous one, so that only the finest level scans every position. Only non-empty
+    cells are kept at each level. Positions or weights with NaN values are ignored. Find below the exhaustive table of the level keys.
+
+    .. csv-table::
+        :header: "name", "description"
+        :widths: auto
+
+        ``cell_size``, "size in degrees of the grid cells"
+        ``longitude``, "longitude of the lower-left corner of every non-empty cell"
+        ``latitude``, "latitude of the lower-left corner of every non-empty cell"
+        ``value``, "sum of the weights of the positions within every non-empty cell"
+    """
+
+    # get positions and weights as float arrays
+    longitude = np.asarray(longitude, dtype=float)
+    latitude = np.asarray(latitude, dtype=float)
+    weights = np.ones(len(longitude)) if weights is None else np.asarray(weights, dtype=float)
+
+    # keep valid positions only
+    is_valid = np.isfinite(longitude) & np.isfinite(latitude) & np.isfinite(weights)
+    longitude = longitude[is_valid]
+    latitude = latitude[is_valid]
+    weights = weights[is_valid]
+
+    # cell indices of the finest level
+    i_lon = np.floor(longitude/cell_size).astype(np.int64)
+    i_lat = np.floor(latitude/cell_size).astype(np.int64)
+
+    # loop over levels, each level being aggregated from the previous one
+    pyramid = []
+    for level in range(n_levels):
+
+        # aggregate weights by cell
+        i_lon_0 = np.min(i_lon, initial=0)
+        i_lat_0 = np.min(i_lat, initial=0)
+        n_lat = np.max(i_lat, initial=0)-i_lat_0+1
+        keys, cell_indices = np.unique((i_lon-i_lon_0)*n_lat + (i_lat-i_lat_0), return_inverse=True)
+        weights = np.bincount(cell_indices, weights=weights, minlength=len(keys)).astype(float)
+        i_lon = keys // n_lat + i_lon_0
+        i_lat = keys % n_lat + i_lat_0
+
+        # store level
+        level_cell_size = cell_size*2**level
+        pyramid.append({"cell_size":level_cell_size, "longitude":i_lon*level_cell_size, "latitude":i_lat*level_cell_size, "value":weights})
+
+        # cell indices of the next level
+        i_lon = i_lon >> 1
+        i_lat = i_lat >> 1
+
+    return(pyramid)
@@ -0,0 +1,335 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import numpy as np
+import pandas as pd
+from cpforager import utils
+from cpforager.gps.gps import GPS
+from cpforager.tdr.tdr import TDR
+from cpforager.axy.axy import AXY
+from cpforager.gps_tdr.gps_tdr import GPS_TDR
+
+
+# ================================================================================================ #
+# MOVEBANK ATTRIBUTES
+# ================================================================================================ #
+
+# correspondance between movebank sensor types, cpforager sensors and columns
+movebank_sensors = {"gps":("gps", {"location-long":"longitude", "location-lat":"latitude"}),
+                    "barometer":("tdr", {"barometric-pressure":"pressure", "external-temperature":"temperature"}),
+                    "acceleration":("acc", {"acceleration-raw-x":"ax", "acceleration-raw-y":"ay", "acceleration-raw-z":"az"})}
+
+# columns of a movebank csv file
+movebank_columns = ["event-id", "visible", "timestamp", "sensor-type", "individual-local-identifier",
+                    "location-long", "location-lat", "barometric-pressure", "external-temperature",
+                    "acceleration-raw-x", "acceleration-raw-y", "acceleration-raw-z"]
+
+
+# ================================================================================================ #
+# FORMAT DATETIMES
+# ================================================================================================ #
+def format_datetimes(datetimes):
+
+    """
+    Format datetimes as ``%Y-%m-%d`` date strings and ``%H:%M:%S.%f`` time strings at the millisecond.
+
+    :param datetimes: the datetimes.
+    :type datetimes: numpy.ndarray(datetime64[ns])
+    :return: the date strings and the time strings.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+
+    Datetimes are formatted at once by ``numpy.datetime_as_string`` rather than row by row.
+    """
+
+    # format datetimes as iso strings and split them
+    iso_strings = pd.Series(np.datetime_as_string(np.asarray(datetimes, dtype="datetime64[ms]"), unit="ms"))
+    dates = iso_strings.str[:10].to_numpy(dtype=object)
+    times = iso_strings.str[11:].to_numpy(dtype=object)
+
+    return(dates, times)
+
+
+# ================================================================================================ #
+# READ MOVEBANK FILE
+# ================================================================================================ #
+def build_sensor_dataframes(pieces):
+
+    """
+    Concatenate the pieces of sensor dataframes of an individual read chunk by chunk.
+
+    :param pieces: the dictionary of the lists of dataframe pieces where keys are the cpforager sensors ``gps``, ``tdr`` and ``acc``.
+    :type pieces: dict
+    :return: the dictionary of sensor dataframes sorted by datetime with additional ``date`` and ``time`` columns.
+    :rtype: dict
+    """
+
+    # concatenate pieces by sensor
+    sensors = {}
+    for (sensor, sensor_pieces) in pieces.items():
+        df = pd.concat(sensor_pieces, ignore_index=True)
+        if not df["datetime"].is_monotonic_increasing:
+            df = df.sort_values("datetime", kind="stable", ignore_index=True)
+        df["date"], df["time"] = format_datetimes(df["datetime"].to_numpy())
+        sensors[sensor] = df[["date", "time"]+[column for column in df.columns if column not in ["date", "time"]]]
+
+    return(sensors)
+
+
+def iter_movebank_individuals(file_path, local_timezone, chunk_size=1000000, sorted_by_individual=False):
+
+    """
+    Read a Movebank csv file chunk by chunk and yield the sensor dataframes of every individual.
+
+    :param file_path: path of the Movebank csv file.
+    :type file_path: str
+    :param local_timezone: local timezone following the pytz nomenclature (see ``pytz.all_timezones``).
+    :type local_timezone: str
+    :param chunk_size: number of rows read at once.
+    :type chunk_size: int
+    :param sorted_by_individual: True if the rows of an individual are contiguous in the file.
+    :type sorted_by_individual: bool
+    :return: a generator of (individual, sensors) where sensors is the dictionary of the ``gps``, ``tdr`` and ``acc`` dataframes found for the individual.
+    :rtype: generator
+
+    Rows are split by ``individual-local-identifier`` and ``sensor-type`` on the fly and only the columns of every sensor are kept, renamed with
+    the cpforager names. Timestamps are parsed at UTC and converted to the local timezone. With ``sorted_by_individual=True``, an individual is yielded
+    as soon as the rows of the next individual are read, so that its processing starts before the file is fully read. Otherwise, since rows of
+    any individual may appear until the end of the file, individuals are yielded once the file is read.
+
+    .. csv-table::
+        :header: "sensor-type", "sensor", "columns"
+        :widths: auto
+
+        ``gps``, ``gps``, "``location-long`` as ``longitude``, ``location-lat`` as ``latitude``"
+        ``barometer``, ``tdr``, "``barometric-pressure`` as ``pressure`` in hPa, ``external-temperature`` as ``temperature``"
+        ``acceleration``, ``acc``, "``acceleration-raw-x``, ``acceleration-raw-y``, ``acceleration-raw-z`` as ``ax``, ``ay``, ``az``"
+    """
+
+    # read file chunk by chunk
+    pieces = {}
+    unknown_sensor_types = set()
+    reader = pd.read_csv(file_path, sep=",", chunksize=chunk_size, usecols=lambda column: column in movebank_columns,
+                         dtype={"individual-local-identifier":str, "sensor-type":str})
+    for df_chunk in reader:
+
+        # parse timestamps at once and convert them to local timezone
+        df_chunk["datetime"] = pd.to_datetime(df_chunk["timestamp"], format="ISO8601")
+        df_chunk = utils.convert_utc_to_loc(df_chunk, local_timezone)
+
+        # split rows by individual and sensor type
+        for ((individual, sensor_type), df_part) in df_chunk.groupby(["individual-local-identifier", "sensor-type"], sort=False):
+            if sensor_type not in movebank_sensors:
+                if sensor_type not in unknown_sensor_types:
+                    print("WARNING : sensor type %s is not handled and thus ignored" % sensor_type)
+                    unknown_sensor_types.add(sensor_type)
+                continue
+            sensor, columns = movebank_sensors[sensor_type]
+            df_part = df_part[["datetime"]+[column for column in columns if column in df_part.columns]].rename(columns=columns)
+            pieces.setdefault(individual, {}).setdefault(sensor, []).append(df_part.reset_index(drop=True))
+
+        # yield the individuals completed in this chunk
+        if sorted_by_individual and len(df_chunk) > 0:
+            current_individual = df_chunk["individual-local-identifier"].iloc[-1]
+            for individual in [individual for individual in pieces if individual != current_individual]:
+                yield(individual, build_sensor_dataframes(pieces.pop(individual)))
+
+    # yield the remaining individuals
+    for individual in list(pieces):
+        yield(individual, build_sensor_dataframes(pieces.pop(individual)))
+
+
+# ================================================================================================ #
+# BUILD INPUTS
+# ================================================================================================ #
+def get_gps_tdr_input(sensors):
+
+    """
+    Merge the GPS and TDR dataframes of an individual into the input dataframe of a GPS_TDR object.
+
+    :param sensors: the dictionary of the ``gps`` and ``tdr`` dataframes of an individual.
+    :type sensors: dict
+    :return: the dataframe with ``date``, ``time``, ``datetime``, ``longitude``, ``latitude``, ``pressure`` and ``temperature`` columns.
+    :rtype: pandas.DataFrame
+    """
+
+    # merge gps and tdr data on datetime
+    df = pd.merge_ordered(sensors["gps"].drop(columns=["date", "time"]), sensors["tdr"].drop(columns=["date", "time"]), on="datetime", how="outer")
+    df["date"], df["time"] = format_datetimes(df["datetime"].to_numpy())
+    df = df[["date", "time", "datetime", "longitude", "latitude", "pressure", "temperature"]]
+
+    return(df)
+
+
+def get_axy_input(sensors):
+
+    """
+    Merge the acceleration, GPS and TDR dataframes of an individual into the input dataframe of an AXY object.
+
+    :param sensors: the dictionary of the ``acc``, ``gps`` and ``tdr`` dataframes of an individual.
+    :type sensors: dict
+    :return: the dataframe with ``date``, ``time``, ``ax``, ``ay``, ``az``, ``longitude``, ``latitude``, ``pressure``, ``temperature`` and ``datetime`` columns.
+    :rtype: pandas.DataFrame
+
+    Every GPS and TDR measure is assigned to the nearest acceleration measure within half the acceleration resolution, since sensors of a
+    tag are not sampled at exactly the same timestamps.
+    """
+
+    # get acceleration data and resolution
+    df = sensors["acc"][["date", "time", "datetime", "ax", "ay", "az"]]
+    tolerance = df["datetime"].diff().median()/2
+
+    # assign gps and tdr measures to the nearest acceleration measure
+    for (sensor, columns) in [("gps", ["longitude", "latitude"]), ("tdr", ["pressure", "temperature"])]:
+        df_sensor = sensors[sensor][["datetime"]+columns].rename(columns={"datetime":"datetime_%s" % sensor})
+        df_nearest = pd.merge_asof(df_sensor, df[["datetime"]], left_on="datetime_%s" % sensor, right_on="datetime", direction="nearest", tolerance=tolerance)
+        df_nearest = df_nearest.dropna(subset=["datetime"]).drop_duplicates(subset="datetime")
+        df = df.merge(df_nearest[["datetime"]+columns], on="datetime", how="left")
+    df = df[["date", "time", "ax", "ay", "az", "longitude", "latitude", "pressure", "temperature", "datetime"]]
+
+    return(df)
+
+
+def get_input(sensors, kind):
+
+    """
+    Build the input dataframe of a cpforager object from the sensor dataframes of an individual.
+
+    :param sensors: the dictionary of the sensor dataframes of an individual.
+    :type sensors: dict
+    :param kind: the kind of object among ``GPS``, ``TDR``, ``GPS_TDR`` and ``AXY``.
+    :type kind: str
+    :return: the input dataframe, None if a required sensor is missing.
+    :rtype: pandas.DataFrame
+    """
+
+    # check required sensors
+    required_sensors = {"GPS":["gps"], "TDR":["tdr"], "GPS_TDR":["gps", "tdr"], "AXY":["acc", "gps", "tdr"]}
+    if kind not in required_sensors:
+        raise ValueError("Kind %s is not among %s." % (kind, list(required_sensors.keys())))
+    if any([sensor not in sensors for sensor in required_sensors[kind]]):
+        return(None)
+
+    # build input dataframe
+    if kind == "GPS":
+        df = sensors["gps"]
+    elif kind == "TDR":
+        df = sensors["tdr"]
+    elif kind == "GPS_TDR":
+        df = get_gps_tdr_input(sensors)
+    else:
+        df = get_axy_input(sensors)
+
+    return(df)
+
+
+# ================================================================================================ #
+# READ MOVEBANK COLLECTION
+# ================================================================================================ #
+def iter_movebank_objects(file_path, kind, group, params, chunk_size=1000000, sorted_by_individual=False):
+
+    """
+    Read a Movebank csv file chunk by chunk and yield the cpforager object of every individual.
+
+    :param file_path: path of the Movebank csv file.
+    :type file_path: str
+    :param kind: the kind of object among ``GPS``, ``TDR``, ``GPS_TDR`` and ``AXY``.
+    :type kind: str
+    :param group: the group of every object.
+    :type group: str
+    :param params: the parameters dictionary.
+    :type params: dict
+    :param chunk_size: number of rows read at once.
+    :type chunk_size: int
+    :param sorted_by_individual: True if the rows of an individual are contiguous in the file (see ``iter_movebank_individuals``).
+    :type sorted_by_individual: bool
+    :return: a generator of GPS, TDR, GPS_TDR or AXY objects.
+    :rtype: generator
+
+    Objects are built as soon as the data of their individual are complete, so that building a collection starts before the file is fully read.
+    Individuals missing a sensor required by ``kind`` are skipped.
+    """
+
+    # classes of cpforager objects
+    classes = {"GPS":GPS, "TDR":TDR, "GPS_TDR":GPS_TDR, "AXY":AXY}
+
+    # build object of every individual
+    for (individual, sensors) in iter_movebank_individuals(file_path, params.get("local_tz"), chunk_size, sorted_by_individual):
+        df = get_input(sensors, kind)
+        if df is None:
+            print("WARNING : individual %s misses a sensor required by %s and is thus ignored" % (individual, kind))
+            continue
+        yield(classes[kind](df, group, individual, params))
+
+
+# ================================================================================================ #
+# WRITE MOVEBANK FILE
+# ================================================================================================ #
+def get_member_sensors(member):
+
+    """
+    Get the sensor dataframes of a collection member.
+
+    :param member: a GPS, TDR, GPS_TDR or AXY object.
+    :type member: cpforager.GPS | cpforager.TDR | cpforager.GPS_TDR | cpforager.AXY
+    :return: the list of (movebank sensor type, dataframe) of the member.
+    :rtype: list[(str, pandas.DataFrame)]
+    """
+
+    # dataframes by type of member
+    if isinstance(member, GPS):
+        member_sensors = [("gps", member.df)]
+    elif isinstance(member, TDR):
+        member_sensors = [("barometer", member.df)]
+    elif isinstance(member, GPS_TDR):
+        member_sensors = [("gps", member.gps.df), ("barometer", member.tdr.df)]
+    elif isinstance(member, AXY):
+        member_sensors = [("gps", member.gps.df), ("barometer", member.tdr.df), ("acceleration", member.df)]
+    else:
+        raise ValueError("Member %s is not a GPS, TDR, GPS_TDR or AXY object." % (type(member).__name__))
+
+    return(member_sensors)
+
+
+def write_movebank(members, file_path, chunk_size=1000000):
+
+    """
+    Write the data of the members of a collection in a Movebank csv file chunk by chunk.
+
+    :param members: the GPS, TDR, GPS_TDR or AXY objects of the collection.
+    :type members: list[cpforager.GPS] | list[cpforager.TDR] | list[cpforager.GPS_TDR] | list[cpforager.AXY]
+    :param file_path: path of the Movebank csv file.
+    :type file_path: str
+    :param chunk_size: maximum number of rows written at once.
+    :type chunk_size: int
+
+    Rows are written individual by individual and sensor by sensor, with timestamps converted from the local timezone to UTC, and
+    columns of the other sensors left empty. Thus, the file can be read back with ``sorted_by_individual=True`` (see ``iter_movebank_individuals``).
+    """
+
+    # inverse correspondance between cpforager columns and movebank columns by sensor type
+    columns_by_sensor_type = {sensor_type:{column:movebank_column for (movebank_column, column) in columns.items()} for (sensor_type, (_, columns)) in movebank_sensors.items()}
+
+    # write rows by member, sensor and chunk
+    n_written = 0
+    for member in members:
+        for (sensor_type, df) in get_member_sensors(member):
+            for i0 in range(0, len(df), chunk_size):
+
+                # convert datetime from local to utc timezone
+                df_chunk = df.iloc[i0:i0+chunk_size]
+                df_utc = utils.convert_loc_to_utc(pd.DataFrame({"datetime":df_chunk["datetime"].to_numpy()}), member.params.get("local_tz"))
+
+                # build movebank rows
+                timestamps = np.char.replace(np.datetime_as_string(df_utc["datetime"].to_numpy(dtype="datetime64[ms]"), unit="ms"), "T", " ")
+                df_movebank = pd.DataFrame({"event-id":np.arange(n_written+1, n_written+len(df_chunk)+1), "visible":"true", "timestamp":timestamps,
+                                            "sensor-type":sensor_type, "individual-local-identifier":member.id}, columns=movebank_columns)
+                for (column, movebank_column) in columns_by_sensor_type[sensor_type].items():
+                    df_movebank[movebank_column] = df_chunk[column].to_numpy()
+
+                # append rows to file
+                df_movebank.to_csv(file_path, mode="w" if n_written == 0 else "a", header=(n_written == 0), index=False)
+                n_written = n_written+len(df_chunk)
+
+    # write header only if the collection is empty
+    if n_written == 0:
+        pd.DataFrame(columns=movebank_columns).to_csv(file_path, index=False)
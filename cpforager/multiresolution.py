@@ -0,0 +1,337 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import numpy as np
+import pandas as pd
+
+
+# ================================================================================================ #
+# AGGREGATE LEVEL
+# ================================================================================================ #
+def aggregate_level(blocks_min, blocks_max, blocks_sum, blocks_count):
+
+    """
+    Aggregate consecutive pairs of blocks into the blocks of the next pyramid level.
+
+    :param blocks_min: minimum value of the blocks.
+    :type blocks_min: numpy.ndarray
+    :param blocks_max: maximum value of the blocks.
+    :type blocks_max: numpy.ndarray
+    :param blocks_sum: sum of the valid values of the blocks.
+    :type blocks_sum: numpy.ndarray
+    :param blocks_count: number of valid values of the blocks.
+    :type blocks_count: numpy.ndarray
+    :return: the minimum, maximum, sum and count of the aggregated blocks.
+    :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+
+    When the number of blocks is odd, the last aggregated block is made of the last block only. Blocks without valid values have NaN minimum and maximum.
+    """
+
+    # starting positions of the aggregated blocks
+    starts = np.arange(0, len(blocks_min), 2)
+
+    # aggregate pairs of blocks
+    blocks_min = np.fmin.reduceat(blocks_min, starts)
+    blocks_max = np.fmax.reduceat(blocks_max, starts)
+    blocks_sum = np.add.reduceat(blocks_sum, starts)
+    blocks_count = np.add.reduceat(blocks_count, starts)
+
+    return(blocks_min, blocks_max, blocks_sum, blocks_count)
+
+
+# ================================================================================================ #
+# BUILD PYRAMID
+# ================================================================================================ #
+def build_pyramid(datetimes, columns_values, n_levels=None):
+
+    """
+    Build the multi-resolution pyramid of time series sharing the same datetimes.
+
+    :param datetimes: sorted datetimes of the measures.
+    :type datetimes: pandas.Series(datetime64[ns])
+    :param columns_values: dictionary of the value arrays to aggregate, where keys are the column names.
+    :type columns_values: dict
+    :param n_levels: maximum number of levels, by default levels are added until a single block covers the whole time series.
+    :type n_levels: int
+    :return: the pyramid dictionary.
+    :rtype: dict
+
+    Level :math:`k` splits the measures into consecutive blocks of :math:`2^k` measures, starting at :math:`k=1`. Every level is aggregated from the
+    previous one, hence the pyramid is built in :math:`O(n)` and its total size is about the size of the time series. NaN values are ignored.
+    Find below the exhaustive table of the pyramid keys.
+
+    .. csv-table::
+        :header: "name", "description"
+        :widths: auto
+
+        ``columns``, "list of the aggregated column names"
+        ``n_df``, "number of measures in the time series"
+        ``levels``, "list of the level dictionaries from the finest to the coarsest"
+
+    Every level dictionary contains the ``block_size`` number of measures by block, the ``datetime`` and ``datetime_end`` arrays of the datetimes of the first
+    and last measures of the blocks as int64 nanoseconds and, for every column, the ``<column>_min``, ``<column>_max``, ``<column>_sum`` and ``<column>_count`` arrays of the block minimum, maximum, sum and number of valid values.
+    """
+
+    # get datetimes as int64 nanoseconds
+    datetimes = pd.to_datetime(pd.Series(datetimes)).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    n_df = len(datetimes)
+    columns = list(columns_values.keys())
+
+    # initialize the zeroth level with the measures
+    blocks = {}
+    for column in columns:
+        values = np.asarray(columns_values[column], dtype=float)
+        is_valid = np.isfinite(values)
+        blocks[column] = (values, values, np.where(is_valid, values, 0.0), is_valid.astype(np.int64))
+    level_datetimes = datetimes
+
+    # build levels by aggregating pairs of blocks of the previous level
+    levels = []
+    block_size = 1
+    while (len(level_datetimes) > 1) and ((n_levels is None) or (len(levels) < n_levels)):
+        block_size = 2*block_size
+        level = {"block_size":block_size}
+        for column in columns:
+            blocks_min, blocks_max, blocks_sum, blocks_count = aggregate_level(*blocks[column])
+            blocks[column] = (blocks_min, blocks_max, blocks_sum, blocks_count)
+            level["%s_min" % column] = blocks_min
+            level["%s_max" % column] = blocks_max
+            level["%s_sum" % column] = blocks_sum
+            level["%s_count" % column] = blocks_count
+        level_datetimes = datetimes[::block_size]
+        level["datetime"] = level_datetimes
+        level["datetime_end"] = datetimes[np.minimum(np.arange(1, len(level_datetimes)+1)*block_size, n_df)-1]
+        levels.append(level)
+
+    # build pyramid dictionary
+    pyramid = {"columns":columns, "n_df":n_df, "levels":levels}
+
+    return(pyramid)
+
+
+# ================================================================================================ #
+# QUERY PYRAMID
+# ================================================================================================ #
+def query_pyramid(pyramid, column, start_datetime, end_datetime, n_pixels):
+
+    """
+    Extract the aggregated values of a column over a time range at a given display resolution.
+
+    :param pyramid: the pyramid dictionary.
+    :type pyramid: dict
+    :param column: the column name.
+    :type column: str
+    :param start_datetime: starting datetime of the time range.
+    :type start_datetime: datetime.datetime
+    :param end_datetime: ending datetime of the time range.
+    :type end_datetime: datetime.datetime
+    :param n_pixels: the number of pixels available to display the time range.
+    :type n_pixels: int
+    :return: the dataframe with ``datetime``, ``min``, ``max``, ``mean`` and ``count`` columns where each row corresponds to one block overlapping the time range.
+    :rtype: pandas.DataFrame
+
+    A block overlaps the time range if its last measure is not before ``start_datetime`` and its first measure is not after ``end_datetime``.
+    The coarsest level with at least ``n_pixels`` blocks overlapping the time range is read, *i.e.* between ``n_pixels`` and ``2*n_pixels`` blocks
+    unless the finest level is reached, whatever the length of the time series.
+    """
+
+    # check column
+    if column not in pyramid["columns"]:
+        raise ValueError("%s column is not part of the pyramid %s" % (column, pyramid["columns"]))
+
+    # get time range as int64 nanoseconds
+    start_ns = pd.Timestamp(start_datetime).value
+    end_ns = pd.Timestamp(end_datetime).value
+
+    # find the coarsest level with enough blocks within the time range
+    levels = pyramid["levels"]
+    level, i_start, i_end = None, 0, 0
+    for level in reversed(levels):
+        i_start = np.searchsorted(level["datetime_end"], start_ns, side="left")
+        i_end = np.searchsorted(level["datetime"], end_ns, side="right")
+        if i_end-i_start >= n_pixels: break
+
+    # read the blocks of the time range
+    if level is None:
+        df_query = pd.DataFrame({"datetime":pd.to_datetime(np.array([], dtype=np.int64)), "min":[], "max":[], "mean":[], "count":[]})
+    else:
+        blocks_sum = level["%s_sum" % column][i_start:i_end]
+        blocks_count = level["%s_count" % column][i_start:i_end]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            blocks_mean = np.where(blocks_count > 0, blocks_sum/blocks_count, np.nan)
+        df_query = pd.DataFrame({"datetime":pd.to_datetime(level["datetime"][i_start:i_end]),
+                                 "min":level["%s_min" % column][i_start:i_end],
+                                 "max":level["%s_max" % column][i_start:i_end],
+                                 "mean":blocks_mean,
+                                 "count":blocks_count})
+
+    return(df_query)
+
+
+# ================================================================================================ #
+# SAVE PYRAMID
+# ================================================================================================ #
+def save_pyramid(pyramid, file_path):
+
+    """
+    Save the pyramid as a compressed numpy archive.
+
+    :param pyramid: the pyramid dictionary.
+    :type pyramid: dict
+    :param file_path: path of the ``.npz`` file.
+    :type file_path: str
+
+    Arrays of level :math:`k` are stored under ``level_<k>_<name>`` keys, so that the archive can be read without cpforager, *e.g.* by an external viewer.
+    """
+
+    # flatten pyramid arrays
+    arrays = {"columns":np.array(pyramid["columns"], dtype=str), "n_df":np.array(pyramid["n_df"]), "n_levels":np.array(len(pyramid["levels"]))}
+    for k, level in enumerate(pyramid["levels"]):
+        for name, values in level.items():
+            arrays["level_%d_%s" % (k+1, name)] = np.asarray(values)
+
+    # save archive
+    np.savez_compressed(file_path, **arrays)
+
+
+# ================================================================================================ #
+# LOAD PYRAMID
+# ================================================================================================ #
+def load_pyramid(file_path):
+
+    """
+    Load a pyramid saved by ``save_pyramid``.
+
+    :param file_path: path of the ``.npz`` file.
+    :type file_path: str
+    :return: the pyramid dictionary.
+    :rtype: dict
+    """
+
+    # read archive
+    with np.load(file_path) as archive:
+        columns = archive["columns"].tolist()
+        n_df = int(archive["n_df"])
+        n_levels = int(archive["n_levels"])
+        levels = []
+        for k in range(1, n_levels+1):
+            prefix = "level_%d_" % k
+            level = {name[len(prefix):]:archive[name] for name in archive.files if name.startswith(prefix)}
+            level["block_size"] = int(level["block_size"])
+            levels.append(level)
+
+    # build pyramid dictionary
+    pyramid = {"columns":columns, "n_df":n_df, "levels":levels}
+
+    return(pyramid)
+
+
+# ================================================================================================ #
+# LOGGER PYRAMID
+# ================================================================================================ #
+def build_logger_pyramid(self, columns=None, n_levels=None):
+
+    """
+    Build the multi-resolution pyramid of the signals of a logger.
+
+    :param self: an AXY or TDR object
+    :type self: cpforager.AXY | cpforager.TDR
+    :param columns: list of ``df`` columns to aggregate, by default ``ax``, ``ay``, ``az`` and ``odba`` for AXY, ``depth`` and ``temperature`` for TDR.
+    :type columns: list[str]
+    :param n_levels: maximum number of levels, by default levels are added until a single block covers the whole recording.
+    :type n_levels: int
+    :return: the pyramid dictionary, also stored in the ``pyramid`` attribute.
+    :rtype: dict
+
+    Level :math:`k` stores the minimum, maximum, sum and number of valid values of the columns by blocks of :math:`2^k` measures.
+    See ``build_pyramid`` for the content of the dictionary. The depth pyramid of AXY is built at TDR resolution with the ``build_pyramid`` method of its ``tdr`` attribute.
+    """
+
+    # get attributes
+    df = self.df
+
+    # default columns
+    if columns is None: columns = {"AXY":["ax", "ay", "az", "odba"], "TDR":["depth", "temperature"]}[type(self).__name__]
+
+    # build pyramid
+    pyramid = build_pyramid(df["datetime"], {column:df[column].to_numpy(dtype=float, na_value=float("nan")) for column in columns}, n_levels)
+
+    # set attributes
+    self.pyramid = pyramid
+
+    return(pyramid)
+
+
+def query_logger_pyramid(self, column, start_datetime, end_datetime, n_pixels):
+
+    """
+    Extract the aggregated values of a column of a logger over a time range at a given display resolution.
+
+    :param self: an AXY or TDR object
+    :type self: cpforager.AXY | cpforager.TDR
+    :param column: the column name.
+    :type column: str
+    :param start_datetime: starting datetime of the time range.
+    :type start_datetime: datetime.datetime
+    :param end_datetime: ending datetime of the time range.
+    :type end_datetime: datetime.datetime
+    :param n_pixels: the number of pixels available to display the time range.
+    :type n_pixels: int
+    :return: the dataframe with ``datetime``, ``min``, ``max``, ``mean`` and ``count`` columns where each row corresponds to one block.
+    :rtype: pandas.DataFrame
+
+    The pyramid is built with default parameters at the first query if it does not exist yet. Between ``n_pixels`` and ``2*n_pixels`` blocks
+    are read whatever the length of the recording (see ``query_pyramid``).
+    """
+
+    # get attributes
+    pyramid = self.pyramid
+    if pyramid is None: pyramid = self.build_pyramid()
+
+    # query pyramid
+    df_query = query_pyramid(pyramid, column, start_datetime, end_datetime, n_pixels)
+
+    return(df_query)
+
+
+def save_logger_pyramid(self, file_path):
+
+    """
+    Save the multi-resolution pyramid of a logger as a compressed numpy archive.
+
+    :param self: an AXY or TDR object
+    :type self: cpforager.AXY | cpforager.TDR
+    :param file_path: path of the ``.npz`` file.
+    :type file_path: str
+
+    The pyramid is built with default parameters if it does not exist yet.
+    """
+
+    # get attributes
+    pyramid = self.pyramid
+    if pyramid is None: pyramid = self.build_pyramid()
+
+    # save pyramid
+    save_pyramid(pyramid, file_path)
+
+
+def load_logger_pyramid(self, file_path):
+
+    """
+    Load the multi-resolution pyramid of a logger previously saved by ``save_pyramid``.
+
+    :param self: an AXY or TDR object
+    :type self: cpforager.AXY | cpforager.TDR
+    :param file_path: path of the ``.npz`` file.
+    :type file_path: str
+    :return: the pyramid dictionary, also stored in the ``pyramid`` attribute.
+    :rtype: dict
+    """
+
+    # load pyramid
+    pyramid = load_pyramid(file_path)
+
+    # set attributes
+    self.pyramid = pyramid
+
+    return(pyramid)
@@ -0,0 +1,272 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import numpy as np
+from cpforager import utils
+
+
+# ================================================================================================ #
+# LINKED NEIGHBOURS
+# ================================================================================================ #
+def get_linked_neighbours(is_kept):
+
+    """
+    Link every kept position to its previous and next kept positions.
+
+    :param is_kept: the mask of the kept positions.
+    :type is_kept: numpy.ndarray(bool)
+    :return: the previous and next kept position of every position, of length n+1 where n is the sentinel position without neighbours.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+
+    Links of removed positions are meaningless. The sentinel allows to follow links beyond the first and last positions without test.
+    """
+
+    # link consecutive kept positions
+    n = len(is_kept)
+    kept = np.flatnonzero(is_kept)
+    prev_kept = np.full(n+1, n, dtype=np.int64)
+    next_kept = np.full(n+1, n, dtype=np.int64)
+    prev_kept[kept[1:]] = kept[:-1]
+    next_kept[kept[:-1]] = kept[1:]
+
+    return(prev_kept, next_kept)
+
+
+def get_pair_speeds(datetimes, longitudes, latitudes, rows_1, rows_2):
+
+    """
+    Compute the ground speeds between pairs of positions.
+
+    :param datetimes: datetimes of the positions as int64 nanoseconds, plus the sentinel.
+    :type datetimes: numpy.ndarray(int64)
+    :param longitudes: longitudes of the positions, plus the NaN sentinel.
+    :type longitudes: numpy.ndarray
+    :param latitudes: latitudes of the positions, plus the NaN sentinel.
+    :type latitudes: numpy.ndarray
+    :param rows_1: first positions of the pairs.
+    :type rows_1: numpy.ndarray
+    :param rows_2: second positions of the pairs.
+    :type rows_2: numpy.ndarray
+    :return: the speeds in km/h, NaN for pairs including the sentinel and infinite for distinct positions recorded at the same datetime.
+    :rtype: numpy.ndarray
+    """
+
+    # compute distances and durations
+    dist_in_km = utils.ortho_distance(longitudes[rows_1], latitudes[rows_1], longitudes[rows_2], latitudes[rows_2])
+    dt_in_hours = np.abs(datetimes[rows_2]-datetimes[rows_1])/3.6e12
+
+    # compute speeds
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speeds = np.where((dist_in_km == 0) & (dt_in_hours == 0), 0.0, dist_in_km/dt_in_hours)
+
+    return(speeds)
+
+
+# ================================================================================================ #
+# SCORES
+# ================================================================================================ #
+def get_speed_scores(rows, prev_kept, next_kept, datetimes, longitudes, latitudes, max_possible_speed):
+
+    """
+    Compute the McConnell speed of positions and whether they are suspicious.
+
+    :param rows: the positions to score.
+    :type rows: numpy.ndarray
+    :param prev_kept: the previous kept position of every position (see ``get_linked_neighbours``).
+    :type prev_kept: numpy.ndarray
+    :param next_kept: the next kept position of every position (see ``get_linked_neighbours``).
+    :type next_kept: numpy.ndarray
+    :param datetimes: datetimes of the positions as int64 nanoseconds, plus the sentinel.
+    :type datetimes: numpy.ndarray(int64)
+    :param longitudes: longitudes of the positions, plus the NaN sentinel.
+    :type longitudes: numpy.ndarray
+    :param latitudes: latitudes of the positions, plus the NaN sentinel.
+    :type latitudes: numpy.ndarray
+    :param max_possible_speed: speed threshold in km/h.
+    :type max_possible_speed: float
+    :return: the mask of the suspicious positions and their scores.
+    :rtype: (numpy.ndarray(bool), numpy.ndarray)
+
+    The McConnell speed of a position is the root mean square of the speeds to its two previous and two next kept positions. A position is suspicious
+    when its McConnell speed is above the threshold.
+    """
+
+    # speeds to the two previous and two next kept positions
+    neighbours = [prev_kept[prev_kept[rows]], prev_kept[rows], next_kept[rows], next_kept[next_kept[rows]]]
+    speeds = np.column_stack([get_pair_speeds(datetimes, longitudes, latitudes, rows, neighbour) for neighbour in neighbours])
+
+    # root mean square of available speeds
+    n_speeds = (~np.isnan(speeds)).sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        scores = np.sqrt(np.nansum(speeds**2, axis=1)/n_speeds)
+    is_suspicious = (n_speeds > 0) & (scores > max_possible_speed)
+
+    return(is_suspicious, scores)
+
+
+def get_spike_scores(rows, prev_kept, next_kept, datetimes, longitudes, latitudes, spike_angles, spike_lengths):
+
+    """
+    Compute the spike length of positions and whether they are suspicious.
+
+    :param rows: the positions to score.
+    :type rows: numpy.ndarray
+    :param prev_kept: the previous kept position of every position (see ``get_linked_neighbours``).
+    :type prev_kept: numpy.ndarray
+    :param next_kept: the next kept position of every position (see ``get_linked_neighbours``).
+    :type next_kept: numpy.ndarray
+    :param datetimes: datetimes of the positions as int64 nanoseconds, plus the sentinel.
+    :type datetimes: numpy.ndarray(int64)
+    :param longitudes: longitudes of the positions, plus the NaN sentinel.
+    :type longitudes: numpy.ndarray
+    :param latitudes: latitudes of the positions, plus the NaN sentinel.
+    :type latitudes: numpy.ndarray
+    :param spike_angles: angles in degrees below which a position is a spike if both its steps are longer than the corresponding length.
+    :type spike_angles: list[float]
+    :param spike_lengths: lengths in km of the steps corresponding to the spike angles.
+    :type spike_lengths: list[float]
+    :return: the mask of the suspicious positions and their scores.
+    :rtype: (numpy.ndarray(bool), numpy.ndarray)
+
+    The spike angle of a position is the angle between its steps to the previous and next kept positions, 0° for a round trip. The score of a position
+    is the length of its shortest step.
+    """
+
+    # steps from the previous and to the next kept positions
+    p = prev_kept[rows]
+    n = next_kept[rows]
+    length_1 = utils.ortho_distance(longitudes[p], latitudes[p], longitudes[rows], latitudes[rows])
+    length_2 = utils.ortho_distance(longitudes[rows], latitudes[rows], longitudes[n], latitudes[n])
+    heading_1 = utils.spherical_heading(longitudes[p], latitudes[p], longitudes[rows], latitudes[rows])
+    heading_2 = utils.spherical_heading(longitudes[rows], latitudes[rows], longitudes[n], latitudes[n])
+
+    # spike angle and length
+    angles = 180-np.abs((heading_2-heading_1+180) % 360-180)
+    scores = np.fmin(length_1, length_2)
+    is_suspicious = np.zeros(len(rows), dtype=bool)
+    for (spike_angle, spike_length) in zip(spike_angles, spike_lengths):
+        is_suspicious |= (angles < spike_angle) & (scores > spike_length)
+    is_suspicious &= (p < len(prev_kept)-1) & (n < len(next_kept)-1)
+
+    return(is_suspicious, scores)
+
+
+# ================================================================================================ #
+# ITERATIVE FILTER
+# ================================================================================================ #
+def iterative_filter(is_kept, get_scores):
+
+    """
+    Iteratively remove the suspicious positions with the highest scores among their neighbours.
+
+    :param is_kept: the mask of the positions to filter.
+    :type is_kept: numpy.ndarray(bool)
+    :param get_scores: function of the positions to score and the links, returning the mask of suspicious positions and their scores.
+    :type get_scores: function
+    :return: the mask of the positions kept after filtering.
+    :rtype: numpy.ndarray(bool)
+
+    At every round, every suspicious position whose score is the highest among its four previous and four next kept positions is removed, ties being
+    broken by position. Scores only depending on the two previous and two next kept positions, removals of a round do not interact and mostly follow
+    the order of the classical filters removing the worst position at a time. Links are then updated and only the kept positions within two links of
+    a removed position are scored again. The worst suspicious position being removed at every round, the filter ends in at most n rounds.
+    """
+
+    # init links and scores
+    n = len(is_kept)
+    is_kept = np.append(is_kept, False)
+    prev_kept, next_kept = get_linked_neighbours(is_kept[:-1])
+    scores = np.full(n+1, -np.inf)
+    rows = np.flatnonzero(is_kept)
+
+    # remove suspicious positions by rounds
+    while True:
+
+        # score positions whose neighbours changed
+        if len(rows) > 0:
+            is_suspicious, rows_scores = get_scores(rows, prev_kept, next_kept)
+            scores[rows] = np.where(is_suspicious, rows_scores, -np.inf)
+
+        # find suspicious positions with the highest score among their neighbours
+        candidates = np.flatnonzero(scores > -np.inf)
+        if len(candidates) == 0:
+            break
+        is_max = np.ones(len(candidates), dtype=bool)
+        candidates_scores = scores[candidates]
+        previous = candidates
+        following = candidates
+        for k in range(4):
+            previous = prev_kept[previous]
+            following = next_kept[following]
+            for neighbours in [previous, following]:
+                neighbours_scores = scores[neighbours]
+                is_max &= (candidates_scores > neighbours_scores) | ((candidates_scores == neighbours_scores) & (candidates < neighbours))
+        removed = candidates[is_max]
+
+        # remove positions and update links
+        is_kept[removed] = False
+        scores[removed] = -np.inf
+        next_kept[prev_kept[removed]] = next_kept[removed]
+        prev_kept[next_kept[removed]] = prev_kept[removed]
+        prev_kept[n] = n
+        next_kept[n] = n
+
+        # positions within two links of removed positions
+        rows = np.unique(np.concatenate([prev_kept[prev_kept[removed]], prev_kept[removed], next_kept[removed], next_kept[next_kept[removed]]]))
+        rows = rows[rows < n]
+
+    return(is_kept[:-1])
+
+
+# ================================================================================================ #
+# SUSPICIOUS POSITIONS
+# ================================================================================================ #
+def get_suspicious_mask(datetimes, longitudes, latitudes, params):
+
+    """
+    Find the suspicious positions of a GPS recording with an iterative filter.
+
+    :param datetimes: sorted datetimes of the positions as int64 nanoseconds.
+    :type datetimes: numpy.ndarray(int64)
+    :param longitudes: longitudes of the positions.
+    :type longitudes: numpy.ndarray
+    :param latitudes: latitudes of the positions.
+    :type latitudes: numpy.ndarray
+    :param params: parameters dictionary.
+    :type params: dict
+    :return: the mask of the suspicious positions.
+    :rtype: numpy.ndarray(bool)
+
+    With ``iterative_speed`` filter, positions are removed by the McConnell speed filter, *i.e.* iteratively while the root mean square of the speeds
+    to their two previous and two next kept positions is above ``max_possible_speed``. With ``speed_distance_angle`` filter, positions are then also
+    iteratively removed when they form a spike with their kept neighbours, as in the Freitas speed-distance-angle filter. Both filters run on
+    ``iterative_filter``.
+
+    .. note::
+        The required fields in the parameters dictionary are ``suspicious_filter``, ``max_possible_speed`` and, for ``speed_distance_angle`` filter,
+        ``spike_angles`` and ``spike_lengths``.
+    """
+
+    # get parameters
+    suspicious_filter = params.get("suspicious_filter")
+    max_possible_speed = params.get("max_possible_speed")
+
+    # append sentinel
+    datetimes = np.append(np.asarray(datetimes, dtype=np.int64), 0)
+    longitudes = np.append(np.asarray(longitudes, dtype=float), np.nan)
+    latitudes = np.append(np.asarray(latitudes, dtype=float), np.nan)
+    is_valid = ~(np.isnan(longitudes[:-1]) | np.isnan(latitudes[:-1]))
+    is_kept = is_valid
+
+    # iterative speed filter
+    get_scores = lambda rows, prev_kept, next_kept: get_speed_scores(rows, prev_kept, next_kept, datetimes, longitudes, latitudes, max_possible_speed)
+    is_kept = iterative_filter(is_kept, get_scores)
+
+    # iterative spike filter
+    if suspicious_filter == "speed_distance_angle":
+        spike_angles = params.get("spike_angles")
+        spike_lengths = params.get("spike_lengths")
+        get_scores = lambda rows, prev_kept, next_kept: get_spike_scores(rows, prev_kept, next_kept, datetimes, longitudes, latitudes, spike_angles, spike_lengths)
+        is_kept = iterative_filter(is_kept, get_scores)
+
+    return(is_valid & ~is_kept)
@@ -43,6 +43,9 @@ def get_params(config_file_paths):
         ``colony["box_latitude"]``, "latitude bounding box inside which the searbird's nest is to be found", "``GPS``"
         ``local_tz``, "local timezone of the seabird's nest", "``GPS``, ``AXY``, ``TDR``"
         ``max_possible_speed``, "speed threshold in km/h above which a longitude/latitude measure can be considered an error", "``GPS``"
+        ``suspicious_filter``, "choose filter of suspicious longitude/latitude measures (``speed``, ``iterative_speed`` or ``speed_distance_angle``), ``speed`` if None", "``GPS``"
+        ``spike_angles``, "list of angles in degrees below which a longitude/latitude measure forming a spike can be considered an error", "``GPS`` (``speed_distance_angle``)"
+        ``spike_lengths``, "list of the step lengths in km above which a spike of the corresponding angle can be considered an error", "``GPS`` (``speed_distance_angle``)"
         ``dist_threshold``, "distance from the nest threshold in km above which the seabird is considered in a foraging trip", "``GPS``"
         ``speed_threshold``, "speed threshold in km/h above which the seabird is still considered in a foraging trip despite being below the distance threshold", "``GPS``"
         ``nesting_speed``, "local timezone of the seabird's nest", "``GPS``"
@@ -110,8 +113,14 @@ def get_plot_params():
         ``cb_pad``, "colorbar padding factor", "``GPS``, ``AXY``"
         ``cb_aspect``, "colorbar size", "``GPS``, ``AXY``"
         ``fig_dpi``, "dots per inch of a saved figure", "``GPS``, ``AXY``, ``TDR``"
+        ``lod``, "decimate line timeseries to the minimum and maximum values by pixel column and scatter timeseries to one point by pixel if True", "``GPS``, ``AXY``, ``TDR``"
+        ``fig_cache``, "skip rendering of figures whose data and parameters are unchanged if True", "``GPS``, ``AXY``, ``TDR``"
         ``lon_fmt``, "longitude formatter", "``GPS``, ``AXY``"
         ``lat_fmt``, "latitude formatter", "``GPS``, ``AXY``"
+        ``land_shp``, "local land shapefile, 10m Natural Earth land if None", "``GPS``, ``AXY``"
+        ``coastline_shp``, "local coastline shapefile, 10m Natural Earth coastline if None", "``GPS``, ``AXY``"
+        ``geom_cache_dir``, "directory of the clipped land and coastline geometries cache, in memory only if None", "``GPS``, ``AXY``"
+        ``simplify_tol``, "tolerance in metres of the Douglas-Peucker simplification of the trajectories of folium maps, not simplified if None", "``GPS``, ``AXY``"
     """
     
     # colors
@@ -145,12 +154,22 @@ def get_plot_params():
                 "cb_aspect" : 18}
 
     # fig
-    dpi = {"fig_dpi" : 150}
+    dpi = {"fig_dpi" : 150,
+           "lod" : True,
+           "fig_cache" : False}
     
     # formatter
     formatters = {"lon_fmt" : cmpl.LongitudeFormatter(number_format=".2f", dms=False),
                   "lat_fmt" : cmpl.LatitudeFormatter(number_format=".2f", dms=False)}
     
+    # geometries
+    geometries = {"land_shp" : None,
+                  "coastline_shp" : None,
+                  "geom_cache_dir" : None}
+    
+    # simplification
+    simplification = {"simplify_tol" : None}
+    
     # append dictionaries
     params = {}
     params.update(colors)
@@ -161,6 +180,8 @@ def get_plot_params():
     params.update(colorbar)
     params.update(dpi)
     params.update(formatters)
+    params.update(geometries)
+    params.update(simplification)
     
     return(params)
 
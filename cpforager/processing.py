@@ -3,7 +3,7 @@
 # ================================================================================================ #
 import numpy as np
 import pandas as pd
-from cpforager import checks, utils, constants, parameters
+from cpforager import checks, utils, constants, parameters, outliers
 from suntime import Sun
 import pytz
 from scipy.signal import butter, filtfilt
@@ -685,27 +685,43 @@ def add_is_suspicious(df, params):
     """    
     Add to the dataframe the additional ``is_suspicious`` boolean column tagging suspicious position recordings.
     
-    :param df: dataframe with a ``step_speed`` column.
+    :param df: dataframe with ``datetime``, ``longitude``, ``latitude`` and ``step_speed`` columns.
     :type df: pandas.DataFrame
     :param params: parameters dictionary. 
     :type params: dict
     :return: the dataframe with the additional ``is_suspicious`` boolean column tagging suspicious position recordings.
     :rtype: pandas.DataFrame
     
-    The idea is to make it possible to clean the data of its position recording bugs.
+    The idea is to make it possible to clean the data of its position recording bugs. Suspicious positions are tagged by :
+        - the ``speed`` filter (default), tagging every position reached with a step speed above ``max_possible_speed``.
+        - the ``iterative_speed`` filter, removing positions by rounds while their speed with respect to the remaining neighbours is above ``max_possible_speed``.
+        - the ``speed_distance_angle`` filter, removing by rounds the positions that are too fast and then the positions forming long and sharp spikes.
+    
+    Contrary to the ``speed`` filter which tags both legs of a single spike, iterative filters only tag the spike, see ``outliers.get_suspicious_mask``.
     
     .. note::
-        The required fields in the parameters dictionary are ``max_possible_speed``.
+        The required fields in the parameters dictionary are ``suspicious_filter`` (``speed`` if None), ``max_possible_speed`` and, for ``speed_distance_angle`` 
+        filter, ``spike_angles`` and ``spike_lengths``.
             
     .. important::
         Bugs in the position recordings may suggest a dive.
     """
     
     # get parameters
+    suspicious_filter = params.get("suspicious_filter")
     max_possible_speed = params.get("max_possible_speed")
     
     # tag suspicious rows
-    df["is_suspicious"] = (df["step_speed"] > max_possible_speed).astype(int)
+    if suspicious_filter in [None, "speed"]:
+        df["is_suspicious"] = (df["step_speed"] > max_possible_speed).astype(int)
+    elif suspicious_filter in ["iterative_speed", "speed_distance_angle"]:
+        datetimes = df["datetime"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        is_suspicious = outliers.get_suspicious_mask(datetimes, df["longitude"].to_numpy(dtype=float), df["latitude"].to_numpy(dtype=float), params)
+        df["is_suspicious"] = is_suspicious.astype(int)
+    
+    # raise error
+    else:
+        raise NotImplementedError("Suspicious filter %s is not implemented." % (suspicious_filter))
     
     return(df)
 
@@ -868,6 +884,15 @@ def add_gps_data(df, params, clean=True):
     df = add_is_suspicious(df, params)
     if clean:        
         df = df.loc[df["is_suspicious"]==0].reset_index(drop=True)
+        
+        # recompute step statistics between the remaining positions
+        if params.get("suspicious_filter") in ["iterative_speed", "speed_distance_angle"]:
+            df = add_step_time(df)
+            df = add_step_length(df) 
+            df = add_step_speed(df) 
+            df = add_step_heading(df)
+            df = add_step_turning_angle(df)
+            df = add_step_heading_to_colony(df, params)
     
     # trip segmentation
     df = add_dist_to_nest(df, params)
@@ -920,8 +945,17 @@ def add_axy_data(df, params):
     :type df: pandas.DataFrame
     :param params: parameters dictionary. 
     :type params: dict
-    :return: the dataframe enhanced with the additional axy data.
-    :rtype: pandas.DataFrame
+    :return: the dataframe enhanced with the additional axy data, the processed dataframes at GPS and TDR resolutions, and the row positions in the full dataframe of the GPS and TDR measures.
+    :rtype: (pandas.DataFrame, pandas.DataFrame, pandas.DataFrame, numpy.ndarray, numpy.ndarray)
+    
+    .. note::
+        GPS data are cleaned from suspicious measures, which are thus excluded from the GPS resolution. The dataframes at GPS and TDR 
+        resolutions are fully processed, so that ``GPS`` and ``TDR`` objects can be built upon them with ``processed=True``.
+        
+    .. note::
+        Every stream is stored at its native rate: the full dataframe only holds the acceleration data, while processed GPS and TDR data are 
+        only stored in the dataframes at GPS and TDR resolutions. Row positions allow to rebuild the NaN-filled full resolution columns when 
+        needed using ``get_full_resolution_data``, and selecting them in the full dataframe raises an error pointing to ``full_resolution``.
     """
     
     # compute basic data
@@ -934,88 +968,43 @@ def add_axy_data(df, params):
     df = add_filtered_acc(df, params)
     df = add_odba(df, params)
         
-    # extract data at gps resolution and add processed gps data
+    # extract data at gps resolution and add processed and cleaned gps data
     gps_resolution = (df["longitude"].notna()) & (df["latitude"].notna())
-    gps_indices = df.loc[gps_resolution].index
-    df_gps_tmp = df.loc[gps_resolution, ["datetime", "longitude", "latitude"]].reset_index(drop=True)
-    df_gps_tmp = add_gps_data(df_gps_tmp, params, clean=False)
+    df_gps_tmp = df.loc[gps_resolution, ["datetime", "longitude", "latitude"]].reset_index(drop=False)
+    df_gps_tmp = add_gps_data(df_gps_tmp, params, clean=True)
+    
+    # restrict gps resolution to the cleaned gps measures
+    gps_indices = df.index.get_indexer(df_gps_tmp["index"].values)
+    df_gps_tmp = df_gps_tmp.drop(["index"], axis=1)
     
     # extract data at tdr resolution and add processed tdr data
     tdr_resolution = (df["pressure"].notna()) & (df["temperature"].notna())
-    tdr_indices = df.loc[tdr_resolution].index
-    df_tdr_tmp = df.loc[tdr_resolution, ["datetime", "pressure", "temperature"]].reset_index(drop=True)
-    df_tdr_tmp = add_tdr_data(df_tdr_tmp, params)
+    tdr_indices = np.flatnonzero(tdr_resolution.values)
+    df_tdr = df.loc[tdr_resolution, ["datetime", "pressure", "temperature"]].reset_index(drop=True)
+    df_tdr = add_tdr_data(df_tdr, params)
     
-    # init dataframe full of NaNs and set data type according to dictionary
+    # produce df_gps by processing (sum, mean, max) acceleration and tdr data between two gps measures
     gps_columns = ["step_length", "step_speed", "step_turning_angle", "step_heading", "step_heading_to_colony", "is_suspicious", "dist_to_nest", "trip"]
-    tdr_columns = ["depth", "dive"]
-    data_columns = gps_columns + tdr_columns
-    columns_dtypes_dict = parameters.get_columns_dtypes(data_columns)
-    for data_column in data_columns:
-        df[data_column] = pd.Series([pd.NA]*len(df), dtype=columns_dtypes_dict[data_column])
-        
-    # # init dataframe full of NaNs and set data type according to dictionary
-    # gps_columns = ["step_length", "step_speed", "step_turning_angle", "step_heading", "step_heading_to_colony", "is_suspicious", "dist_to_nest", "trip"]
-    # tdr_columns = ["depth", "dive"]
-    # data_columns = gps_columns + tdr_columns
-    # columns_dtypes_dict = parameters.get_columns_dtypes(data_columns)
-    # df_to_add = pd.DataFrame(index=range(len(df)), columns=data_columns).astype(columns_dtypes_dict)
-    # df_to_add[:] = pd.NA
-    # df = pd.concat([df, df_to_add], axis=1)
-    
-    # add gps data to the df at gps resolution
-    df.loc[gps_indices, gps_columns] = df_gps_tmp[gps_columns].values
-    
-    # add tdr data to the df at tdr resolution
-    df.loc[tdr_indices, tdr_columns] = df_tdr_tmp[tdr_columns].values
-    
-    # gps_columns = ["step_length", "step_speed", "step_turning_angle", "step_heading", "step_heading_to_colony", "is_suspicious", "dist_to_nest", "trip"]
-    # columns_dtypes_dict = parameters.get_columns_dtypes(gps_columns)
-    # # df[gps_columns] = np.nan
-    # # # init to NaN
-    # for gps_column in gps_columns:
-    #     df[gps_column] = pd.Series([pd.NA]*len(df), dtype=columns_dtypes_dict[gps_column])
-    # # for gps_column in gps_columns:
-    # #     df.loc[gps_indices, gps_column] = df_gps_tmp[gps_column].values
-    # #     df[gps_column] = df[gps_column].astype(columns_dtypes_dict[gps_column])
-    # df.loc[gps_indices, gps_columns] = df_gps_tmp[gps_columns].values
-    
-    # # add tdr data to the initial df
-    # tdr_columns = ["depth", "dive"]
-    # # df[tdr_columns] = np.nan
-    # columns_dtypes_dict = parameters.get_columns_dtypes(tdr_columns)
-    # for tdr_column in tdr_columns:
-    #     df[tdr_column] = pd.Series([pd.NA]*len(df), dtype=columns_dtypes_dict[tdr_column])
-    # df.loc[tdr_indices, tdr_columns] = df_tdr_tmp[tdr_columns].values
-    
-    # produce df_gps by processing (sum, mean, max) data between two gps measures
-    cols_funcs = {"odba":"sum", "odba_f":"sum", "step_time":"sum",
-                  "pressure":"max", "depth":"max", "dive":"max",
-                  "temperature":"mean",
-                  "dive":"len_unique_pos"}
-    df = utils.apply_functions_between_samples(df, gps_resolution, cols_funcs, verbose=True)
+    df_gps = df.iloc[gps_indices].reset_index(drop=True)
+    df_acc_funcs = utils.apply_functions_between_times(df, df_gps["datetime"], {"odba":"sum", "odba_f":"sum"})
+    df_tdr_funcs = utils.apply_functions_between_times(df_tdr, df_gps["datetime"], {"pressure":"max", "depth":"max", "dive":"len_unique_pos", "temperature":"mean"})
     
     # process gps data
-    df_gps = df.loc[gps_resolution].reset_index(drop=True)
-    df_gps = df_gps.drop(["odba", "odba_f", "step_time", "dive", "pressure", "depth", "temperature"], axis=1)
-    df_gps = df_gps.rename(columns={"odba_sum":"odba", "odba_f_sum":"odba_f", "step_time_sum":"step_time", 
-                                    "dive_max":"dive", "dive_len_unique_pos":"n_dives",
+    df_gps = df_gps.drop(["odba", "odba_f", "step_time", "pressure", "temperature"], axis=1)
+    df_gps = pd.concat([df_gps, df_gps_tmp[gps_columns], df_acc_funcs, df_tdr_funcs], axis=1)
+    df_gps = df_gps.rename(columns={"odba_sum":"odba", "odba_f_sum":"odba_f", "dive_len_unique_pos":"n_dives",
                                     "pressure_max":"pressure", "depth_max":"depth", "temperature_mean":"temperature"})
-    df_gps["trip"] = df_gps["trip"].astype(int)
-    df_gps["is_suspicious"] = df_gps["is_suspicious"].astype(int)
+    df_gps["step_time"] = df_gps_tmp["step_time"].values
         
-    # # process tdr data
-    # df_tdr = df.loc[tdr_resolution].reset_index(drop=True)
-    # df_tdr = df_tdr.drop(["odba", "odba_f", "step_time", "dive", "pressure", "depth", "temperature"], axis=1)
-    # df_tdr = df_tdr.rename(columns={"odba_sum":"odba", "odba_f_sum":"odba_f", "step_time_sum":"step_time"}) # longitude latitude ?
-    df_tdr = df_tdr_tmp     
+    # process tdr data
     df_tdr["dive"] = df_tdr["dive"].astype(int)
 
     # rearrange full dataframe
-    df = df[np.concatenate((["date", "time", "ax", "ay", "az", "longitude", "latitude", "pressure", "temperature",
-                             "datetime", "step_time", "is_night", "ax_f", "ay_f", "az_f", "odba", "odba_f"], gps_columns, tdr_columns))]
+    df = df[["date", "time", "ax", "ay", "az", "longitude", "latitude", "pressure", "temperature",
+             "datetime", "step_time", "is_night", "ax_f", "ay_f", "az_f", "odba", "odba_f"]]
+    df = get_native_rate_dataframe(df, gps_columns+["depth", "dive"])
         
-    return(df, df_gps, df_tdr)
+    return(df, df_gps, df_tdr, gps_indices, tdr_indices)
 
 
 # ================================================================================================ #
@@ -1030,61 +1019,135 @@ def add_gps_tdr_data(df, params):
     :type df: pandas.DataFrame
     :param params: parameters dictionary. 
     :type params: dict
-    :return: the dataframe enhanced with the additional gps_tdr data.
-    :rtype: pandas.DataFrame
+    :return: the dataframe enhanced with the additional gps_tdr data, the processed dataframes at GPS and TDR resolutions, and the row positions in the full dataframe of the GPS and TDR measures.
+    :rtype: (pandas.DataFrame, pandas.DataFrame, pandas.DataFrame, numpy.ndarray, numpy.ndarray)
+    
+    .. note::
+        GPS data are cleaned from suspicious measures, which are thus excluded from the GPS resolution. The dataframes at GPS and TDR 
+        resolutions are fully processed, so that ``GPS`` and ``TDR`` objects can be built upon them with ``processed=True``.
+        
+    .. note::
+        Every stream is stored at its native rate: processed GPS and TDR data are only stored in the dataframes at GPS and TDR resolutions. 
+        Row positions allow to rebuild the NaN-filled full resolution columns when needed using ``get_full_resolution_data``, and selecting 
+        them in the full dataframe raises an error pointing to ``full_resolution``.
     """
     
     # compute basic data
     df = add_basic_data(df, params)
         
-    # extract data at gps resolution and add processed gps data
+    # extract data at gps resolution and add processed and cleaned gps data
     gps_resolution = (df["longitude"].notna()) & (df["latitude"].notna())
-    gps_indices = df.loc[gps_resolution].index
-    df_gps_tmp = df.loc[gps_resolution, ["datetime", "longitude", "latitude"]].reset_index(drop=True)
-    df_gps_tmp = add_gps_data(df_gps_tmp, params, clean=False)
+    df_gps_tmp = df.loc[gps_resolution, ["datetime", "longitude", "latitude"]].reset_index(drop=False)
+    df_gps_tmp = add_gps_data(df_gps_tmp, params, clean=True)
+    
+    # restrict gps resolution to the cleaned gps measures
+    gps_indices = df.index.get_indexer(df_gps_tmp["index"].values)
+    df_gps_tmp = df_gps_tmp.drop(["index"], axis=1)
     
     # extract data at tdr resolution and add processed tdr data
     tdr_resolution = (df["pressure"].notna()) & (df["temperature"].notna())
-    tdr_indices = df.loc[tdr_resolution].index
+    tdr_indices = np.flatnonzero(tdr_resolution.values)
     df_tdr = df.loc[tdr_resolution, ["datetime", "pressure", "temperature"]].reset_index(drop=True)
     df_tdr = add_tdr_data(df_tdr, params)
-    
-    # init dataframe full of NaNs and set data type according to dictionary
-    gps_columns = ["step_length", "step_speed", "step_turning_angle", "step_heading", "step_heading_to_colony", "is_suspicious", "dist_to_nest", "trip"]
-    tdr_columns = ["depth", "dive"]
-    data_columns = gps_columns + tdr_columns
-    columns_dtypes_dict = parameters.get_columns_dtypes(data_columns)
-    for data_column in data_columns:
-        df[data_column] = pd.Series([pd.NA]*len(df), dtype=columns_dtypes_dict[data_column])
-            
-    # add gps data to the df at gps resolution
-    df.loc[gps_indices, gps_columns] = df_gps_tmp[gps_columns].values
-    
-    # add tdr data to the df at tdr resolution
-    df.loc[tdr_indices, tdr_columns] = df_tdr[tdr_columns].values
         
-    # produce df_gps by processing (sum, mean, max) data between two gps measures
-    cols_funcs = {"step_time":"sum", "pressure":"max", "depth":"max", 
-                  "dive":"max", "temperature":"mean", "dive":"len_unique_pos"}
-    df = utils.apply_functions_between_samples(df, gps_resolution, cols_funcs, verbose=True)
+    # produce df_gps by processing (max, mean) tdr data between two gps measures
+    gps_columns = ["step_length", "step_speed", "step_turning_angle", "step_heading", "step_heading_to_colony", "is_suspicious", "dist_to_nest", "trip"]
+    df_gps = df.iloc[gps_indices].reset_index(drop=True)
+    df_tdr_funcs = utils.apply_functions_between_times(df_tdr, df_gps["datetime"], {"pressure":"max", "depth":"max", "dive":"len_unique_pos", "temperature":"mean"})
     
     # process gps data
-    df_gps = df.loc[gps_resolution].reset_index(drop=True)
-    df_gps = df_gps.drop(["step_time", "dive", "pressure", "depth", "temperature"], axis=1)
-    df_gps = df_gps.rename(columns={"step_time_sum":"step_time", 
-                                    "dive_max":"dive", "dive_len_unique_pos":"n_dives",
-                                    "pressure_max":"pressure", "depth_max":"depth", "temperature_mean":"temperature"})
-    df_gps["trip"] = df_gps["trip"].astype(int)
-    df_gps["is_suspicious"] = df_gps["is_suspicious"].astype(int)
+    df_gps = df_gps.drop(["step_time", "pressure", "temperature"], axis=1)
+    df_gps = pd.concat([df_gps, df_gps_tmp[gps_columns], df_tdr_funcs], axis=1)
+    df_gps = df_gps.rename(columns={"dive_len_unique_pos":"n_dives", "pressure_max":"pressure", "depth_max":"depth", "temperature_mean":"temperature"})
+    df_gps["step_time"] = df_gps_tmp["step_time"].values
         
     # process tdr data
     df_tdr["dive"] = df_tdr["dive"].astype(int)
 
     # rearrange full dataframe
-    df = df[np.concatenate((["date", "time", "longitude", "latitude", "pressure", "temperature",
-                             "datetime", "step_time", "is_night"], gps_columns, tdr_columns))]
+    df = df[["date", "time", "longitude", "latitude", "pressure", "temperature", "datetime", "step_time", "is_night"]]
+    df = get_native_rate_dataframe(df, gps_columns+["depth", "dive"])
+        
+    return(df, df_gps, df_tdr, gps_indices, tdr_indices)
+
+
+# ================================================================================================ #
+# FULL RESOLUTION DATA
+# ================================================================================================ #
+class NativeRateDataFrame(pd.DataFrame):
+    
+    """
+    Dataframe at full resolution whose processed GPS and TDR columns are stored at their native rates.
+    
+    Selecting one of ``native_rate_columns`` raises a KeyError pointing to ``full_resolution``, as these columns were part of the full 
+    resolution dataframe of AXY and GPS_TDR objects. Any other operation returns a plain ``pandas.DataFrame``.
+    """
+    
+    # names of the columns stored at their native rates
+    _metadata = ["native_rate_columns"]
+    
+    @property
+    def _constructor(self):
+        return(pd.DataFrame)
+    
+    def __getitem__(self, key):
+        keys = key if isinstance(key, list) else [key]
+        missing = [k for k in keys if isinstance(k, str) and (k in getattr(self, "native_rate_columns", [])) and (k not in self.columns)]
+        if len(missing) > 0:
+            raise KeyError("Columns %s are stored at their native rates in df_gps and df_tdr, use full_resolution() to produce them at full resolution." % ", ".join(missing))
+        return(super().__getitem__(key))
+
+
+def get_native_rate_dataframe(df, columns):
+    
+    """    
+    Mark the columns of a full resolution dataframe that are stored at their native rates.
+    
+    :param df: dataframe at full resolution.
+    :type df: pandas.DataFrame
+    :param columns: list of the columns stored at their native rates.
+    :type columns: list[str]
+    :return: the dataframe, whose selection of the given columns raises a KeyError pointing to ``full_resolution``.
+    :rtype: cpforager.processing.NativeRateDataFrame
+    """
+    
+    # wrap dataframe without copy
+    df = NativeRateDataFrame(df, copy=False)
+    df.native_rate_columns = list(columns)
+    
+    return(df)
+
+
+def get_full_resolution_data(df, df_sub, indices, columns):
+    
+    """    
+    Produce the full resolution version of columns stored at a subsampling resolution.
+    
+    :param df: dataframe at full resolution.
+    :type df: pandas.DataFrame
+    :param df_sub: dataframe at subsampling resolution.
+    :type df_sub: pandas.DataFrame
+    :param indices: row positions in ``df`` of the ``df_sub`` measures.
+    :type indices: numpy.ndarray
+    :param columns: list of ``df_sub`` numerical columns to produce at full resolution.
+    :type columns: list[str]
+    :return: the dataframe indexed as ``df`` with the requested columns, composed of NA values everywhere except at the subsampling resolution.
+    :rtype: pandas.DataFrame
+    
+    Data types are set according to the dictionary of ``parameters.get_columns_dtypes``, so that integer columns are NA-aware.
+    """
+    
+    # get data types
+    columns_dtypes_dict = parameters.get_columns_dtypes(columns)
+    
+    # scatter subsampled data at full resolution
+    df_full = pd.DataFrame(index=df.index)
+    for column in columns:
+        values = np.full(len(df), np.nan)
+        values[indices] = df_sub[column].to_numpy(dtype=float, na_value=np.nan)
+        df_full[column] = pd.array(values, dtype="Float64").astype(columns_dtypes_dict[column])
         
-    return(df, df_gps, df_tdr)
+    return(df_full)
 
 
 # ================================================================================================ #
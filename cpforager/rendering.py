@@ -0,0 +1,150 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import os
+import time
+import traceback
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ================================================================================================ #
+# RENDER MEMBER
+# ================================================================================================ #
+def init_worker():
+
+    """
+    Initialize a rendering worker with the non-interactive matplotlib backend.
+    """
+
+    # set non-interactive backend
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def render_member(member, fig_dir, plot_params, kind):
+
+    """
+    Render a diagnostic figure of a collection member.
+
+    :param member: a GPS, TDR, AXY or GPS_TDR object.
+    :type member: cpforager.GPS | cpforager.TDR | cpforager.AXY | cpforager.GPS_TDR
+    :param fig_dir: figure saving directory.
+    :type fig_dir: str
+    :param plot_params: plot parameters dictionary.
+    :type plot_params: dict
+    :param kind: name of the diagnostic method to call, *e.g.* ``full_diag``, ``maps_diag`` or ``folium_map``.
+    :type kind: str
+    :return: the dictionary with ``id``, ``kind``, ``file_id``, ``status``, ``error`` and ``duration`` of the rendering.
+    :rtype: dict
+
+    Exceptions are caught so that a failing member does not stop the rendering of the others, the traceback being reported in ``error``.
+    The status is ``cached`` if the figure was up-to-date and thus not rendered again (see ``figcache``).
+    The figure is closed once saved to release memory in long-lived workers.
+    """
+
+    # import pyplot in worker
+    import matplotlib.pyplot as plt
+
+    # render figure
+    file_id = "%s_%s" % (member.id, kind)
+    start = time.time()
+    try:
+        fig = getattr(member, kind)(fig_dir, file_id, plot_params)
+        status, error = ("cached" if fig is None else "ok"), ""
+    except Exception:
+        status, error = "failed", traceback.format_exc()
+    plt.close("all")
+    end = time.time()
+
+    # build rendering report
+    report = {"id":member.id, "kind":kind, "file_id":file_id, "status":status, "error":error, "duration":end-start}
+
+    return(report)
+
+
+# ================================================================================================ #
+# RENDER MEMBERS
+# ================================================================================================ #
+def render_members(members, fig_dir, plot_params, kind, workers=None):
+
+    """
+    Render a diagnostic figure of every member of a collection in a process pool.
+
+    :param members: list of GPS, TDR, AXY or GPS_TDR objects.
+    :type members: list
+    :param fig_dir: figure saving directory.
+    :type fig_dir: str
+    :param plot_params: plot parameters dictionary.
+    :type plot_params: dict
+    :param kind: name of the diagnostic method to call, *e.g.* ``full_diag``, ``maps_diag`` or ``folium_map``.
+    :type kind: str
+    :param workers: number of worker processes, every available core if None. Members are rendered serially in the current process if 1.
+    :type workers: int
+    :return: the dataframe with ``id``, ``kind``, ``file_id``, ``status``, ``error`` and ``duration`` columns where each row corresponds to one member.
+    :rtype: pandas.DataFrame
+
+    Every member is sent to a worker on its own, so that only its dataframes and parameters are serialised rather than the whole collection.
+    Workers use the non-interactive ``Agg`` backend. Figures are saved as ``<id>_<kind>`` in ``fig_dir``.
+
+    .. warning::
+        On platforms starting processes with ``spawn`` (Windows, macOS), the calling script must be protected by ``if __name__ == "__main__":``.
+    """
+
+    # check kind is a diagnostic method of members
+    if any([not hasattr(member, kind) for member in members]):
+        raise ValueError("Kind %s is not a method of every member of the collection." % (kind))
+
+    # create figure saving directory
+    os.makedirs(fig_dir, exist_ok=True)
+
+    # set number of workers
+    if workers is None:
+        workers = os.cpu_count()
+    workers = max(1, min(workers, len(members)))
+
+    # render members serially or in a process pool
+    if workers == 1:
+        reports = [render_member(member, fig_dir, plot_params, kind) for member in members]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+            futures = [executor.submit(render_member, member, fig_dir, plot_params, kind) for member in members]
+            reports = [future.result() for future in futures]
+
+    # build rendering report dataframe
+    df_reports = pd.DataFrame(reports, columns=["id", "kind", "file_id", "status", "error", "duration"])
+
+    return(df_reports)
+
+
+# ================================================================================================ #
+# RENDER COLLECTION
+# ================================================================================================ #
+def render_all(self, fig_dir, plot_params, kind="full_diag", workers=None):
+
+    """
+    Render a diagnostic figure of every member of the collection in parallel.
+
+    :param self: a GPS_Collection, TDR_Collection, GPS_TDR_Collection or AXY_Collection object.
+    :type self: cpforager.GPS_Collection | cpforager.TDR_Collection | cpforager.GPS_TDR_Collection | cpforager.AXY_Collection
+    :param fig_dir: figure saving directory.
+    :type fig_dir: str
+    :param plot_params: plot parameters dictionary.
+    :type plot_params: dict
+    :param kind: name of the diagnostic method of the members to call, *e.g.* ``full_diag``, ``maps_diag`` or ``folium_map``.
+    :type kind: str
+    :param workers: number of worker processes, every available core if None.
+    :type workers: int
+    :return: the dataframe reporting the rendering status of every member.
+    :rtype: pandas.DataFrame
+
+    Figures are saved as ``<id>_<kind>`` in ``fig_dir``. See ``render_members`` for the content of the report.
+    """
+
+    # get members
+    members = [self[k] for k in range(len(self))]
+
+    # render every member in a process pool
+    df_reports = render_members(members, fig_dir, plot_params, kind, workers)
+
+    return(df_reports)
@@ -0,0 +1,352 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import numpy as np
+import pandas as pd
+from scipy.signal import firwin, oaconvolve
+
+
+# ================================================================================================ #
+# TIME GRID
+# ================================================================================================ #
+def get_time_bins(datetimes, period):
+
+    """
+    Find the bin of a regular time grid of every datetime.
+
+    :param datetimes: sorted datetimes as int64 nanoseconds.
+    :type datetimes: numpy.ndarray(int64)
+    :param period: period of the grid in nanoseconds.
+    :type period: int
+    :return: the bin of every datetime and the starting datetime of every bin as int64 nanoseconds.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+
+    Bins are :math:`[t_k, t_k+T[` with :math:`t_k` the multiples of the period :math:`T` since the epoch, starting at the bin of the first datetime.
+    Grids of the same period are thus aligned whatever the logger.
+    """
+
+    # compute bins by integer division
+    if len(datetimes) == 0:
+        return(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    first_bin = datetimes[0]//period
+    bins = datetimes//period-first_bin
+    grid = (first_bin+np.arange(bins[-1]+1))*period
+
+    return(bins, grid)
+
+
+def get_chunk_bounds(bins, chunk_size):
+
+    """
+    Split sorted rows into chunks of whole bins.
+
+    :param bins: the nondecreasing bin of every row.
+    :type bins: numpy.ndarray(int64)
+    :param chunk_size: approximate number of rows by chunk, a single chunk if None.
+    :type chunk_size: int
+    :return: the first row of every chunk, plus the total number of rows.
+    :rtype: numpy.ndarray
+
+    Every chunk boundary is moved back to the first row of its bin, so that no bin is split between two chunks.
+    """
+
+    # align chunk boundaries on bins
+    n_rows = len(bins)
+    if n_rows == 0:
+        return(np.array([0]))
+    if chunk_size is None:
+        return(np.array([0, n_rows]))
+    bounds = np.arange(0, n_rows, max(int(chunk_size), 1))
+    bounds = np.searchsorted(bins, bins[bounds], side="left")
+    bounds = np.unique(np.append(bounds, n_rows))
+
+    return(bounds)
+
+
+def get_valid_bounds(valid_rows, row_0, row_1):
+
+    """
+    Extend rows to the previous and next valid values of a column.
+
+    :param valid_rows: sorted rows of the valid values of the column.
+    :type valid_rows: numpy.ndarray(int64)
+    :param row_0: first row.
+    :type row_0: int
+    :param row_1: last row plus one.
+    :type row_1: int
+    :return: the first row and the last row plus one, extended to the last valid value before row_0 and the first valid value from row_1.
+    :rtype: (int, int)
+
+    Missing values can span several chunks, hence a margin of a single row is not enough to find the values surrounding a chunk.
+    """
+
+    # find surrounding valid rows
+    k_0 = np.searchsorted(valid_rows, row_0, side="left")
+    k_1 = np.searchsorted(valid_rows, row_1, side="left")
+    idx_0 = min(valid_rows[k_0-1], row_0) if k_0 > 0 else row_0
+    idx_1 = max(valid_rows[k_1]+1, row_1) if k_1 < len(valid_rows) else row_1
+
+    return(int(idx_0), int(idx_1))
+
+
+# ================================================================================================ #
+# AGGREGATE AND INTERPOLATE
+# ================================================================================================ #
+def aggregate_bins(values, bins, n_bins, method):
+
+    """
+    Aggregate the values of every bin.
+
+    :param values: values of the rows.
+    :type values: numpy.ndarray
+    :param bins: the nondecreasing bin of every row, from 0 to n_bins-1.
+    :type bins: numpy.ndarray(int64)
+    :param n_bins: number of bins.
+    :type n_bins: int
+    :param method: ``"mean"``, ``"sum"``, ``"min"`` or ``"max"``.
+    :type method: str
+    :return: the aggregated value of every bin, NaN for bins without valid values.
+    :rtype: numpy.ndarray
+
+    Rows of a bin being contiguous, every aggregation is a single NumPy reduction over the segments of the bins. NaN values are ignored.
+    """
+
+    # find contiguous segments of bins
+    results = np.full(n_bins, np.nan)
+    if len(bins) == 0:
+        return(results)
+    is_start = np.ones(len(bins), dtype=bool)
+    is_start[1:] = (bins[1:] != bins[:-1])
+    starts = np.flatnonzero(is_start)
+    segments = bins[starts]
+
+    # reduce segments
+    is_value = ~np.isnan(values)
+    counts = np.add.reduceat(is_value.astype(np.int64), starts)
+    if method in ["mean", "sum"]:
+        sums = np.add.reduceat(np.where(is_value, values, 0.0), starts)
+        results[segments] = np.where(counts > 0, sums/np.maximum(counts, 1) if method == "mean" else sums, np.nan)
+    elif method == "min":
+        results[segments] = np.fmin.reduceat(values, starts)
+    elif method == "max":
+        results[segments] = np.fmax.reduceat(values, starts)
+
+    return(results)
+
+
+def interpolate_values(datetimes, values, grid, method, max_gap=None):
+
+    """
+    Interpolate values at the datetimes of a grid.
+
+    :param datetimes: sorted datetimes of the values as int64 nanoseconds.
+    :type datetimes: numpy.ndarray(int64)
+    :param values: values to interpolate.
+    :type values: numpy.ndarray
+    :param grid: sorted datetimes of the grid as int64 nanoseconds.
+    :type grid: numpy.ndarray(int64)
+    :param method: ``"linear"`` or ``"nearest"``.
+    :type method: str
+    :param max_gap: maximum duration in nanoseconds between the two valid values surrounding a grid datetime, no maximum if None.
+    :type max_gap: int
+    :return: the values at the grid datetimes, NaN outside the range of valid values or within gaps longer than max_gap.
+    :rtype: numpy.ndarray
+    """
+
+    # get valid values
+    is_value = ~np.isnan(values)
+    datetimes = datetimes[is_value]
+    values = values[is_value]
+    results = np.full(len(grid), np.nan)
+    if len(values) == 0:
+        return(results)
+
+    # find surrounding values of every grid datetime
+    idx_1 = np.searchsorted(datetimes, grid, side="left")
+    idx_0 = np.maximum(np.where((idx_1 < len(datetimes)) & (datetimes[np.minimum(idx_1, len(datetimes)-1)] == grid), idx_1, idx_1-1), 0)
+    idx_1 = np.minimum(idx_1, len(datetimes)-1)
+    is_inside = (grid >= datetimes[0]) & (grid <= datetimes[-1])
+    if max_gap is not None:
+        is_inside &= ((datetimes[idx_1]-datetimes[idx_0]) <= max_gap)
+
+    # interpolate
+    t_0 = datetimes[idx_0]
+    t_1 = datetimes[idx_1]
+    if method == "linear":
+        weights = np.divide((grid-t_0).astype(float), (t_1-t_0).astype(float), out=np.zeros(len(grid)), where=(t_1 > t_0))
+        results[is_inside] = (values[idx_0]+weights*(values[idx_1]-values[idx_0]))[is_inside]
+    elif method == "nearest":
+        results[is_inside] = np.where((grid-t_0) <= (t_1-grid), values[idx_0], values[idx_1])[is_inside]
+
+    return(results)
+
+
+def get_decimation_filter(period, step):
+
+    """
+    Design the anti-aliasing filter of a decimation.
+
+    :param period: period of the grid in nanoseconds.
+    :type period: int
+    :param step: sampling step of the values in nanoseconds.
+    :type step: int
+    :return: the taps of the low-pass FIR filter, None if the grid is not coarser than the sampling.
+    :rtype: numpy.ndarray
+
+    The filter is a Hamming-windowed FIR of :math:`20q+1` taps with a cutoff at the Nyquist frequency of the grid, :math:`q` being the decimation factor,
+    as in ``scipy.signal.decimate``. Its finite length allows to filter chunks independently with an overlap of half the taps.
+    """
+
+    # decimation factor
+    q = period/step
+    if q <= 1:
+        return(None)
+
+    # design low-pass filter
+    taps = firwin(2*int(np.ceil(10*q))+1, 1/q)
+
+    return(taps)
+
+
+def decimate_values(datetimes, values, grid, taps, idx_0, idx_1):
+
+    """
+    Low-pass filter values and interpolate them at the datetimes of a grid.
+
+    :param datetimes: sorted datetimes of the values as int64 nanoseconds.
+    :type datetimes: numpy.ndarray(int64)
+    :param values: values, including the valid values surrounding the filter margins.
+    :type values: numpy.ndarray
+    :param grid: sorted datetimes of the grid as int64 nanoseconds.
+    :type grid: numpy.ndarray(int64)
+    :param taps: taps of the low-pass FIR filter, values are not filtered if None.
+    :type taps: numpy.ndarray
+    :param idx_0: first row needed to interpolate at the grid datetimes.
+    :type idx_0: int
+    :param idx_1: last row plus one needed to interpolate at the grid datetimes.
+    :type idx_1: int
+    :return: the filtered values at the grid datetimes.
+    :rtype: numpy.ndarray
+
+    Rows ``idx_0:idx_1`` are filtered with a zero-phase convolution, reading half the taps on both sides and repeating the edge values beyond the
+    recording, hence the result does not depend on the chunk. Missing values are linearly interpolated between their surrounding valid values
+    before filtering (see ``get_valid_bounds``).
+    """
+
+    # filter rows with margins
+    if taps is not None:
+        h = len(taps)//2
+        is_value = ~np.isnan(values)
+        if is_value.sum() == 0:
+            return(np.full(len(grid), np.nan))
+        values = np.interp(np.arange(len(values)), np.flatnonzero(is_value), values[is_value])
+        x = values[max(idx_0-h, 0):min(idx_1+h, len(values))]
+        x = np.pad(x, (h-(idx_0-max(idx_0-h, 0)), h-(min(idx_1+h, len(values))-idx_1)), mode="edge")
+        filtered = oaconvolve(x, taps, mode="valid")
+
+        # interpolate filtered rows at grid datetimes
+        results = interpolate_values(datetimes[idx_0:idx_1], filtered, grid, "linear")
+
+    # interpolate valid values at grid datetimes
+    else:
+        results = interpolate_values(datetimes, values, grid, "linear")
+
+    return(results)
+
+
+# ================================================================================================ #
+# RESAMPLE DATAFRAME
+# ================================================================================================ #
+def resample_dataframe(df, period, columns_methods, chunk_size=1000000, max_gap=None):
+
+    """
+    Resample the columns of a dataframe on a regular time grid.
+
+    :param df: dataframe sorted by its ``datetime`` column.
+    :type df: pandas.DataFrame
+    :param period: period of the grid in seconds.
+    :type period: float
+    :param columns_methods: dictionary giving for each column to resample the method to apply.
+    :type columns_methods: dict
+    :param chunk_size: approximate number of rows processed at once, every row at once if None.
+    :type chunk_size: int
+    :param max_gap: maximum duration in seconds between the measures surrounding an interpolated datetime, no maximum if None.
+    :type max_gap: float
+    :return: the resampled dataframe with the ``datetime`` column of the grid and the resampled columns.
+    :rtype: pandas.DataFrame
+
+    Every measure is assigned by integer division of its int64 datetime to the bin :math:`[t_k, t_k+T[` of the grid (see ``get_time_bins``),
+    whose starting datetime :math:`t_k` is the datetime of the resampled row. Aggregations summarize the measures of every bin, which suits
+    downsampling, while interpolations and decimations evaluate the columns at :math:`t_k`, which suits upsampling and regular signals respectively.
+    Rows are processed by chunks of whole bins with the margins needed by interpolations and filters, hence the result does not depend on the
+    chunk size and the memory is bounded on long recordings. Find below the exhaustive table of possible methods.
+
+    .. csv-table::
+        :header: "method", "description"
+        :widths: auto
+
+        ``mean``, "mean of the measures of the bin"
+        ``sum``, "sum of the measures of the bin"
+        ``min``, "minimum of the measures of the bin"
+        ``max``, "maximum of the measures of the bin"
+        ``decimate``, "anti-aliased decimation, *i.e.* low-pass filtering at the Nyquist frequency of the grid before linear interpolation at :math:`t_k`"
+        ``linear``, "linear interpolation at :math:`t_k`"
+        ``nearest``, "value of the measure nearest to :math:`t_k`, *e.g.* for trip or dive numbers"
+
+    .. note::
+        Decimation assumes regularly sampled measures at the median step of the recording, *e.g.* accelerations or pressures.
+    """
+
+    # check methods
+    methods_possible_values = ["mean", "sum", "min", "max", "decimate", "linear", "nearest"]
+    for c, method in columns_methods.items():
+        if method not in methods_possible_values:
+            raise ValueError("Method %s of column %s is not among %s." % (method, c, ", ".join(methods_possible_values)))
+
+    # get int64 datetimes and bins
+    datetimes = df["datetime"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    period = int(round(period*1e9))
+    max_gap = None if max_gap is None else int(round(max_gap*1e9))
+    bins, grid = get_time_bins(datetimes, period)
+    n_bins = len(grid)
+
+    # design decimation filter
+    step = int(np.median(np.diff(datetimes))) if len(datetimes) > 1 else period
+    taps = get_decimation_filter(period, max(step, 1)) if "decimate" in columns_methods.values() else None
+
+    # get rows of valid values of interpolated columns
+    valid_rows = {c:np.flatnonzero(df[c].notna().to_numpy()) for c, method in columns_methods.items() if method in ["decimate", "linear", "nearest"]}
+
+    # resample by chunk of whole bins
+    results = {c:np.full(n_bins, np.nan) for c in columns_methods}
+    bounds = get_chunk_bounds(bins, chunk_size)
+    for (r0, r1) in zip(bounds[:-1], bounds[1:]):
+
+        # bins of the chunk, including the empty bins before the next chunk
+        b0 = bins[r0]
+        b1 = bins[r1] if r1 < len(bins) else n_bins
+        chunk_grid = grid[b0:b1]
+
+        # rows surrounding the grid datetimes of the chunk
+        i0 = max(r0-1, 0)
+        i1 = min(r1+1, len(bins))
+
+        # resample every column
+        for c, method in columns_methods.items():
+            if method in ["mean", "sum", "min", "max"]:
+                values = df[c].iloc[r0:r1].to_numpy(dtype=float, na_value=np.nan)
+                results[c][b0:b1] = aggregate_bins(values, bins[r0:r1]-b0, b1-b0, method)
+            elif method in ["linear", "nearest"]:
+                j0, j1 = get_valid_bounds(valid_rows[c], i0, i1)
+                values = df[c].iloc[j0:j1].to_numpy(dtype=float, na_value=np.nan)
+                results[c][b0:b1] = interpolate_values(datetimes[j0:j1], values, chunk_grid, method, max_gap)
+            elif method == "decimate":
+                h = 0 if taps is None else len(taps)//2
+                j0, j1 = get_valid_bounds(valid_rows[c], max(i0-h, 0), min(i1+h, len(bins)))
+                values = df[c].iloc[j0:j1].to_numpy(dtype=float, na_value=np.nan)
+                results[c][b0:b1] = decimate_values(datetimes[j0:j1], values, chunk_grid, taps, i0-j0, i1-j0)
+
+    # build resampled dataframe
+    df_resampled = pd.DataFrame({"datetime":grid.astype("datetime64[ns]")} | results)
+
+    return(df_resampled)
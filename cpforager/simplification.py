@@ -0,0 +1,419 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import numpy as np
+import shapely
+
+
+# ================================================================================================ #
+# PROJECT POSITIONS
+# ================================================================================================ #
+def project_positions(longitudes, latitudes, projection="colony", center_lon=None, center_lat=None):
+
+    """
+    Project positions onto metric coordinates.
+
+    :param longitudes: longitudes in degrees.
+    :type longitudes: numpy.ndarray
+    :param latitudes: latitudes in degrees.
+    :type latitudes: numpy.ndarray
+    :param projection: ``"colony"`` for the equirectangular projection centred on (center_lon, center_lat), ``"geodesic"`` for the earth-centred cartesian coordinates.
+    :type projection: str
+    :param center_lon: longitude in degrees of the projection centre, a scalar or one value by position. Mean longitude if None or NaN, 0 without valid longitude.
+    :type center_lon: float | numpy.ndarray
+    :param center_lat: latitude in degrees of the projection centre, a scalar or one value by position. Mean latitude if None or NaN, 0 without valid latitude.
+    :type center_lat: float | numpy.ndarray
+    :return: the array of coordinates in metres, of shape (n, 2) with the ``"colony"`` projection and (n, 3) with the ``"geodesic"`` projection.
+    :rtype: numpy.ndarray
+
+    The ``"colony"`` projection is accurate within the foraging range around the colony. The ``"geodesic"`` coordinates lie on the earth sphere,
+    hence euclidean distances are chords whose difference with the great-circle distances is negligible at the scale of a simplification tolerance.
+    """
+
+    # earth mean radius in metres
+    r_earth = 6371008.8
+
+    # convert degrees to radians
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+
+    # project positions
+    if projection == "colony":
+        mean_lon = np.degrees(np.nanmean(lon)) if np.isfinite(lon).any() else 0.0
+        mean_lat = np.degrees(np.nanmean(lat)) if np.isfinite(lat).any() else 0.0
+        lon_0 = np.radians(np.where(np.isfinite(center_lon), center_lon, mean_lon) if center_lon is not None else mean_lon)
+        lat_0 = np.radians(np.where(np.isfinite(center_lat), center_lat, mean_lat) if center_lat is not None else mean_lat)
+        dlon = (lon-lon_0+np.pi) % (2*np.pi)-np.pi
+        coordinates = np.column_stack([r_earth*np.cos(lat_0)*dlon, r_earth*(lat-lat_0)])
+    elif projection == "geodesic":
+        coordinates = np.column_stack([r_earth*np.cos(lat)*np.cos(lon), r_earth*np.cos(lat)*np.sin(lon), r_earth*np.sin(lat)])
+    else:
+        raise ValueError("Projection %s is not among colony and geodesic." % (projection))
+
+    return(coordinates)
+
+
+# ================================================================================================ #
+# RUNS
+# ================================================================================================ #
+def get_runs(labels, offsets):
+
+    """
+    Find the contiguous runs of rows sharing the same label.
+
+    :param labels: the labels of the rows, *e.g.* the trip numbers, concatenated over several loggers.
+    :type labels: numpy.ndarray
+    :param offsets: the positions of the first row of every logger, plus the total number of rows.
+    :type offsets: numpy.ndarray
+    :return: the first row and the last row plus one of every run.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+
+    A run starts wherever the label changes or a logger starts.
+    """
+
+    # find run boundaries
+    labels = np.asarray(labels)
+    n_rows = len(labels)
+    is_start = np.zeros(n_rows, dtype=bool)
+    is_start[np.asarray(offsets[:-1])[np.asarray(offsets[:-1]) < n_rows]] = True
+    is_start[1:] |= (labels[1:] != labels[:-1])
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], n_rows)
+
+    return(starts, ends)
+
+
+# ================================================================================================ #
+# GEOMETRY
+# ================================================================================================ #
+def get_segment_distances(points, a, b):
+
+    """
+    Compute the distances between points and segments.
+
+    :param points: coordinates of the points, of shape (n, d).
+    :type points: numpy.ndarray
+    :param a: coordinates of the first ends of the segments, of shape (n, d).
+    :type a: numpy.ndarray
+    :param b: coordinates of the second ends of the segments, of shape (n, d).
+    :type b: numpy.ndarray
+    :return: the distance between every point and its segment.
+    :rtype: numpy.ndarray
+
+    The distance to the segment, rather than to the line, is used so that loops such as foraging trips, whose ends are both at the colony, are handled.
+    """
+
+    # project points onto segments
+    ab = b-a
+    ap = points-a
+    ab_2 = np.sum(ab*ab, axis=1)
+    t = np.divide(np.sum(ap*ab, axis=1), ab_2, out=np.zeros(len(ab_2)), where=(ab_2 > 0))
+    t = np.clip(t, 0, 1)
+
+    # distance to projections
+    distances = np.sqrt(np.sum((ap-t[:, None]*ab)**2, axis=1))
+
+    return(distances)
+
+
+def get_triangle_areas(a, b, c):
+
+    """
+    Compute the areas of triangles.
+
+    :param a: coordinates of the first vertices, of shape (n, d).
+    :type a: numpy.ndarray
+    :param b: coordinates of the second vertices, of shape (n, d).
+    :type b: numpy.ndarray
+    :param c: coordinates of the third vertices, of shape (n, d).
+    :type c: numpy.ndarray
+    :return: the area of every triangle.
+    :rtype: numpy.ndarray
+
+    The Lagrange identity :math:`\\|u \\times v\\|^2 = \\|u\\|^2\\|v\\|^2-(u \\cdot v)^2` makes the computation valid whatever the dimension d.
+    """
+
+    # compute areas from edge vectors
+    u = b-a
+    v = c-a
+    areas = 0.5*np.sqrt(np.clip(np.sum(u*u, axis=1)*np.sum(v*v, axis=1)-np.sum(u*v, axis=1)**2, 0, None))
+
+    return(areas)
+
+
+# ================================================================================================ #
+# DOUGLAS-PEUCKER
+# ================================================================================================ #
+def douglas_peucker_mask(coordinates, starts, ends, tolerance):
+
+    """
+    Simplify runs of positions with the Douglas-Peucker algorithm.
+
+    :param coordinates: metric coordinates of the positions, of shape (n, d).
+    :type coordinates: numpy.ndarray
+    :param starts: the first row of every run.
+    :type starts: numpy.ndarray
+    :param ends: the last row plus one of every run.
+    :type ends: numpy.ndarray
+    :param tolerance: maximum distance in metres between a removed position and the simplified line.
+    :type tolerance: float
+    :return: the mask of the kept positions.
+    :rtype: numpy.ndarray(bool)
+
+    Planar coordinates are simplified by ``shapely.simplify`` on the lines of every run built at once, the row of every position being carried as
+    the third coordinate so that the kept rows are read back from the simplified lines. Otherwise, *e.g.* for ``"geodesic"`` coordinates, the segments of
+    every run are split in lockstep: at every iteration the farthest position of every pending segment is found at once by vectorized operations, and
+    segments whose farthest position is beyond the tolerance are split at this position. The number of iterations is the depth of the recursion, usually
+    logarithmic in the number of positions. Both ways keep the same positions, including the first and last positions of every run.
+    """
+
+    # keep run ends
+    is_kept = np.zeros(len(coordinates), dtype=bool)
+    is_kept[starts] = True
+    is_kept[ends-1] = True
+
+    # simplify planar lines with shapely
+    if coordinates.shape[1] == 2:
+        is_line = (ends-starts) >= 2
+        n_rows = ends[is_line]-starts[is_line]
+        rows = np.repeat(starts[is_line]-np.cumsum(n_rows)+n_rows, n_rows)+np.arange(np.sum(n_rows))
+        lines = shapely.linestrings(np.column_stack([coordinates[rows], rows]), indices=np.repeat(np.arange(len(n_rows)), n_rows))
+        lines = shapely.simplify(lines, tolerance, preserve_topology=False)
+        is_kept[shapely.get_coordinates(lines, include_z=True)[:, 2].astype(np.int64)] = True
+        return(is_kept)
+
+    # pending segments with interior positions
+    seg_a = np.asarray(starts)
+    seg_b = np.asarray(ends)-1
+    is_pending = (seg_b-seg_a) >= 2
+    seg_a = seg_a[is_pending]
+    seg_b = seg_b[is_pending]
+
+    # split segments in lockstep
+    while len(seg_a) > 0:
+
+        # interior positions of every segment
+        n_interior = seg_b-seg_a-1
+        first_interior = np.cumsum(n_interior)-n_interior
+        seg_indices = np.repeat(np.arange(len(seg_a)), n_interior)
+        interior = seg_a[seg_indices]+1+np.arange(len(seg_indices))-first_interior[seg_indices]
+
+        # farthest position of every segment
+        distances = get_segment_distances(coordinates[interior], coordinates[seg_a[seg_indices]], coordinates[seg_b[seg_indices]])
+        max_distances = np.maximum.reduceat(distances, first_interior)
+        is_max = np.flatnonzero(distances == max_distances[seg_indices])
+        splits = interior[is_max[np.unique(seg_indices[is_max], return_index=True)[1]]]
+
+        # split segments beyond tolerance
+        is_split = max_distances > tolerance
+        splits = splits[is_split]
+        is_kept[splits] = True
+        seg_a, seg_b = np.concatenate([seg_a[is_split], splits]), np.concatenate([splits, seg_b[is_split]])
+        is_pending = (seg_b-seg_a) >= 2
+        seg_a = seg_a[is_pending]
+        seg_b = seg_b[is_pending]
+
+    return(is_kept)
+
+
+# ================================================================================================ #
+# VISVALINGAM-WHYATT
+# ================================================================================================ #
+def visvalingam_mask(coordinates, starts, ends, tolerance):
+
+    """
+    Simplify runs of positions with the Visvalingam-Whyatt algorithm.
+
+    :param coordinates: metric coordinates of the positions, of shape (n, d).
+    :type coordinates: numpy.ndarray
+    :param starts: the first row of every run.
+    :type starts: numpy.ndarray
+    :param ends: the last row plus one of every run.
+    :type ends: numpy.ndarray
+    :param tolerance: tolerance in metres, positions whose effective area is below the square of the tolerance are removed.
+    :type tolerance: float
+    :return: the mask of the kept positions.
+    :rtype: numpy.ndarray(bool)
+
+    The effective area of a position is the area of the triangle it forms with its remaining neighbours. Instead of removing the smallest area one position
+    at a time, every position whose area is below the threshold and is the minimum within two remaining positions on both sides is removed at once, hence
+    removed positions never share a neighbour whose area they both change, and the areas are updated at the next iteration. Ties are broken by keeping
+    one position out of three within a row of equal minima. The first and last positions of every run are kept.
+    """
+
+    # remaining positions and run ends
+    threshold = tolerance**2
+    remaining = np.arange(len(coordinates))
+    is_end = np.zeros(len(coordinates), dtype=bool)
+    is_end[starts] = True
+    is_end[ends-1] = True
+
+    # remove local minima in lockstep
+    while True:
+
+        # effective areas of the remaining interior positions
+        areas = np.full(len(remaining), np.inf)
+        interior = np.flatnonzero(~is_end[remaining])
+        areas[interior] = get_triangle_areas(coordinates[remaining[interior-1]], coordinates[remaining[interior]], coordinates[remaining[interior+1]])
+
+        # minima within two positions on both sides below threshold
+        n_remaining = len(remaining)
+        padded_areas = np.concatenate([[np.inf, np.inf], areas, [np.inf, np.inf]])
+        is_candidate = (areas < threshold)
+        for k in [1, 2]:
+            is_candidate &= (areas <= padded_areas[2-k:2-k+n_remaining]) & (areas <= padded_areas[2+k:2+k+n_remaining])
+        if not is_candidate.any():
+            break
+
+        # remove one candidate out of three within rows of close candidates
+        candidates = np.flatnonzero(is_candidate)
+        is_row_start = np.ones(len(candidates), dtype=bool)
+        is_row_start[1:] = (np.diff(candidates) > 2)
+        row_starts = candidates[is_row_start][np.cumsum(is_row_start)-1]
+        is_removed = np.zeros(n_remaining, dtype=bool)
+        is_removed[candidates[(candidates-row_starts) % 3 == 0]] = True
+        remaining = remaining[~is_removed]
+
+    # build mask of kept positions
+    is_kept = np.zeros(len(coordinates), dtype=bool)
+    is_kept[remaining] = True
+
+    return(is_kept)
+
+
+# ================================================================================================ #
+# SIMPLIFICATION MASK
+# ================================================================================================ #
+def get_simplified_mask(longitudes, latitudes, tolerance, labels=None, offsets=None, algorithm="douglas_peucker", projection="colony", center_lon=None, center_lat=None):
+
+    """
+    Compute the mask of the positions kept by the simplification of trajectories.
+
+    :param longitudes: longitudes in degrees.
+    :type longitudes: numpy.ndarray
+    :param latitudes: latitudes in degrees.
+    :type latitudes: numpy.ndarray
+    :param tolerance: tolerance in metres of the simplification.
+    :type tolerance: float
+    :param labels: the labels of the positions, *e.g.* the trip numbers, runs of equal labels being simplified independently. A single run if None.
+    :type labels: numpy.ndarray
+    :param offsets: the positions of the first row of every logger, plus the total number of rows. A single logger if None.
+    :type offsets: numpy.ndarray
+    :param algorithm: ``"douglas_peucker"`` or ``"visvalingam"``.
+    :type algorithm: str
+    :param projection: ``"colony"`` or ``"geodesic"``, see ``project_positions``.
+    :type projection: str
+    :param center_lon: longitude in degrees of the colony projection centre, a scalar or one value by position.
+    :type center_lon: float | numpy.ndarray
+    :param center_lat: latitude in degrees of the colony projection centre, a scalar or one value by position.
+    :type center_lat: float | numpy.ndarray
+    :return: the mask of the kept positions.
+    :rtype: numpy.ndarray(bool)
+
+    Every run of every logger is simplified at once. Positions with missing longitude or latitude are never kept.
+    """
+
+    # get valid positions
+    longitudes = np.asarray(longitudes, dtype=float)
+    latitudes = np.asarray(latitudes, dtype=float)
+    n_rows = len(longitudes)
+    labels = np.zeros(n_rows, dtype=np.int64) if labels is None else np.asarray(labels)
+    offsets = np.array([0, n_rows]) if offsets is None else np.asarray(offsets)
+    is_valid = np.isfinite(longitudes) & np.isfinite(latitudes)
+    valid_rows = np.flatnonzero(is_valid)
+
+    # nothing to simplify without valid positions
+    if len(valid_rows) == 0:
+        return(np.zeros(n_rows, dtype=bool))
+
+    # project valid positions
+    center_lon = center_lon[valid_rows] if np.ndim(center_lon) > 0 else center_lon
+    center_lat = center_lat[valid_rows] if np.ndim(center_lat) > 0 else center_lat
+    coordinates = project_positions(longitudes[valid_rows], latitudes[valid_rows], projection, center_lon, center_lat)
+
+    # find runs among valid positions
+    starts, ends = get_runs(labels[valid_rows], np.searchsorted(valid_rows, offsets))
+
+    # simplify runs
+    if algorithm == "douglas_peucker":
+        is_kept = douglas_peucker_mask(coordinates, starts, ends, tolerance)
+    elif algorithm == "visvalingam":
+        is_kept = visvalingam_mask(coordinates, starts, ends, tolerance)
+    else:
+        raise ValueError("Algorithm %s is not among douglas_peucker and visvalingam." % (algorithm))
+
+    # build mask over every position
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[valid_rows[is_kept]] = True
+
+    return(mask)
+
+
+# ================================================================================================ #
+# GPS SIMPLIFICATION MASK
+# ================================================================================================ #
+def get_gps_simplified_mask(gps, tolerance, algorithm="douglas_peucker", projection="colony"):
+
+    """
+    Compute the mask of the GPS positions kept by the simplification of every trip.
+
+    :param gps: a GPS object.
+    :type gps: cpforager.GPS
+    :param tolerance: tolerance in metres of the simplification.
+    :type tolerance: float
+    :param algorithm: ``"douglas_peucker"`` or ``"visvalingam"``.
+    :type algorithm: str
+    :param projection: ``"colony"`` for the projection centred on the nest position or ``"geodesic"``.
+    :type projection: str
+    :return: the mask of the kept rows of the GPS dataframe.
+    :rtype: numpy.ndarray(bool)
+
+    Trips and the periods between them are simplified independently so that trip boundaries are kept. Any column is subset consistently with the mask.
+    """
+
+    # get gps data
+    df = gps.df
+
+    # compute mask
+    mask = get_simplified_mask(df["longitude"].to_numpy(dtype=float, na_value=np.nan), df["latitude"].to_numpy(dtype=float, na_value=np.nan), tolerance,
+                               df["trip"].to_numpy(), None, algorithm, projection, gps.nest_position[0], gps.nest_position[1])
+
+    return(mask)
+
+
+# ================================================================================================ #
+# GPS COLLECTION SIMPLIFICATION MASK
+# ================================================================================================ #
+def get_gps_collection_simplified_mask(gps_collection, tolerance, algorithm="douglas_peucker", projection="colony"):
+
+    """
+    Compute the mask of the GPS positions kept by the simplification of every trip of a collection.
+
+    :param gps_collection: a GPS_Collection object.
+    :type gps_collection: cpforager.GPS_Collection
+    :param tolerance: tolerance in metres of the simplification.
+    :type tolerance: float
+    :param algorithm: ``"douglas_peucker"`` or ``"visvalingam"``.
+    :type algorithm: str
+    :param projection: ``"colony"`` for the projection centred on the nest position of every GPS or ``"geodesic"``.
+    :type projection: str
+    :return: the mask of the kept rows of ``df_all`` of the GPS collection, the rows of GPS k being between ``offsets[k]`` and ``offsets[k+1]``.
+    :rtype: numpy.ndarray(bool)
+
+    Every trip of every GPS is simplified in a single vectorized pass over the columnar store of the GPS collection.
+    """
+
+    # get columnar store
+    store = gps_collection.store
+    offsets = gps_collection.offsets
+
+    # nest position of every row
+    n_rows = np.diff(offsets)
+    center_lon = np.repeat([gps.nest_position[0] for gps in gps_collection.gps_collection], n_rows)
+    center_lat = np.repeat([gps.nest_position[1] for gps in gps_collection.gps_collection], n_rows)
+
+    # compute mask
+    mask = get_simplified_mask(store["longitude"].astype(float), store["latitude"].astype(float), tolerance, store["trip"], offsets,
+                               algorithm, projection, center_lon, center_lat)
+
+    return(mask)
@@ -0,0 +1,248 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+import numpy as np
+
+
+# ================================================================================================ #
+# BUILD SKETCH
+# ================================================================================================ #
+def build_sketch(values, relative_accuracy=0.01):
+
+    """
+    Build the mergeable quantile sketch of an array of values.
+
+    :param values: array of values.
+    :type values: numpy.ndarray
+    :param relative_accuracy: relative accuracy :math:`\\alpha` of the quantiles estimated from the sketch.
+    :type relative_accuracy: float
+    :return: the sketch dictionary.
+    :rtype: dict
+
+    Values are counted in logarithmic buckets :math:`]\\gamma^{k-1}, \\gamma^k]` with :math:`\\gamma=(1+\\alpha)/(1-\\alpha)`, negative values in the mirrored buckets
+    and zeros in a dedicated bucket. Every quantile is thus estimated within a relative error :math:`\\alpha`, and sketches built with the same accuracy
+    are merged by summing the counts of their buckets. The memory depends on the range of the values only, not on their number. NaN values are ignored.
+    Find below the exhaustive table of the sketch keys.
+
+    .. csv-table::
+        :header: "name", "description"
+        :widths: auto
+
+        ``gamma``, "ratio between consecutive bucket bounds"
+        ``positive_keys``, "sorted keys of the non-empty buckets of positive values"
+        ``positive_counts``, "number of values of the non-empty buckets of positive values"
+        ``negative_keys``, "sorted keys of the non-empty buckets of negative values"
+        ``negative_counts``, "number of values of the non-empty buckets of negative values"
+        ``zero_count``, "number of zeros"
+        ``n``, "number of values"
+        ``min``, "minimum value"
+        ``max``, "maximum value"
+        ``sum``, "sum of values"
+    """
+
+    # get valid values
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    gamma = (1+relative_accuracy)/(1-relative_accuracy)
+
+    # count values by logarithmic bucket
+    positive_keys, positive_counts = np.unique(np.ceil(np.log(values[values > 0])/np.log(gamma)).astype(np.int64), return_counts=True)
+    negative_keys, negative_counts = np.unique(np.ceil(np.log(-values[values < 0])/np.log(gamma)).astype(np.int64), return_counts=True)
+
+    # build sketch dictionary
+    sketch = {"gamma":gamma,
+              "positive_keys":positive_keys, "positive_counts":positive_counts.astype(np.int64),
+              "negative_keys":negative_keys, "negative_counts":negative_counts.astype(np.int64),
+              "zero_count":int(np.sum(values == 0)), "n":len(values),
+              "min":values.min() if len(values) > 0 else np.nan,
+              "max":values.max() if len(values) > 0 else np.nan,
+              "sum":values.sum()}
+
+    return(sketch)
+
+
+# ================================================================================================ #
+# MERGE SKETCHES
+# ================================================================================================ #
+def merge_buckets(keys_list, counts_list):
+
+    """
+    Merge the buckets of several sketches.
+
+    :param keys_list: list of bucket keys arrays.
+    :type keys_list: list[numpy.ndarray]
+    :param counts_list: list of bucket counts arrays.
+    :type counts_list: list[numpy.ndarray]
+    :return: the sorted keys and the summed counts of the merged buckets.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+
+    # sum counts by key
+    keys = np.concatenate([np.zeros(0, dtype=np.int64)]+list(keys_list))
+    counts = np.concatenate([np.zeros(0, dtype=np.int64)]+list(counts_list))
+    merged_keys, inverse = np.unique(keys, return_inverse=True)
+    merged_counts = np.bincount(inverse, weights=counts, minlength=len(merged_keys)).astype(np.int64)
+
+    return(merged_keys, merged_counts)
+
+
+def merge_sketches(sketches):
+
+    """
+    Merge a list of sketches into a single sketch.
+
+    :param sketches: list of sketch dictionaries built with the same relative accuracy.
+    :type sketches: list[dict]
+    :return: the merged sketch dictionary.
+    :rtype: dict
+
+    The merged sketch is identical to the sketch built from the concatenated values.
+    """
+
+    # check sketches share the same buckets
+    if len(sketches) == 0:
+        raise ValueError("At least one sketch is required to merge sketches.")
+    if any([not np.isclose(s["gamma"], sketches[0]["gamma"]) for s in sketches]):
+        raise ValueError("Sketches must be built with the same relative accuracy to be merged.")
+
+    # merge buckets
+    positive_keys, positive_counts = merge_buckets([s["positive_keys"] for s in sketches], [s["positive_counts"] for s in sketches])
+    negative_keys, negative_counts = merge_buckets([s["negative_keys"] for s in sketches], [s["negative_counts"] for s in sketches])
+
+    # build merged sketch dictionary
+    sketch = {"gamma":sketches[0]["gamma"],
+              "positive_keys":positive_keys, "positive_counts":positive_counts,
+              "negative_keys":negative_keys, "negative_counts":negative_counts,
+              "zero_count":sum([s["zero_count"] for s in sketches]), "n":sum([s["n"] for s in sketches]),
+              "min":np.nanmin([s["min"] for s in sketches]) if any([s["n"] > 0 for s in sketches]) else np.nan,
+              "max":np.nanmax([s["max"] for s in sketches]) if any([s["n"] > 0 for s in sketches]) else np.nan,
+              "sum":sum([s["sum"] for s in sketches])}
+
+    return(sketch)
+
+
+# ================================================================================================ #
+# SKETCH BUCKETS
+# ================================================================================================ #
+def get_sketch_buckets(sketch):
+
+    """
+    Get the representative values and counts of the buckets of a sketch in increasing order.
+
+    :param sketch: the sketch dictionary.
+    :type sketch: dict
+    :return: the representative values and the counts of the buckets.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+
+    The representative value :math:`2\\gamma^k/(\\gamma+1)` of bucket :math:`k` is within a relative error :math:`\\alpha` of every value of the bucket.
+    Representative values are clipped to the minimum and maximum values of the sketch.
+    """
+
+    # compute representative values of buckets
+    gamma = sketch["gamma"]
+    positive_values = 2*gamma**sketch["positive_keys"].astype(float)/(gamma+1)
+    negative_values = -2*gamma**sketch["negative_keys"].astype(float)/(gamma+1)
+
+    # sort buckets in increasing order
+    values = np.concatenate([negative_values[::-1], [0.0], positive_values])
+    counts = np.concatenate([sketch["negative_counts"][::-1], [sketch["zero_count"]], sketch["positive_counts"]])
+    is_filled = counts > 0
+    values = np.clip(values[is_filled], sketch["min"], sketch["max"])
+    counts = counts[is_filled]
+
+    return(values, counts)
+
+
+# ================================================================================================ #
+# SKETCH QUANTILES
+# ================================================================================================ #
+def get_sketch_quantiles(sketch, quantiles):
+
+    """
+    Estimate quantiles from a sketch.
+
+    :param sketch: the sketch dictionary.
+    :type sketch: dict
+    :param quantiles: quantiles to estimate in [0, 1].
+    :type quantiles: array-like of floats
+    :return: the estimated quantiles, NaN if the sketch is empty.
+    :rtype: numpy.ndarray
+
+    The quantile :math:`q` is the representative value of the bucket containing the value of rank :math:`\\lfloor q(n-1) \\rfloor`, *i.e.* the lower
+    interpolation of ``pandas.Series.quantile``, within a relative error :math:`\\alpha`. Quantiles 0 and 1 are the exact minimum and maximum.
+    """
+
+    # get buckets
+    quantiles = np.atleast_1d(np.asarray(quantiles, dtype=float))
+    if sketch["n"] == 0:
+        return(np.full(len(quantiles), np.nan))
+    values, counts = get_sketch_buckets(sketch)
+
+    # find bucket of every rank
+    ranks = np.floor(quantiles*(sketch["n"]-1))
+    idx = np.searchsorted(np.cumsum(counts), ranks, side="right")
+    q_values = values[np.minimum(idx, len(values)-1)]
+
+    # exact extreme quantiles
+    q_values[quantiles <= 0] = sketch["min"]
+    q_values[quantiles >= 1] = sketch["max"]
+
+    return(q_values)
+
+
+# ================================================================================================ #
+# SKETCH HISTOGRAM
+# ================================================================================================ #
+def get_sketch_histogram(sketch, bins=10):
+
+    """
+    Estimate the histogram of the values from a sketch.
+
+    :param sketch: the sketch dictionary.
+    :type sketch: dict
+    :param bins: number of bins or bin edges.
+    :type bins: int | list[float]
+    :return: the density and the bin edges of the histogram, the density being zero if the sketch is empty.
+    :rtype: (numpy.ndarray, numpy.ndarray)
+
+    Counts of every bucket are assigned to the bin of its representative value, bins spanning the range of the values if their number is given.
+    """
+
+    # get buckets
+    values, counts = get_sketch_buckets(sketch)
+
+    # histogram of bucket values weighted by counts
+    value_range = (sketch["min"], sketch["max"]) if sketch["n"] > 0 else (0, 1)
+    density, edges = np.histogram(values, bins=bins, range=value_range if np.isscalar(bins) else None, weights=counts, density=(sketch["n"] > 0))
+    density = density.astype(float)
+
+    return(density, edges)
+
+
+# ================================================================================================ #
+# MERGED SKETCHES OF DATAFRAMES
+# ================================================================================================ #
+def build_merged_sketches(dfs, columns, relative_accuracy=0.01):
+
+    """
+    Build the sketches of dataframe columns, one dataframe at a time, and merge them.
+
+    :param dfs: list of dataframes with the given columns, *e.g.* the trip statistics of every logger of a collection.
+    :type dfs: list[pandas.DataFrame]
+    :param columns: list of column names.
+    :type columns: list[str]
+    :param relative_accuracy: relative accuracy of the quantiles estimated from the sketches.
+    :type relative_accuracy: float
+    :return: the dictionary of merged sketches where keys are the column names.
+    :rtype: dict
+
+    Dataframes are never concatenated, only their sketches are kept in memory.
+    """
+
+    # build and merge sketches by column
+    sketches = {}
+    for column in columns:
+        column_sketches = [build_sketch(df[column].to_numpy(dtype=float, na_value=np.nan), relative_accuracy) for df in dfs]
+        sketches[column] = merge_sketches(column_sketches) if len(column_sketches) > 0 else build_sketch([], relative_accuracy)
+
+    return(sketches)
@@ -2,7 +2,7 @@
 # LIBRARIES
 # ======================================================= #
 import os
-from cpforager import diagnostic
+from cpforager import diagnostic, figcache
 import matplotlib.pyplot as plt
 
 
@@ -22,7 +22,7 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     :type file_id: str
     :param plot_params: plot parameters dictionary. 
     :type plot_params: dict
-    :return: the full diagnostic figure.
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     """
     
@@ -43,6 +43,10 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     mean_temperature = self.mean_temperature
     dive_statistics = self.dive_statistics
 
+    # skip rendering if the figure is up-to-date
+    fig_key = figcache.get_figure_key("full_diag", [df, group, id, params], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "full_diag", fig_key, plot_params): return(None)
+
     # get parameters
     diving_depth_threshold = params.get("diving_depth_threshold")
     
@@ -92,7 +96,8 @@ def full_diagnostic(self, fig_dir, file_id, plot_params):
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "full_diag", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
@@ -2,8 +2,8 @@
 # LIBRARIES
 # ======================================================= #
 import pandas as pd
-from cpforager import processing
-from cpforager.tdr import diagnostic, display
+from cpforager import processing, multiresolution
+from cpforager.tdr import diagnostic, display, slicing, timegrid
 
 
 # ======================================================= #
@@ -15,7 +15,7 @@ class TDR:
     """
 
     # [CONSTRUCTOR] TDR
-    def __init__(self, df, group, id, params):
+    def __init__(self, df, group, id, params, processed=False):
         
         """
         Constructor of a TDR object.
@@ -28,6 +28,8 @@ class TDR:
         :type id: str
         :param params: the parameters dictionary.
         :type params: dict
+        :param processed: skip the data processing if True, *i.e.* ``df`` has already been enhanced by ``processing.add_tdr_data``, in which case ``df`` is kept as is without copy.
+        :type processed: bool
         
         :ivar df: the dataframe containing the raw and processed TDR data.
         :vartype df: pandas.DataFrame
@@ -59,13 +61,15 @@ class TDR:
         :vartype mean_temperature: float
         :ivar dive_statistics: the dataframe containing the dive statistics where one row corresponds to one dive.
         :vartype dive_statistics: pandas.DataFrame        
+        :ivar pyramid: the multi-resolution pyramid of the signals, built at the first query (see ``build_pyramid``).
+        :vartype pyramid: dict
         
         .. warning:: 
             Due to the wide variety of TDR data, zero-offset correction of pressure is expected in the input dataframe.
         """
         
         # process data
-        df = processing.add_tdr_data(df, params)
+        if not processed: df = processing.add_tdr_data(df, params)
 
         # compute additional information
         basic_infos = processing.compute_basic_infos(df)
@@ -87,6 +91,7 @@ class TDR:
         self.max_depth = tdr_infos["max_depth"]
         self.mean_temperature = tdr_infos["mean_temperature"]
         self.dive_statistics = tdr_infos["dive_statistics"]
+        self.pyramid = None
         
     # [BUILT-IN METHODS] length of the class
     def __len__(self):
@@ -100,6 +105,19 @@ class TDR:
     def __repr__(self):
         return "%s(group=%s, id=%s, dives=%d, n=%d)" % (type(self).__name__, self.group, self.id, self.n_dives, self.n_df)
 
+    # [METHODS] extract time windows
+    window = slicing.window
+    windows = slicing.windows
+
+    # [METHODS] resample data on a regular time grid
+    resample = timegrid.resample
+
+    # [METHODS] multi-resolution pyramid
+    build_pyramid = multiresolution.build_logger_pyramid
+    query_pyramid = multiresolution.query_logger_pyramid
+    save_pyramid = multiresolution.save_logger_pyramid
+    load_pyramid = multiresolution.load_logger_pyramid
+
     # [METHODS] display the summary of the data
     display_data_summary = display.display_data_summary
 
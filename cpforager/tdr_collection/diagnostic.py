@@ -3,14 +3,14 @@
 # ======================================================= #
 import os
 import math
-from cpforager import diagnostic
+from cpforager import diagnostic, figcache, sketch
 import matplotlib.pyplot as plt
 
 
 # ======================================================= #
 # STATS SUMMARY [TDR_COLLECTION METHOD]
 # ======================================================= #
-def plot_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.50, 0.75, 0.90]):
+def plot_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.50, 0.75, 0.90], from_sketches=False):
     
     """    
     Produce the dive statistics summary of every TDR data.
@@ -25,39 +25,61 @@ def plot_stats_summary(self, fig_dir, file_id, plot_params, quantiles=[0.25, 0.5
     :type plot_params: dict
     :param quantiles: quantiles to emphasize. 
     :type quantiles: list[float]
-    :return: the full diagnostic figure.
+    :param from_sketches: plot from the quantile sketches of every TDR merged over the collection if True. 
+    :type from_sketches: bool
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     
-    The figure is save at the png format. Plots are histogram, boxplot and cumulative distribution.
+    The figure is save at the png format. Plots are histogram, boxplot and cumulative distribution. With sketches, the memory and plotting time 
+    do not depend on the number of dives and quantiles are estimated within a 1% relative error (see ``sketch.build_sketch``).
     """
     
     # get parameters
     dpi = plot_params.get("fig_dpi")
     
     # get attributes
-    dive_statistics_all = self.dive_statistics_all
+    tdr_collection = self.tdr_collection
+
+    # skip rendering if the figure is up-to-date, sketches only depending on the statistics of every TDR
+    if from_sketches:
+        fig_key = figcache.get_figure_key("stats_summary", [[tdr.dive_statistics for tdr in tdr_collection], quantiles, from_sketches], plot_params)
+    else:
+        dive_statistics_all = self.dive_statistics_all
+        fig_key = figcache.get_figure_key("stats_summary", [dive_statistics_all, quantiles, from_sketches], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "stats_summary", fig_key, plot_params): return(None)
 
     # produce diagnostic
     fig = plt.figure(figsize=(20, 5), dpi=dpi)
     fig.subplots_adjust(hspace=0.45, wspace=0.25, bottom=0.06, top=0.95, left=0.05, right=0.95)
     gs = fig.add_gridspec(3, 2)
 
-    fig.add_subplot(gs[0,0])
-    diagnostic.plot_hist(dive_statistics_all, plot_params, "duration", "Dive duration", "Time [s]")
-    fig.add_subplot(gs[1,0])
-    diagnostic.plot_box(dive_statistics_all, plot_params, "duration", "Dive duration", "Time [s]")
-    fig.add_subplot(gs[2,0])
-    diagnostic.plot_cumulative_distribution(dive_statistics_all, plot_params, "duration", "Dive duration", "Time [s]", quantiles)
-    fig.add_subplot(gs[0,1])
-    diagnostic.plot_hist(dive_statistics_all, plot_params, "max_depth", "Dive max depth", "Depth [m]")
-    fig.add_subplot(gs[1,1])
-    diagnostic.plot_box(dive_statistics_all, plot_params, "max_depth", "Dive max depth", "Depth [m]")
-    fig.add_subplot(gs[2,1])
-    diagnostic.plot_cumulative_distribution(dive_statistics_all, plot_params, "max_depth", "Dive max depth", "Depth [m]", quantiles)
+    # merge sketches of every dive statistics
+    variables = [("duration", "Dive duration", "Time [s]"),
+                 ("max_depth", "Dive max depth", "Depth [m]")]
+    if from_sketches:
+        sketches = sketch.build_merged_sketches([tdr.dive_statistics for tdr in tdr_collection], [var for (var, _, _) in variables])
+
+    # add subplots
+    for k, (var, title, var_lab) in enumerate(variables):
+        if from_sketches:
+            fig.add_subplot(gs[0,k])
+            diagnostic.plot_hist_sketch(sketches[var], plot_params, title, var_lab)
+            fig.add_subplot(gs[1,k])
+            diagnostic.plot_box_sketch(sketches[var], plot_params, title, var_lab)
+            fig.add_subplot(gs[2,k])
+            diagnostic.plot_cumulative_distribution_sketch(sketches[var], plot_params, title, var_lab, quantiles)
+        else:
+            fig.add_subplot(gs[0,k])
+            diagnostic.plot_hist(dive_statistics_all, plot_params, var, title, var_lab)
+            fig.add_subplot(gs[1,k])
+            diagnostic.plot_box(dive_statistics_all, plot_params, var, title, var_lab)
+            fig.add_subplot(gs[2,k])
+            diagnostic.plot_cumulative_distribution(dive_statistics_all, plot_params, var, title, var_lab, quantiles)
     
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "stats_summary", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
@@ -80,7 +102,7 @@ def indiv_depth_all(self, fig_dir, file_id, plot_params):
     :type file_id: str
     :param plot_params: plot parameters dictionary. 
     :type plot_params: dict
-    :return: the full diagnostic figure.
+    :return: the full diagnostic figure, None if the figure is up-to-date in the cache (see ``fig_cache`` plot parameter).
     :rtype: matplotlib.pyplot.Figure 
     
     The figure is save at the png format.
@@ -90,6 +112,10 @@ def indiv_depth_all(self, fig_dir, file_id, plot_params):
     n_tdr = self.n_tdr
     tdr_collection = self.tdr_collection
     
+    # skip rendering if the figure is up-to-date
+    fig_key = figcache.get_figure_key("indiv_depth_all", [[tdr.df for tdr in tdr_collection], [tdr.params for tdr in tdr_collection]], plot_params)
+    if figcache.is_figure_cached(fig_dir, file_id, "indiv_depth_all", fig_key, plot_params): return(None)
+    
     # get parameters
     dpi = plot_params.get("fig_dpi")
     
@@ -126,7 +152,8 @@ def indiv_depth_all(self, fig_dir, file_id, plot_params):
             
     # save figure
     fig_path = os.path.join(fig_dir, "%s.png" % file_id)
-    plt.savefig(fig_path, format="png", bbox_inches="tight")
+    fig.savefig(fig_path, format="png", bbox_inches="tight")
+    figcache.record_figure(fig_dir, file_id, "indiv_depth_all", fig_key, plot_params)
     fig.clear()
     plt.close(fig)
     
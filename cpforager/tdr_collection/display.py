@@ -2,23 +2,30 @@
 # LIBRARIES
 # ======================================================= #
 import numpy as np
+from cpforager import accumulators
 
 
 # ======================================================= #
 # DISPLAY [TDR_COLLECTION METHODS]
 # ======================================================= #
-def display_data_summary(self, standalone=True):
+def display_data_summary(self, standalone=True, streaming=False):
     
     """    
     Print in terminal the TDR_Collection data summary.
     
     :param self: a TDR_Collection object
     :type self: cpforager.TDR_Collection
+    :param standalone: display information standalone if True.
+    :type standalone: bool
+    :param streaming: compute the dive and depth statistics from streaming accumulators fed TDR by TDR if True, instead of ``dive_statistics_all`` and ``df_all``.
+    :type streaming: bool
+    
+    With ``streaming=True``, the memory does not depend on the number of dives and measures and quantiles are estimated within a 1% relative error 
+    (see ``accumulators.init_accumulator``). The median depth, computed chunk by chunk from the TDR data, is then also printed.
     """
 
     # get attributes
     tdr_collection = self.tdr_collection
-    dive_statistics_all = self.dive_statistics_all
     
     # append groups
     groups = []
@@ -30,9 +37,19 @@ def display_data_summary(self, standalone=True):
     for group in np.unique(groups):
         groups_str = groups_str + "%s [%d TDR] | " % (group, sum(np.isin(groups, group)))
         
-    # get quantiles dive statistics
-    dive_duration_quantiles = dive_statistics_all["duration"].quantile([0,0.25,0.5,0.75,1])
-    dive_dmax_quantiles = dive_statistics_all["max_depth"].quantile([0,0.25,0.5,0.75,1])
+    # get mean, std and quantiles of dive and depth statistics
+    variables = ["duration", "max_depth"]
+    if streaming:
+        dive_accumulators = accumulators.accumulate_columns([tdr.dive_statistics for tdr in tdr_collection], variables)
+        depth_accumulator = accumulators.accumulate_columns([tdr.df for tdr in tdr_collection], ["depth"])["depth"]
+        stats = {var:accumulators.get_accumulator_statistics(dive_accumulators[var], [0,0.25,0.5,0.75,1]) for var in variables}
+        median_depth = accumulators.get_accumulator_statistics(depth_accumulator, [0.5])["quantiles"][0]
+    else:
+        dive_statistics_all = self.dive_statistics_all
+        stats = {var:{"mean":dive_statistics_all[var].mean(), "std":dive_statistics_all[var].std(), 
+                      "quantiles":dive_statistics_all[var].quantile([0,0.25,0.5,0.75,1]).to_numpy()} for var in variables}
+    dive_duration_quantiles = stats["duration"]["quantiles"]
+    dive_dmax_quantiles = stats["max_depth"]["quantiles"]
     
     # print information
     if standalone:
@@ -42,10 +59,12 @@ def display_data_summary(self, standalone=True):
         print("# + Nb of dives = %d" % self.n_dives)
         print("# + Groups      = %s" % groups_str)
     print("# ------------------------------ TDR COLLECTION DATA ------------------ #")
-    print("# + Dive duration  : mean=%.1fs | std=%.1fs" % (dive_statistics_all["duration"].mean(), dive_statistics_all["duration"].std()))
-    print("# + Dive duration  : min=%.1fs | q25=%.1fs | q50=%.1fs | q75=%.1fs | max=%.1fs" % (dive_duration_quantiles[0], dive_duration_quantiles[0.25], dive_duration_quantiles[0.5], dive_duration_quantiles[0.75], dive_duration_quantiles[1]))
-    print("# + Dive max depth : mean=%.1fm | std=%.1fm" % (dive_statistics_all["max_depth"].mean(), dive_statistics_all["max_depth"].std()))
-    print("# + Dive max depth : min=%.1fm | q25=%.1fm | q50=%.1fm | q75=%.1fm | max=%.1fm" % (dive_dmax_quantiles[0], dive_dmax_quantiles[0.25], dive_dmax_quantiles[0.5], dive_dmax_quantiles[0.75], dive_dmax_quantiles[1])) 
+    print("# + Dive duration  : mean=%.1fs | std=%.1fs" % (stats["duration"]["mean"], stats["duration"]["std"]))
+    print("# + Dive duration  : min=%.1fs | q25=%.1fs | q50=%.1fs | q75=%.1fs | max=%.1fs" % (dive_duration_quantiles[0], dive_duration_quantiles[1], dive_duration_quantiles[2], dive_duration_quantiles[3], dive_duration_quantiles[4]))
+    print("# + Dive max depth : mean=%.1fm | std=%.1fm" % (stats["max_depth"]["mean"], stats["max_depth"]["std"]))
+    print("# + Dive max depth : min=%.1fm | q25=%.1fm | q50=%.1fm | q75=%.1fm | max=%.1fm" % (dive_dmax_quantiles[0], dive_dmax_quantiles[1], dive_dmax_quantiles[2], dive_dmax_quantiles[3], dive_dmax_quantiles[4])) 
+    if streaming:
+        print("# + Depth          : median=%.2fm" % median_depth)
     if standalone:
         print("# ===================================================================== #")
     
\ No newline at end of file
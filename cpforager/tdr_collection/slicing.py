@@ -0,0 +1,90 @@
+# ================================================================================================ #
+# LIBRARIES
+# ================================================================================================ #
+from cpforager import utils
+
+
+# ================================================================================================ #
+# TDR_COLLECTION SLICING [TDR_COLLECTION METHOD]
+# ================================================================================================ #
+def window(self, id, t0, t1, columns=None):
+    
+    """
+    Extract the data of a given TDR recorded between two datetimes from the collection dataframe.
+        
+    :param self: a TDR_Collection object
+    :type self: cpforager.TDR_Collection
+    :param id: the identifier of the TDR.
+    :type id: str
+    :param t0: start of the time window.
+    :type t0: datetime.datetime | pandas.Timestamp | str
+    :param t1: end of the time window.
+    :type t1: datetime.datetime | pandas.Timestamp | str
+    :param columns: list of columns to keep, every column is kept if None.
+    :type columns: list[str]
+    :return: the ``df_all`` rows of the TDR restricted to the time window [t0, t1].
+    :rtype: pandas.DataFrame
+    
+    Rows of a given TDR are contiguous in ``df_all``. The time window is found by binary search on the sorted ``datetime`` column of the 
+    TDR and then mapped to ``df_all`` rows using the TDR offset, so that ``df_all`` is sliced by position without copy.
+    """
+    
+    # get attributes
+    df_all = self.df_all
+    tdr_collection = self.tdr_collection
+    offsets = self.offsets
+    
+    # find TDR position in collection
+    k = [tdr.id for tdr in tdr_collection].index(id)
+    
+    # find window indices in TDR dataframe and shift to collection dataframe
+    idx_0, idx_1 = utils.get_window_indices(tdr_collection[k].df["datetime"], t0, t1)
+    idx_0, idx_1 = offsets[k]+idx_0, offsets[k]+idx_1
+    
+    # slice dataframe by position
+    if columns is None:
+        df_window = df_all.iloc[idx_0:idx_1]
+    else:
+        df_window = df_all.iloc[idx_0:idx_1][columns]
+    
+    return(df_window)
+
+
+def windows(self, id, starts, ends, columns=None):
+    
+    """
+    Extract the data of a given TDR recorded between several pairs of datetimes from the collection dataframe.
+        
+    :param self: a TDR_Collection object
+    :type self: cpforager.TDR_Collection
+    :param id: the identifier of the TDR.
+    :type id: str
+    :param starts: starts of the time windows.
+    :type starts: array-like of datetimes
+    :param ends: ends of the time windows.
+    :type ends: array-like of datetimes
+    :param columns: list of columns to keep, every column is kept if None.
+    :type columns: list[str]
+    :return: the list of ``df_all`` rows of the TDR restricted to each time window.
+    :rtype: list[pandas.DataFrame]
+    """
+    
+    # get attributes
+    df_all = self.df_all
+    tdr_collection = self.tdr_collection
+    offsets = self.offsets
+    
+    # find TDR position in collection
+    k = [tdr.id for tdr in tdr_collection].index(id)
+    
+    # find windows indices in TDR dataframe and shift to collection dataframe
+    idx_0, idx_1 = utils.get_windows_indices(tdr_collection[k].df["datetime"], starts, ends)
+    idx_0, idx_1 = offsets[k]+idx_0, offsets[k]+idx_1
+    
+    # slice dataframe by position
+    if columns is None:
+        df_windows = [df_all.iloc[i0:i1] for (i0, i1) in zip(idx_0, idx_1)]
+    else:
+        df_windows = [df_all.iloc[i0:i1][columns] for (i0, i1) in zip(idx_0, idx_1)]
+    
+    return(df_windows)
@@ -3,8 +3,8 @@
 # ================================================================================================ #
 import pandas as pd
 import numpy as np
-from cpforager import parameters
-from cpforager.tdr_collection import diagnostic, display
+from cpforager import parameters, utils, rendering
+from cpforager.tdr_collection import diagnostic, display, slicing, formats
 
 
 # ================================================================================================ #
@@ -33,8 +33,16 @@ class TDR_Collection:
         :vartype n_dives: int
         :ivar dive_statistics_all: the dive statistics dataframe merged over every TDR included in the list.
         :vartype dive_statistics_all: pandas.DataFrame
-        :ivar df_all: the enhanced TDR dataframe merged over every TDR included in the list.
+        :ivar store: the columnar store, *i.e.* the dictionary of contiguous arrays by column concatenated over every TDR included in the list.
+        :vartype store: dict
+        :ivar df_all: the enhanced TDR dataframe merged over every TDR included in the list, built over the columnar store.
         :vartype df_all: pandas.DataFrame
+        :ivar offsets: the positions in ``df_all`` of the first row of every TDR, plus the total number of rows.
+        :vartype offsets: numpy.ndarray
+        
+        .. note::
+            Every column of ``df_all`` is allocated once in the columnar store, ``df_all`` being built over the store without copy. The dataframes of 
+            the TDR included in the list are left untouched, hence their later modifications are not reflected in ``df_all``. Rebuild the collection after such changes.
         """
         
         # init dataframes
@@ -42,9 +50,7 @@ class TDR_Collection:
         dtypes_1 = parameters.get_columns_dtypes(column_names_1)
         dive_statistics_all = pd.DataFrame(columns=column_names_1).astype(dtype=dtypes_1)
         
-        column_names_2 = ["group", "id", "datetime", "pressure", "temperature", "step_time", "depth", "is_night", "dive"]
-        dtypes_2 = parameters.get_columns_dtypes(column_names_2)
-        df_all = pd.DataFrame(columns=column_names_2).astype(dtype=dtypes_2)
+        column_names_2 = ["datetime", "pressure", "temperature", "step_time", "depth", "is_night", "dive"]
 
         # compute statistics
         group = []
@@ -61,27 +67,26 @@ class TDR_Collection:
             dive_id = np.concatenate((dive_id, [f"{tdr.group}_{tdr.id}_D{k:04}" for k in tdr.df.loc[tdr.df["dive"]>0, "dive"].unique()]))
             dive_statistics_all = pd.concat([dive_statistics_all, tdr.dive_statistics], ignore_index=True)
 
-            # build the full data dataframe of the entire collection
-            df_tmp = pd.DataFrame(columns=df_all.columns)
-            df_tmp[["datetime", "pressure", "temperature", "step_time", "is_night", "depth", "dive"]] = tdr.df[["datetime", "pressure", "temperature", "step_time", "is_night", "depth", "dive"]]
-            df_tmp = df_tmp.astype(dtype=dtypes_2)
-
-            # add metadata in df for each dive
-            df_tmp["id"] = tdr.id
-            df_tmp["group"] = tdr.group
-            df_all = pd.concat([df_all, df_tmp], ignore_index=True)
-
         # replace id column with full dive ids
         dive_statistics_all["group"] = group
         dive_statistics_all["id"] = id
         dive_statistics_all["dive_id"] = dive_id
 
+        # build the columnar store of the entire collection
+        store, offsets = utils.build_columnar_store([tdr.df for tdr in tdr_collection], column_names_2)
+
+        # build the full data dataframe of the entire collection over the columnar store
+        metadata = {"group":[tdr.group for tdr in tdr_collection], "id":[tdr.id for tdr in tdr_collection]}
+        df_all = utils.get_columnar_store_dataframe(store, offsets, metadata, parameters.get_columns_dtypes(column_names_2))
+
         # set attributes
         self.tdr_collection = tdr_collection
         self.n_tdr = len(tdr_collection)
         self.n_dives = len(dive_statistics_all)
         self.dive_statistics_all = dive_statistics_all
+        self.store = store
         self.df_all = df_all
+        self.offsets = offsets
 
     # [METHODS] length of the class
     def __len__(self):
@@ -95,9 +100,19 @@ class TDR_Collection:
     def __repr__(self):
         return "%s(%d TDR, %d dives)" % (type(self).__name__, self.n_tdr, self.n_dives)
 
+    # [METHODS] extract time windows
+    window = slicing.window
+    windows = slicing.windows
+
     # [METHODS] display the summary of the data
     display_data_summary = display.display_data_summary
 
     # [METHODS] plot data
     plot_stats_summary = diagnostic.plot_stats_summary
-    indiv_depth_all = diagnostic.indiv_depth_all
\ No newline at end of file
+    indiv_depth_all = diagnostic.indiv_depth_all
+
+    # [METHODS] render diagnostics of every member in parallel
+    render_all = rendering.render_all
+    
+    # [METHODS] Movebank formatting
+    to_Movebank = formats.to_Movebank
\ No newline at end of file
@@ -145,6 +145,70 @@ def convert_loc_to_utc(df, local_timezone):
 # ================================================================================================ #
 # APPLY FUNCTION BETWEEN SAMPLES
 # ================================================================================================ #
+def apply_functions_between_times(df, datetimes, columns_functions, verbose=False):
+    
+    """
+    Apply a chosen function (*e.g.* sum, mean, min, max) over every element of a dataframe recorded between two consecutive datetimes.
+    
+    :param df: dataframe with a ``datetime`` column.
+    :type df: pandas.DataFrame
+    :param datetimes: sorted datetimes of the subsampling resolution.
+    :type datetimes: pandas.Series(dtype="datetime64[ns]")
+    :param columns_functions: dictionary giving for each specified column the function to apply.
+    :type columns_functions: dict
+    :param verbose: display progress if True.
+    :type verbose: bool
+    :return: the dataframe at the subsampling resolution with the columns "column_function".
+    :rtype: pandas.DataFrame
+    
+    The k-th row of the resulting dataframe summarises the elements of ``df`` recorded in ]datetimes[k-1], datetimes[k]] (every element recorded 
+    until datetimes[0] for the first row), elements recorded after the last datetime being ignored. Rows without any element are NaN. Every 
+    element is assigned to its subsample by binary search and the functions are then applied to contiguous segments using NumPy reductions, 
+    so that the computation is vectorized. See ``apply_functions_between_samples`` for the table of possible functions.
+    """
+    
+    # set of possible values for funcs
+    funcs_possible_values = ["sum", "mean", "min", "max", "len_unique_pos"]
+    
+    # find the subsample of every element
+    n_subsamples = len(datetimes)
+    subsamples = np.searchsorted(np.asarray(datetimes, dtype="datetime64[ns]"), df["datetime"].values.astype("datetime64[ns]"), side="left")
+    is_valid = (subsamples < n_subsamples)
+    
+    # sort elements by subsample to get contiguous segments
+    order = np.flatnonzero(is_valid)[np.argsort(subsamples[is_valid], kind="stable")]
+    subsamples = subsamples[order]
+    segments, starts = np.unique(subsamples, return_index=True)
+    
+    # loop over columns to be processed (sum, mean, min or max) between subsamples
+    df_functions = pd.DataFrame(index=range(n_subsamples))
+    n_columns = len(columns_functions)
+    for k, (c, f) in enumerate(columns_functions.items()):
+        new_column = "%s_%s" % (c, f)
+        
+        # display progress
+        if verbose: print("%d/%d - %.1f%% - %s" % (k, n_columns, 100*k/n_columns, new_column))
+        values = df[c].to_numpy(dtype=float, na_value=np.nan)[order]
+        is_value = ~np.isnan(values)
+        results = np.full(n_subsamples, np.nan)
+        if len(segments) > 0:
+            if f=="sum": results[segments] = np.add.reduceat(np.where(is_value, values, 0.0), starts)
+            elif f=="mean": 
+                sums = np.add.reduceat(np.where(is_value, values, 0.0), starts)
+                counts = np.add.reduceat(is_value.astype(int), starts)
+                results[segments] = np.where(counts > 0, sums/np.maximum(counts, 1), np.nan)
+            elif f=="min": results[segments] = np.fmin.reduceat(values, starts)
+            elif f=="max": results[segments] = np.fmax.reduceat(values, starts)
+            elif f=="len_unique_pos": 
+                is_pos = is_value & (values > 0)
+                unique_pos = pd.DataFrame({"subsample":subsamples[is_pos], "value":values[is_pos]}).drop_duplicates()
+                results[segments] = np.bincount(unique_pos["subsample"].values, minlength=n_subsamples)[segments]
+            else: print("WARNING : \"%s\" cannot be found within the array of possible values, i.e. %s" %(f, funcs_possible_values))
+        df_functions[new_column] = results
+            
+    return(df_functions)
+
+
 def apply_functions_between_samples(df, resolution, columns_functions, verbose=False):
     
     """
@@ -179,48 +243,22 @@ def apply_functions_between_samples(df, resolution, columns_functions, verbose=F
         ``len_unique_pos``, "compute the number of different positive values of every elements bewteen two subsamples"
     """
     
-    # set of possible values for funcs
-    funcs_possible_values = ["sum", "mean", "min", "max", "len_unique_pos"]
-        
-    # set subsampled dataframe at subsampling resolution
-    df_subsamples = df.loc[resolution].reset_index(drop=True)
+    # set subsampling resolution
+    resolution = np.asarray(resolution, dtype=bool)
     n_subsamples = resolution.sum()
     n_df = len(df)
     
     # if subsampling resolution is thicker than sampling resolution
     if n_subsamples < n_df:
         
-        # initialize new columns in df
-        for c, f in columns_functions.items():
-            new_column = "%s_%s" % (c, f)
-            df[new_column] = np.nan*n_df
-            
-        # loop over subsamples
-        for k in range(n_subsamples):
-            
-            # display progress
-            if((verbose) and ((n_subsamples//20 == 0) or (k % (n_subsamples//20) == 0))): print("%d/%d - %.1f%%" % (k, n_subsamples, 100*k/n_subsamples))
-            
-            # find points between samples
-            if k == 0:
-                idx_0 = 0 
-                idx_1 = np.searchsorted(df["datetime"], df_subsamples.loc[k, "datetime"], side="right")
-                between_subsamples_points = np.arange(idx_0, idx_1)
-            else:       
-                idx_0 = np.searchsorted(df["datetime"], df_subsamples.loc[k-1, "datetime"], side="right")
-                idx_1 = np.searchsorted(df["datetime"], df_subsamples.loc[k, "datetime"], side="right")
-                between_subsamples_points = np.arange(idx_0, idx_1)
-            
-            # loop over columns to be processed (sum, mean, min or max) between samples
-            if len(between_subsamples_points) > 0:
-                for c, f in columns_functions.items():
-                    new_column = "%s_%s" % (c, f)
-                    if f=="sum": df.loc[idx_1-1,new_column] = df.loc[between_subsamples_points,c].sum()
-                    elif f=="mean": df.loc[idx_1-1,new_column] = df.loc[between_subsamples_points,c].mean()
-                    elif f=="min": df.loc[idx_1-1,new_column] = df.loc[between_subsamples_points,c].min()
-                    elif f=="max": df.loc[idx_1-1,new_column] = df.loc[between_subsamples_points,c].max()
-                    elif f=="len_unique_pos": df.loc[idx_1-1,new_column] = (df.loc[between_subsamples_points,c].unique()>0).sum()
-                    else: print("WARNING : \"%s\" cannot be found within the array of possible values, i.e. %s" %(f, funcs_possible_values))
+        # apply functions between subsamples
+        df_functions = apply_functions_between_times(df, df.loc[resolution, "datetime"], columns_functions, verbose)
+        
+        # add new columns in df at subsampling resolution
+        for new_column in df_functions.columns:
+            values = np.full(n_df, np.nan)
+            values[resolution] = df_functions[new_column].values
+            df[new_column] = values
                     
     # if subsampling resolution is thiner than sampling resolution
     else:
@@ -231,6 +269,281 @@ def apply_functions_between_samples(df, resolution, columns_functions, verbose=F
     return(df)
 
 
+# ================================================================================================ #
+# TIME WINDOW
+# ================================================================================================ #
+def get_window_indices(datetimes, t0, t1):
+    
+    """
+    Find the positional indices delimiting the samples recorded between two datetimes by binary search.
+    
+    :param datetimes: sorted datetime array.
+    :type datetimes: pandas.Series(dtype="datetime64[ns]")
+    :param t0: start of the time window.
+    :type t0: datetime.datetime | pandas.Timestamp | str
+    :param t1: end of the time window.
+    :type t1: datetime.datetime | pandas.Timestamp | str
+    :return: the indices (idx_0, idx_1) such that ``datetimes[idx_0:idx_1]`` lies within [t0, t1].
+    :rtype: tuple(int, int)
+    
+    The search relies on the datetimes being sorted in ascending order, which is checked by ``checks.check_datetime_order`` during processing. 
+    Bounds are inclusive on both sides.
+    """
+    
+    # get datetime values as a numpy array without copy
+    datetimes = np.asarray(datetimes, dtype="datetime64[ns]")
+    
+    # binary search of both bounds
+    idx_0 = int(np.searchsorted(datetimes, np.datetime64(pd.Timestamp(t0), "ns"), side="left"))
+    idx_1 = int(np.searchsorted(datetimes, np.datetime64(pd.Timestamp(t1), "ns"), side="right"))
+    
+    return(idx_0, idx_1)
+
+
+def get_windows_indices(datetimes, starts, ends):
+    
+    """
+    Find the positional indices delimiting the samples recorded between several pairs of datetimes by binary search.
+    
+    :param datetimes: sorted datetime array.
+    :type datetimes: pandas.Series(dtype="datetime64[ns]")
+    :param starts: starts of the time windows.
+    :type starts: array-like of datetimes
+    :param ends: ends of the time windows.
+    :type ends: array-like of datetimes
+    :return: the arrays of indices (idx_0, idx_1) such that ``datetimes[idx_0[k]:idx_1[k]]`` lies within [starts[k], ends[k]].
+    :rtype: tuple(numpy.ndarray, numpy.ndarray)
+    
+    Every window is searched at once with a single vectorized binary search per bound.
+    """
+    
+    # get datetime values as numpy arrays
+    datetimes = np.asarray(datetimes, dtype="datetime64[ns]")
+    starts = pd.to_datetime(np.atleast_1d(starts)).values.astype("datetime64[ns]")
+    ends = pd.to_datetime(np.atleast_1d(ends)).values.astype("datetime64[ns]")
+    
+    # vectorized binary search of both bounds
+    idx_0 = np.searchsorted(datetimes, starts, side="left")
+    idx_1 = np.searchsorted(datetimes, ends, side="right")
+    
+    # empty windows when ends are before starts
+    idx_1 = np.maximum(idx_0, idx_1)
+    
+    return(idx_0, idx_1)
+
+
+def get_time_window(df, t0, t1, columns=None):
+    
+    """
+    Extract the rows of a dataframe recorded between two datetimes.
+    
+    :param df: dataframe with a sorted ``datetime`` column.
+    :type df: pandas.DataFrame
+    :param t0: start of the time window.
+    :type t0: datetime.datetime | pandas.Timestamp | str
+    :param t1: end of the time window.
+    :type t1: datetime.datetime | pandas.Timestamp | str
+    :param columns: list of columns to keep, every column is kept if None.
+    :type columns: list[str]
+    :return: the dataframe restricted to the time window [t0, t1].
+    :rtype: pandas.DataFrame
+    
+    The time window is found by binary search in O(log n) and the dataframe is then sliced by position, which does not copy the 
+    underlying data (with pandas Copy-on-Write, a column selection does not copy either).
+    """
+    
+    # find window indices
+    idx_0, idx_1 = get_window_indices(df["datetime"], t0, t1)
+    
+    # slice dataframe by position
+    if columns is None:
+        df_window = df.iloc[idx_0:idx_1]
+    else:
+        df_window = df.iloc[idx_0:idx_1][columns]
+    
+    return(df_window)
+
+
+def get_time_windows(df, starts, ends, columns=None):
+    
+    """
+    Extract the rows of a dataframe recorded between several pairs of datetimes.
+    
+    :param df: dataframe with a sorted ``datetime`` column.
+    :type df: pandas.DataFrame
+    :param starts: starts of the time windows.
+    :type starts: array-like of datetimes
+    :param ends: ends of the time windows.
+    :type ends: array-like of datetimes
+    :param columns: list of columns to keep, every column is kept if None.
+    :type columns: list[str]
+    :return: the list of dataframes restricted to each time window.
+    :rtype: list[pandas.DataFrame]
+    """
+    
+    # find windows indices
+    idx_0, idx_1 = get_windows_indices(df["datetime"], starts, ends)
+    
+    # slice dataframe by position
+    if columns is None:
+        df_windows = [df.iloc[i0:i1] for (i0, i1) in zip(idx_0, idx_1)]
+    else:
+        df_windows = [df.iloc[i0:i1][columns] for (i0, i1) in zip(idx_0, idx_1)]
+    
+    return(df_windows)
+
+
+# ================================================================================================ #
+# COLUMNAR STORE
+# ================================================================================================ #
+def build_columnar_store(dfs, columns):
+    
+    """
+    Build a columnar store of contiguous arrays from a list of dataframes.
+    
+    :param dfs: list of dataframes sharing the given columns.
+    :type dfs: list[pandas.DataFrame]
+    :param columns: list of columns to store.
+    :type columns: list[str]
+    :return: the dictionary of concatenated arrays by column and the array of offsets such that rows of the k-th dataframe are stored at positions ``offsets[k]:offsets[k+1]``.
+    :rtype: tuple(dict, numpy.ndarray)
+    
+    Every column is allocated once with the concatenation of the dataframe columns, in the same order as the list of dataframes.
+    """
+    
+    # compute offsets of every dataframe
+    offsets = np.concatenate(([0], np.cumsum([len(df) for df in dfs]))).astype(np.int64)
+    
+    # concatenate every column in a single allocation
+    store = {}
+    for c in columns:
+        store[c] = np.concatenate([df[c].to_numpy() for df in dfs]) if len(dfs) > 0 else np.array([])
+    
+    return(store, offsets)
+
+
+def get_columnar_store_dataframe(store, offsets, metadata, columns_dtypes):
+    
+    """
+    Build a dataframe over the arrays of a columnar store.
+    
+    :param store: dictionary of concatenated arrays by column.
+    :type store: dict
+    :param offsets: the positions of the first row of every dataframe of the store, plus the total number of rows.
+    :type offsets: numpy.ndarray
+    :param metadata: dictionary giving for each metadata column (*e.g.* group, id) the value of every dataframe of the store.
+    :type metadata: dict
+    :param columns_dtypes: dictionary giving for each stored column its data type (see ``parameters.get_columns_dtypes``).
+    :type columns_dtypes: dict
+    :return: the dataframe with the metadata columns repeated over the rows of every dataframe, followed by the stored columns.
+    :rtype: pandas.DataFrame
+    
+    Float64 and Int64 columns are NA-aware arrays whose values are the arrays of the store, NaN values being masked, so that the store is not copied.
+    Other columns keep the data type of the store.
+    """
+    
+    # repeat metadata over rows
+    n_rows = np.diff(offsets)
+    df = {c:np.repeat(np.array(values, dtype=object), n_rows) for c, values in metadata.items()}
+    
+    # wrap stored columns in NA-aware arrays without copy
+    for c, values in store.items():
+        is_na = pd.isna(values)
+        if columns_dtypes.get(c) == "Float64":
+            df[c] = pd.arrays.FloatingArray(values.astype(np.float64, copy=False), is_na)
+        elif columns_dtypes.get(c) == "Int64":
+            df[c] = pd.arrays.IntegerArray(np.where(is_na, 0, values).astype(np.int64) if is_na.any() else values.astype(np.int64, copy=False), is_na)
+        else:
+            df[c] = values
+    df = pd.DataFrame(df, copy=False)
+    
+    return(df)
+
+
+# ================================================================================================ #
+# SORTED MERGE
+# ================================================================================================ #
+def merge_sorted_dataframes(dfs):
+
+    """
+    Merge dataframes of measures on their ``datetime`` column into a single dataframe sorted by datetime.
+
+    :param dfs: list of dataframes with a ``datetime`` column of type datetime64, *e.g.* the GPS and TDR measures of a logger.
+    :type dfs: list[pandas.DataFrame]
+    :return: the merged dataframe with the ``datetime`` column followed by every other column of the dataframes.
+    :rtype: pandas.DataFrame
+
+    Measures of different dataframes sharing the same datetime are merged into the same row, the n-th measure of a datetime in a dataframe
+    being paired with the n-th measure of this datetime in the other dataframes. Contrary to an outer join, duplicated datetimes thus never
+    multiply rows. Columns are filled with NaN where a dataframe has no measure, numeric columns being converted to float. Columns shared
+    by several dataframes, *e.g.* ``date`` and ``time``, take the value of the first dataframe that has a measure at the row.
+
+    Datetimes are merged as int64 with a stable sort, which merges the already sorted datetimes of every dataframe in :math:`O(n \\log k)`
+    for :math:`k` dataframes. Dataframes that are not sorted by datetime are sorted first.
+    """
+
+    # get sorted int64 datetimes and rank of every measure among measures of the same datetime
+    datetimes = []
+    ranks = []
+    orders = []
+    for df in dfs:
+        dt = df["datetime"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        order = None if np.all(dt[1:] >= dt[:-1]) else np.argsort(dt, kind="stable")
+        dt = dt if order is None else dt[order]
+        is_first = np.ones(len(dt), dtype=bool)
+        is_first[1:] = (dt[1:] != dt[:-1])
+        ranks.append(np.arange(len(dt))-np.maximum.accumulate(np.where(is_first, np.arange(len(dt)), 0)))
+        datetimes.append(dt)
+        orders.append(order)
+
+    # merge datetimes of every dataframe
+    n_dfs = np.array([len(dt) for dt in datetimes])
+    all_datetimes = np.concatenate([np.zeros(0, dtype=np.int64)]+datetimes)
+    all_ranks = np.concatenate([np.zeros(0, dtype=np.int64)]+ranks)
+    merge_order = np.argsort(all_datetimes, kind="stable")
+    merged_datetimes = all_datetimes[merge_order]
+
+    # allocate one row by datetime and rank
+    is_new_datetime = np.ones(len(merged_datetimes), dtype=bool)
+    is_new_datetime[1:] = (merged_datetimes[1:] != merged_datetimes[:-1])
+    datetime_starts = np.flatnonzero(is_new_datetime)
+    n_rows_by_datetime = np.maximum.reduceat(all_ranks[merge_order], datetime_starts)+1 if len(datetime_starts) > 0 else np.zeros(0, dtype=np.int64)
+    first_rows = np.cumsum(n_rows_by_datetime)-n_rows_by_datetime
+    rows = np.empty(len(all_datetimes), dtype=np.int64)
+    rows[merge_order] = np.repeat(first_rows, np.diff(np.append(datetime_starts, len(merged_datetimes))))+all_ranks[merge_order]
+    n_rows = int(n_rows_by_datetime.sum())
+
+    # fill merged datetimes
+    columns = {"datetime":np.empty(n_rows, dtype=np.int64)}
+    columns["datetime"][rows] = all_datetimes
+    columns["datetime"] = columns["datetime"].astype("datetime64[ns]")
+
+    # fill merged columns dataframe by dataframe
+    df_offsets = np.concatenate(([0], np.cumsum(n_dfs)))
+    is_filled = {}
+    for (k, df) in enumerate(dfs):
+        df_rows = rows[df_offsets[k]:df_offsets[k+1]]
+        for c in df.columns:
+            if c == "datetime":
+                continue
+            is_numeric = pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])
+            values = df[c].to_numpy(dtype=float, na_value=np.nan) if is_numeric else df[c].to_numpy(dtype=object)
+            values = values if orders[k] is None else values[orders[k]]
+            if c not in columns:
+                columns[c] = np.full(n_rows, np.nan, dtype=float if is_numeric else object)
+                columns[c][df_rows] = values
+                is_filled[c] = np.zeros(n_rows, dtype=bool)
+            else:
+                is_missing = ~is_filled[c][df_rows]
+                columns[c][df_rows[is_missing]] = values[is_missing]
+            is_filled[c][df_rows] = True
+
+    # build merged dataframe
+    df_merged = pd.DataFrame(columns, copy=False)
+
+    return(df_merged)
+
+
 # ================================================================================================ #
 # NEAR-SQUARE GRID LAYOUT
 # ================================================================================================ #
@@ -62,6 +62,13 @@ print(len(axy))
 print(axy[1312])
 print(axy.df_gps.iloc[1312])
 
+# test GPS and TDR objects share the processed dataframes
+print(axy.gps.df is axy.df_gps, axy.tdr.df is axy.df_tdr)
+
+# test full_resolution method
+df_full = axy.full_resolution()
+print(df_full[["datetime", "trip", "dive"]].count())
+
 # test display_data_summary method
 axy.display_data_summary()
 
@@ -71,6 +78,43 @@ _ = axy.maps_diag(test_dir, "%s_map" % file_id, plot_params)
 _ = axy.folium_map(test_dir, "%s_fmap" % file_id, plot_params)
 
 
+# ======================================================= #
+# TEST AXY TIME WINDOWS
+# ======================================================= #
+
+# extract ten minutes of data at acceleration, GPS and TDR resolutions
+t0 = axy.start_datetime + pd.Timedelta(hours=12)
+t1 = t0 + pd.Timedelta(minutes=10)
+for source in ["df", "df_gps", "df_tdr"]:
+    df_window = axy.window(t0, t1, source=source)
+    print("%s : %d rows in [%s, %s]" % (source, len(df_window), t0, t1))
+
+# extract one minute of acceleration data every hour
+starts = pd.date_range(start=axy.start_datetime, end=axy.end_datetime, freq="1h")
+df_windows = axy.windows(starts, starts + pd.Timedelta(minutes=1), columns=["datetime", "ax", "ay", "az", "odba"])
+print("%d windows with %d rows in total" % (len(df_windows), sum([len(df_w) for df_w in df_windows])))
+
+# resample acceleration data at 1 Hz and TDR data at 10 s
+print(axy.resample(1, {"odba":"mean", "odba_f":"max", "az":"decimate"}).head())
+print(axy.resample(10, {"depth":"max", "dive":"nearest"}, source="df_tdr").head())
+
+
+# ======================================================= #
+# TEST AXY MULTI-RESOLUTION PYRAMID
+# ======================================================= #
+
+# build, save and reload acceleration and depth pyramids
+_ = axy.build_pyramid()
+axy.save_pyramid(os.path.join(test_dir, "%s_pyramid.npz" % file_id))
+_ = axy.load_pyramid(os.path.join(test_dir, "%s_pyramid.npz" % file_id))
+_ = axy.tdr.build_pyramid()
+
+# query one hour of data for a 1000 pixels wide display
+df_odba = axy.query_pyramid("odba", t0, t0 + pd.Timedelta(hours=1), 1000)
+df_depth = axy.tdr.query_pyramid("depth", t0, t0 + pd.Timedelta(hours=1), 1000)
+print("odba : %d blocks of %d measures, depth : %d blocks of %d measures" % (len(df_odba), df_odba["count"].max(), len(df_depth), df_depth["count"].max()))
+
+
 # ======================================================= #
 # TEST FAST FULL DIAGNOSTIC
 # ======================================================= #
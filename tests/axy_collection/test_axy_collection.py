@@ -77,6 +77,12 @@ print(axy_collection[2])
 
 # test display_data_summary method
 axy_collection.display_data_summary()
+axy_collection.display_data_summary(streaming=True)
+
+# test align method on the full resolution and tdr resolution data
+aligned = axy_collection.align(1, {"odba":"linear", "az":"linear"}, chunk_size=3600)
+aligned_dives = axy_collection.align(10, {"depth":"linear", "dive":"nearest"}, source="df_tdr", reference="trip")
+print(aligned["values"].shape, aligned_dives["values"].shape, aligned_dives["trip_id"][:2])
 
 # test plot_stats_summary, folium_map, maps_diag methods
 _ = axy_collection.plot_trip_stats_summary(test_dir, "trip_statistics_%s" % fieldwork, plot_params)
@@ -59,6 +59,11 @@ print(gps)
 print(len(gps))
 print(gps[1312])
 
+# test iterative filters of suspicious positions
+for suspicious_filter in ["iterative_speed", "speed_distance_angle"]:
+    gps_filtered = GPS(df=df.copy(), group=fieldwork, id=file_id, params=dict(params, suspicious_filter=suspicious_filter))
+    print("%s : %d positions kept out of %d" % (suspicious_filter, len(gps_filtered.df), len(df)))
+
 # test display_data_summary method
 gps.display_data_summary()
 
@@ -66,6 +71,8 @@ gps.display_data_summary()
 _ = gps.full_diag(test_dir, "%s_diag" % file_id, plot_params)
 _ = gps.maps_diag(test_dir, "%s_map" % file_id, plot_params)
 _ = gps.folium_map(test_dir, "%s_fmap" % file_id, plot_params)
+_ = gps.export_trips("%s/%s_trips.geojson" % (test_dir, file_id))
+print("%d positions kept out of %d" % (gps.simplify_mask(50).sum(), len(gps.df)))
 
 
 # ======================================================= #
@@ -102,3 +109,22 @@ for trip_id in trip_ids:
     print(gps_trip)
     gps_by_trip.append(gps_trip)
     gps_trip.df.drop(["datetime", "step_heading"], axis=1).to_csv("%s/%s.csv" % (test_dir, gps_trip.id), index=False, quoting=csv.QUOTE_NONNUMERIC)
+
+
+# ======================================================= #
+# TEST GPS TIME WINDOWS
+# ======================================================= #
+
+# extract the data of the first trip by binary search on datetime
+t0 = gps.df.loc[gps.df["trip"]==trip_ids[0], "datetime"].iloc[0]
+t1 = gps.df.loc[gps.df["trip"]==trip_ids[0], "datetime"].iloc[-1]
+df_window = gps.window(t0, t1, columns=["datetime", "longitude", "latitude", "trip"])
+print("%d/%d rows in [%s, %s]" % (len(df_window), len(gps), t0, t1))
+
+# extract the data of every hour of the recording
+starts = pd.date_range(start=gps.start_datetime, end=gps.end_datetime, freq="1h")
+df_windows = gps.windows(starts, starts + pd.Timedelta(hours=1))
+print("%d windows with %d rows in total" % (len(df_windows), sum([len(df_w) for df_w in df_windows])))
+
+# resample positions and speed on a regular 10 s grid
+print(gps.resample(10, {"longitude":"linear", "latitude":"linear", "step_speed":"linear", "trip":"nearest"}, max_gap=60).head())
@@ -3,8 +3,9 @@
 # ======================================================= #
 import os
 import csv
+import importlib.util
 import pandas as pd
-from cpforager import parameters, utils, misc, GPS, GPS_Collection
+from cpforager import parameters, utils, misc, figcache, movebank, GPS, GPS_Collection
 from cpforager.gps_collection import stdb
 
 
@@ -101,12 +102,60 @@ print(gps_collection_all[5])
 
 # test display_data_summary method
 gps_collection_all.display_data_summary()
+gps_collection_all.display_data_summary(streaming=True)
 
 # test plot_stats_summary, folium_map, maps_diag methods
 _ = gps_collection_all.plot_stats_summary(test_dir, "trip_statistics_all", plot_params)
+_ = gps_collection_all.plot_stats_summary(test_dir, "trip_statistics_all_sketches", plot_params, from_sketches=True)
 _ = gps_collection_all.folium_map(test_dir, "fmaps_all", plot_params, rand=True)
+_ = gps_collection_all.folium_map(test_dir, "fmaps_density_all", plot_params, density=True, time_weighted=True)
 _ = gps_collection_all.indiv_map_all(test_dir, "indiv_map_all", plot_params)
 gps_collection_all.trip_statistics_all.to_csv("%s/trip_statistics_all.csv" % (test_dir), index=False, quoting=csv.QUOTE_NONNUMERIC)
+_ = gps_collection_all.export_trips("%s/trips_all.geojson" % (test_dir), tolerance=50)
+if importlib.util.find_spec("pyarrow") is not None:
+    _ = gps_collection_all.export_trips("%s/trips_all.parquet" % (test_dir), tolerance=50)
+print("%d positions kept out of %d" % (gps_collection_all.simplify_mask(50, algorithm="visvalingam").sum(), len(gps_collection_all.df_all)))
+
+# test render_all method
+df_reports = gps_collection_all.render_all(test_dir, plot_params, kind="maps_diag", workers=1)
+print(df_reports[["id", "status", "duration"]])
+
+# test render_all method in a process pool, worker processes importing this script on spawn platforms
+if __name__ == "__main__":
+    df_reports = gps_collection_all.render_all(test_dir, plot_params, kind="maps_diag", workers=2)
+    print(df_reports[["id", "status", "duration"]])
+
+# test figure cache, second rendering being skipped
+plot_params_cache = dict(plot_params, fig_cache=True)
+for k in range(2):
+    df_reports = gps_collection_all.render_all(test_dir, plot_params_cache, kind="maps_diag", workers=1)
+    print(df_reports["status"].value_counts())
+print(figcache.get_cache_report(test_dir))
+
+# test window and windows methods on the full dataframe
+gps = gps_collection_all[5]
+df_window = gps_collection_all.window(gps.id, gps.start_datetime, gps.start_datetime + pd.Timedelta(hours=6))
+df_windows = gps_collection_all.windows(gps.id, [gps.start_datetime, gps.end_datetime - pd.Timedelta(hours=6)], [gps.start_datetime + pd.Timedelta(hours=6), gps.end_datetime], columns=["id", "datetime", "trip"])
+print(df_window[["id", "datetime"]].iloc[[0, -1]])
+print([len(df_w) for df_w in df_windows])
+
+# test align method on absolute and trip times
+aligned = gps_collection_all.align(60, {"longitude":"linear", "latitude":"linear", "trip":"nearest"}, start=gps.start_datetime, end=gps.start_datetime + pd.Timedelta(hours=6))
+aligned_trips = gps_collection_all.align(60, {"dist_to_nest":"linear"}, reference="trip", chunk_size=100, max_gap=600)
+print("birds at sea : %s" % ((aligned["values"][:, :, 2] > 0).sum(axis=0)[::60]))
+print(aligned_trips["values"].shape, aligned_trips["mask"].sum())
+
+# test spatial queries on the full dataframe
+_ = gps_collection_all.build_spatial_index(cell_size=0.01)
+df_bbox = gps_collection_all.query_bbox(-32.5, -32.3, -3.9, -3.8)
+df_polygon = gps_collection_all.query_polygon([-32.5, -32.3, -32.4], [-3.9, -3.9, -3.7])
+df_radius = gps_collection_all.query_radius(-32.42, -3.85, 5.0)
+print(df_bbox.groupby(["id", "trip"]).size())
+print("bbox : %d | polygon : %d | radius : %d" % (len(df_bbox), len(df_polygon), len(df_radius)))
+
+# test columnar store on which df_all is built
+print("df_all : %.1f MB | store columns : %s" % (gps_collection_all.df_all.memory_usage(deep=False).sum()/1e6, list(gps_collection_all.store.keys())))
+print(gps_collection_all.df_all.iloc[gps_collection_all.offsets[5]:gps_collection_all.offsets[6], 2:].reset_index(drop=True).equals(gps_collection_all[5].df[gps_collection_all.df_all.columns[2:]].astype(gps_collection_all.df_all.dtypes.iloc[2:].to_dict())))
 
 
 # ======================================================= #
@@ -163,9 +212,16 @@ gps_collection = GPS_Collection(gps_collection)
 # produce dataframe at the Seabird Tracking format
 df_stdb = gps_collection.to_SeabirdTracking(metadata)
 df_stdb.to_csv("%s/%s_stdb_format.csv" % (test_dir, fieldwork), index=False, quoting=csv.QUOTE_NONNUMERIC)
+_ = gps_collection.to_SeabirdTracking(metadata, file_path="%s/%s_stdb_format_chunks.csv" % (test_dir, fieldwork), chunk_size=10000)
 
 # produce gps collection from the Seabird Tracking format
 df_stdb = pd.read_csv("%s/%s_stdb_format.csv" % (test_dir, fieldwork), sep=",")
 new_gps_collection, new_metadata = stdb.convert_to_gps_collection(df_stdb, fieldwork, params)
+new_gps_collection, new_metadata = stdb.convert_to_gps_collection("%s/%s_stdb_format.csv" % (test_dir, fieldwork), fieldwork, params, workers=1, chunk_size=10000)
 new_gps_collection = GPS_Collection(gps_collection)
-new_gps_collection.display_data_summary()
\ No newline at end of file
+new_gps_collection.display_data_summary()
+
+# produce Movebank file and gps collection from the Movebank format
+gps_collection.to_Movebank("%s/%s_movebank.csv" % (test_dir, fieldwork), chunk_size=10000)
+new_gps_collection = GPS_Collection(list(movebank.iter_movebank_objects("%s/%s_movebank.csv" % (test_dir, fieldwork), "GPS", fieldwork, params, sorted_by_individual=True)))
+new_gps_collection.display_data_summary()
@@ -69,11 +69,21 @@ df = df[["date", "time", "datetime", "longitude", "latitude", "pressure", "tempe
 # build GPS_TDR object
 gps_tdr = GPS_TDR(df=df, group=fieldwork, id=file_id, params=params)
 
+# build GPS_TDR object from separate GPS and TDR data
+print(GPS_TDR.from_sensors(df_gps, df_tdr, fieldwork, file_id, params))
+
 # test built-in methods
 print(gps_tdr)
 print(len(gps_tdr))
 print(gps_tdr[1312])
 
+# test GPS and TDR objects share the processed dataframes
+print(gps_tdr.gps.df is gps_tdr.df_gps, gps_tdr.tdr.df is gps_tdr.df_tdr)
+
+# test full_resolution method
+df_full = gps_tdr.full_resolution()
+print(df_full[["datetime", "trip", "dive"]].count())
+
 # test display_data_summary method
 gps_tdr.display_data_summary()
 
@@ -42,6 +42,7 @@ plot_params = parameters.get_plot_params()
 
 # loop over bird ids
 gps_tdr_collection = []
+dfs_gps, dfs_tdr, params_by_id = {}, {}, {}
 for k in range(n_bird_ids):
         
     # get bird id
@@ -93,10 +94,16 @@ for k in range(n_bird_ids):
     
     # append tdr to the overall collections
     gps_tdr_collection.append(gps_tdr)
+    
+    # keep separate gps and tdr data
+    dfs_gps[bird_id], dfs_tdr[bird_id], params_by_id[bird_id] = df_gps, df_tdr, params
 
 # build GPS_TDR_Collection object
 gps_tdr_collection = GPS_TDR_Collection(gps_tdr_collection)
 
+# build GPS_TDR_Collection object from separate gps and tdr data paired by bird id
+print(GPS_TDR_Collection.from_sensors(dfs_gps, dfs_tdr, fieldwork, params, params_by_id))
+
 # test built-in methods
 print(gps_tdr_collection)
 print(len(gps_tdr_collection))
@@ -61,5 +61,12 @@ print(tdr[1312])
 # test display_data_summary method
 tdr.display_data_summary()
 
+# test build_pyramid, query_pyramid methods
+_ = tdr.build_pyramid()
+print(tdr.query_pyramid("depth", tdr.start_datetime, tdr.end_datetime, 500).head())
+
+# test resample method
+print(tdr.resample(10, {"depth":"mean", "pressure":"decimate", "dive":"nearest"}).head())
+
 # test full_diag, maps_diag, folium_map, folium_map_colorgrad methods
 _ = tdr.full_diag(test_dir, "%s_diag" % file_id, plot_params)
\ No newline at end of file
@@ -102,8 +102,10 @@ print(tdr_collection_all[5])
 
 # test display_data_summary method
 tdr_collection_all.display_data_summary()
+tdr_collection_all.display_data_summary(streaming=True)
 
 # test plot_stats_summary, folium_map, maps_diag methods
 _ = tdr_collection_all.plot_stats_summary(test_dir, "dive_statistics_all", plot_params)
+_ = tdr_collection_all.plot_stats_summary(test_dir, "dive_statistics_all_sketches", plot_params, from_sketches=True)
 tdr_collection_all.dive_statistics_all.to_csv("%s/dive_statistics_all.csv" % (test_dir), index=False, quoting=csv.QUOTE_NONNUMERIC)
 _ = tdr_collection_all.indiv_depth_all(test_dir, "indiv_depth_all", plot_params)
\ No newline at end of file